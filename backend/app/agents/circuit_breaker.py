@@ -0,0 +1,166 @@
+"""Circuit breaker for calls to the LLM provider.
+
+When the provider is down or slow, every chat turn would otherwise wait
+out its own timeouts. The breaker watches a rolling window of recent
+calls and opens when too many failed or were slower than the slow-call
+threshold. While open, callers skip the provider (task_agent answers
+with the local fallback agent or fails fast). After a cool-down it lets a
+single probe call through (half-open): success closes the circuit,
+failure opens it again.
+
+States: closed → open → half_open → closed | open.
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Recent transitions kept for the metrics endpoint
+_TRANSITION_HISTORY = 20
+
+
+class CircuitOpenError(Exception):
+    """The call was skipped because the circuit is open."""
+
+
+@dataclass
+class _Outcome:
+    at: float
+    failed: bool
+
+
+class CircuitBreaker:
+    """Error-rate and latency driven breaker with half-open probing."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_seconds: float,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self.state = CLOSED
+        self._outcomes: deque[_Outcome] = deque()
+        self._opened_at = 0.0
+        self._probing = False
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuited = 0
+        self.transitions: deque[dict[str, Any]] = deque(maxlen=_TRANSITION_HISTORY)
+
+    def allow(self) -> bool:
+        """Whether the next call may go to the provider.
+
+        A True from a half-open breaker makes that call the probe; its
+        outcome must be recorded with record_success, record_failure or
+        record_cancelled.
+        """
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.open_seconds:
+                self.short_circuited += 1
+                return False
+            self._transition(HALF_OPEN, "cool-down elapsed")
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.short_circuited += 1
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self, latency_seconds: float) -> None:
+        """Record a completed call; one slower than the threshold counts as failed."""
+        if latency_seconds > self.slow_call_seconds:
+            self.slow_calls += 1
+            self._record(
+                failed=True, reason=f"slow call ({latency_seconds:.1f}s)"
+            )
+        else:
+            self._record(failed=False, reason="probe succeeded")
+
+    def record_failure(self, error: BaseException | None = None) -> None:
+        """Record a call that raised."""
+        self.failures += 1
+        self._record(failed=True, reason=f"call failed ({type(error).__name__})")
+
+    def record_cancelled(self) -> None:
+        """Record a call abandoned by its caller; it says nothing about the provider."""
+        if self.state == HALF_OPEN:
+            self._probing = False
+
+    def _record(self, failed: bool, reason: str) -> None:
+        self.calls += 1
+        now = self._clock()
+        if self.state == OPEN:
+            # Started before the circuit opened; the cool-down decides now
+            return
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open(reason)
+            else:
+                self._outcomes.clear()
+                self._transition(CLOSED, reason)
+            return
+
+        self._outcomes.append(_Outcome(now, failed))
+        while self._outcomes and self._outcomes[0].at <= now - self.window_seconds:
+            self._outcomes.popleft()
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            rate = self._failure_rate()
+            if rate >= self.failure_rate:
+                self._open(f"failure rate {rate:.0%} over {len(self._outcomes)} calls")
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(o.failed for o in self._outcomes) / len(self._outcomes)
+
+    def _open(self, reason: str) -> None:
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._transition(OPEN, reason)
+
+    def _transition(self, state: str, reason: str) -> None:
+        logger.warning(
+            "Circuit %s: %s -> %s (%s)", self.name, self.state, state, reason
+        )
+        self.transitions.append({
+            "from": self.state,
+            "to": state,
+            "reason": reason,
+            "at": time.time(),
+        })
+        self.state = state
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "short_circuited": self.short_circuited,
+            "window_failure_rate": round(self._failure_rate(), 4),
+            "window_calls": len(self._outcomes),
+            "transitions": list(self.transitions),
+        }
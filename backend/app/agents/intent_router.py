@@ -0,0 +1,176 @@
+"""Rule-based intent classification for simple task commands.
+
+The chat path uses it as a pre-router: a command that matches a strict,
+unambiguous pattern ("show my tasks", "add task Buy milk") is answered by
+calling the task tool directly, skipping the LLM round trips. Anything
+else goes to the full agent. The dev fallback agent (no OpenAI key) uses
+the same classifier at any confidence.
+
+Confidence levels:
+    STRONG — the whole message is one command in a canonical phrasing.
+    WEAK   — a command keyword appears somewhere; fine for the dev agent,
+             never enough to skip the LLM.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+STRONG = 0.95
+WEAK = 0.4
+
+_UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+_TASKS = r"(?:tasks|todos|to-dos|todo list|to-do list|task list)"
+
+_LIST = re.compile(
+    rf"^(?:(?:show|list|view|display|get|see)(?: me)?(?: all)?(?: of)?(?: my)?"
+    rf"(?: (?P<status>pending|open|completed|done|finished))? {_TASKS}"
+    rf"|what(?: are|'s on| is on) my {_TASKS}"
+    rf"|my {_TASKS})$",
+    re.IGNORECASE,
+)
+_ADD = re.compile(
+    r"^(?:add|create|new)(?: a)?(?: new)? (?:task|todo|to-do)"
+    r"(?: called| named| titled)?\s*[:\-]?\s+(?P<title>.+)$",
+    re.IGNORECASE,
+)
+_ADD_TO_LIST = re.compile(
+    rf"^add (?P<title>.+?) to (?:my )?(?:{_TASKS}|list)$", re.IGNORECASE
+)
+_COMPLETE = re.compile(
+    rf"^(?:(?:complete|finish|mark)(?: task)? (?P<id>{_UUID})"
+    rf"(?: as)?(?: done| complete| completed| finished)?"
+    rf"|task (?P<id2>{_UUID}) is (?:done|complete|completed|finished))$",
+    re.IGNORECASE,
+)
+_DELETE = re.compile(
+    rf"^(?:delete|remove)(?: task)? (?P<id>{_UUID})$", re.IGNORECASE
+)
+_ANY_UUID = re.compile(_UUID)
+
+_POLITE_PREFIX = re.compile(
+    r"^(?:please|pls|can you|could you|would you)\s+", re.IGNORECASE
+)
+_POLITE_SUFFIX = re.compile(
+    r"(?:,?\s+(?:please|pls|thanks|thank you))+$", re.IGNORECASE
+)
+# A title that reads like a second command, a condition, or a phrase the
+# title was not meant to include ("add a task to ...") goes to the agent
+_COMPOUND_TITLE = re.compile(
+    r"\b(?:then|also|and (?:show|list|delete|remove|complete|mark|update|rename))\b"
+    r"|^(?:to|for|that|which) |[;?]"
+)
+
+_ADD_PREFIXES = (
+    "add task ", "create task ", "add a task ", "create a task ",
+    "new task ", "make a task ", "add ", "create ", "make ", "new ",
+)
+
+
+@dataclass
+class IntentMatch:
+    """A classified command: the tool to call, its arguments, and confidence."""
+
+    intent: str
+    confidence: float
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+def classify(message: str) -> IntentMatch | None:
+    """Classify one user message, or return None if no intent is recognised."""
+    text = message.strip()
+    return _classify_strong(_normalize(text)) or _classify_weak(text, text.lower())
+
+
+def _normalize(text: str) -> str:
+    """Drop politeness and trailing punctuation, collapse whitespace; keep case."""
+    text = " ".join(text.split())
+    text = _POLITE_PREFIX.sub("", text).rstrip(" .!")
+    return _POLITE_SUFFIX.sub("", text)
+
+
+def _classify_strong(text: str) -> IntentMatch | None:
+    if m := _LIST.match(text):
+        status = (m.group("status") or "").lower()
+        if status in ("pending", "open"):
+            return IntentMatch("list_tasks", STRONG, {"status": "pending"})
+        if status:
+            return IntentMatch("list_tasks", STRONG, {"status": "completed"})
+        return IntentMatch("list_tasks", STRONG)
+
+    if m := _ADD.match(text) or _ADD_TO_LIST.match(text):
+        title = m.group("title").strip("\"' ")
+        if title and not _COMPOUND_TITLE.search(title.lower()):
+            return IntentMatch("add_task", STRONG, {"title": title})
+        return None
+
+    if m := _COMPLETE.match(text):
+        task_id = (m.group("id") or m.group("id2")).lower()
+        return IntentMatch("complete_task", STRONG, {"task_id": task_id})
+    if m := _DELETE.match(text):
+        return IntentMatch("delete_task", STRONG, {"task_id": m.group("id").lower()})
+    return None
+
+
+def _classify_weak(text: str, lower: str) -> IntentMatch | None:
+    """Keyword matching anywhere in the message (the dev agent's old rules)."""
+    if any(kw in lower for kw in ["add", "create", "new", "make"]):
+        title = text
+        for prefix in _ADD_PREFIXES:
+            if lower.startswith(prefix):
+                title = text[len(prefix):].strip()
+                break
+        title = title.strip("\"'") or "Untitled Task"
+        return IntentMatch("add_task", WEAK, {"title": title})
+
+    list_keywords = ["list", "show", "view", "my task", "all task", "get task"]
+    if any(kw in lower for kw in list_keywords):
+        return IntentMatch("list_tasks", WEAK)
+
+    for intent, keywords in (
+        ("complete_task", ["complete", "done", "finish", "mark done"]),
+        ("delete_task", ["delete", "remove"]),
+    ):
+        if any(kw in lower for kw in keywords):
+            uuid_match = _ANY_UUID.search(lower)
+            args = {"task_id": uuid_match.group()} if uuid_match else {}
+            return IntentMatch(intent, WEAK, args)
+
+    if any(kw in lower for kw in ["update", "edit", "change", "rename"]):
+        return IntentMatch("update_task", WEAK)
+    if any(kw in lower for kw in ["hello", "hi", "hey", "help"]):
+        return IntentMatch("greeting", WEAK)
+    return None
+
+
+class IntentRouterStats:
+    """Per-intent counters for the pre-router: routed vs sent to the agent."""
+
+    def __init__(self) -> None:
+        self.routed: Counter[str] = Counter()
+        self.below_threshold: Counter[str] = Counter()
+        self.unmatched = 0
+
+    def record(self, match: IntentMatch | None, routed: bool) -> None:
+        if match is None:
+            self.unmatched += 1
+        elif routed:
+            self.routed[match.intent] += 1
+        else:
+            self.below_threshold[match.intent] += 1
+
+    def stats(self) -> dict[str, Any]:
+        routed = sum(self.routed.values())
+        total = routed + sum(self.below_threshold.values()) + self.unmatched
+        return {
+            "messages": total,
+            "routed": routed,
+            "route_rate": routed / total if total else 0.0,
+            "routed_by_intent": dict(self.routed),
+            "below_threshold_by_intent": dict(self.below_threshold),
+            "unmatched": self.unmatched,
+        }
+
+
+router_stats = IntentRouterStats()
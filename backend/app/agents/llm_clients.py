@@ -0,0 +1,115 @@
+"""Long-lived AsyncOpenAI clients shared by chat requests.
+
+A client built per chat message starts with an empty connection pool, so
+every turn pays DNS, TCP and TLS setup to the provider before the first
+token. The registry keeps one client per (base URL, API key) with a tuned
+keep-alive pool, and the chat-completions model wrapper for each model
+name on top of it. The app lifespan closes them at shutdown.
+"""
+
+import logging
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIClientRegistry:
+    """One pooled AsyncOpenAI client per provider, created on first use."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        http2: bool = True,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._clients: dict[tuple[str, str], AsyncOpenAI] = {}
+        self._models: dict[tuple[str, str, str], Any] = {}
+        self.requests = 0
+
+    def client(self, api_key: str, base_url: str = "") -> AsyncOpenAI:
+        """Return the shared client for this provider, creating it once."""
+        key = (base_url, api_key)
+        client = self._clients.get(key)
+        if client is None:
+            client_kwargs: dict = {"api_key": api_key, "http_client": self._http_client()}
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = self._clients[key] = AsyncOpenAI(**client_kwargs)
+        return client
+
+    def model(self, model: str, api_key: str, base_url: str = ""):
+        """Return the shared OpenAIChatCompletionsModel for this provider and model."""
+        from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
+
+        key = (base_url, api_key, model)
+        wrapper = self._models.get(key)
+        if wrapper is None:
+            wrapper = self._models[key] = OpenAIChatCompletionsModel(
+                model=model, openai_client=self.client(api_key, base_url)
+            )
+        return wrapper
+
+    async def close(self) -> None:
+        """Close every client and its connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._models.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("Closing OpenAI client failed: %s", e)
+
+    def stats(self) -> dict[str, Any]:
+        """Connection pool utilisation per provider (base URL)."""
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "requests": self.requests,
+            "providers": [
+                {"base_url": str(client.base_url), **_pool_stats(client)}
+                for client in self._clients.values()
+            ],
+        }
+
+    def _http_client(self):
+        hooks = {"request": [self._count_request]}
+        if self.http2:
+            try:
+                return DefaultAsyncHttpxClient(
+                    limits=self.limits, http2=True, event_hooks=hooks
+                )
+            except ImportError:
+                logger.warning("HTTP/2 needs the 'h2' package; using HTTP/1.1")
+                self.http2 = False
+        return DefaultAsyncHttpxClient(limits=self.limits, event_hooks=hooks)
+
+    async def _count_request(self, request) -> None:
+        self.requests += 1
+
+
+def _pool_stats(client: AsyncOpenAI) -> dict[str, Any]:
+    """Open/idle/active connection counts from the client's transport pool."""
+    transport = getattr(client._client, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {"connections": None, "idle": None, "active": None}
+    idle = sum(1 for conn in connections if conn.is_idle())
+    return {
+        "connections": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+    }
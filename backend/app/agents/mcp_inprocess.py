@@ -0,0 +1,79 @@
+"""In-process MCP transport: the FastMCP task tools without a subprocess.
+
+For single-node deployments. Tool calls run on the API's event loop and
+share its DB engine and connection pool, instead of a JSON-RPC round trip
+over stdio to a child process with an engine of its own. The agent sees
+the same tool set, schemas and results as over stdio.
+"""
+
+import json
+import logging
+from typing import Any
+
+from agents.mcp import MCPServer
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, ListPromptsResult, TextContent
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessMCPServer(MCPServer):
+    """Expose a FastMCP server's tools to the Agents SDK by direct call.
+
+    Stateless, so one instance can serve every concurrent chat; wrap it in
+    mcp_pool.UserScopedServer per request to pin tool calls to the user.
+    """
+
+    def __init__(self, server: FastMCP, name: str | None = None) -> None:
+        super().__init__()
+        self._server = server
+        self._name = name or server.name
+        self._tools = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self) -> None:
+        """Nothing to connect: the tools live in this process."""
+
+    async def cleanup(self) -> None:
+        """Nothing to clean up."""
+
+    @property
+    def cached_tools(self):
+        return self._tools
+
+    async def list_tools(self, run_context=None, agent=None):
+        if self._tools is None:
+            self._tools = await self._server.list_tools()
+        return self._tools
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        meta: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        """Call the tool, shaping the result as the MCP server would over stdio."""
+        try:
+            result = await self._server.call_tool(tool_name, arguments or {})
+        except Exception as e:
+            logger.warning("In-process tool %s failed: %s", tool_name, e)
+            return CallToolResult(
+                content=[TextContent(type="text", text=str(e))], isError=True
+            )
+        if isinstance(result, tuple):
+            content, structured = result
+        elif isinstance(result, dict):
+            content = [TextContent(type="text", text=json.dumps(result, indent=2))]
+            structured = result
+        else:
+            content, structured = result, None
+        return CallToolResult(content=list(content), structuredContent=structured)
+
+    async def list_prompts(self) -> ListPromptsResult:
+        return ListPromptsResult(prompts=await self._server.list_prompts())
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        return await self._server.get_prompt(name, arguments)
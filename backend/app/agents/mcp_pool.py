@@ -0,0 +1,262 @@
+"""Warm pool of long-lived MCP tool servers shared by chat requests.
+
+Starting an MCPServerStdio per chat message spawns a Python interpreter
+that re-imports the app and builds its own DB engine: seconds of latency
+and one process per concurrent chat. The pool keeps ``size`` servers
+connected and leases each to one chat at a time.
+
+Every slot is owned by a keeper task that connects its server, waits
+until the slot has to restart (crash, failed health check) or the pool
+closes, then cleans it up. The stdio transport holds anyio cancel scopes,
+so connect and cleanup must run in the same task; callers only signal
+the keeper.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents.mcp import MCPServer
+
+logger = logging.getLogger(__name__)
+
+
+class MCPPoolTimeoutError(Exception):
+    """No pooled MCP server became free within the acquire timeout."""
+
+
+class UserScopedServer(MCPServer):
+    """A leased MCP server whose tool calls always act as the lease's user.
+
+    The model fills in tool arguments, user_id included. Whatever it sends,
+    user_id is overwritten with the authenticated user, so a confused or
+    prompt-injected model cannot reach another user's tasks through a
+    shared server. The lease is unusable once returned to the pool.
+    """
+
+    def __init__(self, server: MCPServer, user_id: str) -> None:
+        super().__init__(use_structured_content=server.use_structured_content)
+        self._server = server
+        self.user_id = user_id
+        self.failed = False
+        self.released = False
+
+    @property
+    def name(self) -> str:
+        return self._server.name
+
+    async def connect(self) -> None:
+        """No-op: the pool owns the connection."""
+
+    async def cleanup(self) -> None:
+        """No-op: the pool owns the connection."""
+
+    async def list_tools(self, run_context=None, agent=None):
+        return await self._server.list_tools(run_context, agent)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        meta: dict[str, Any] | None = None,
+    ):
+        if self.released:
+            raise RuntimeError("MCP server lease was already returned to the pool")
+        arguments = dict(arguments or {})
+        requested = arguments.get("user_id")
+        if requested is not None and requested != self.user_id:
+            logger.warning(
+                "Tool %s asked for user_id=%s; forcing lease user", tool_name, requested
+            )
+        arguments["user_id"] = self.user_id
+        extra = (meta,) if meta is not None else ()
+        try:
+            return await self._server.call_tool(tool_name, arguments, *extra)
+        except BaseException:
+            self.failed = True
+            raise
+
+    async def list_prompts(self):
+        return await self._server.list_prompts()
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        return await self._server.get_prompt(name, arguments)
+
+
+@dataclass(eq=False)
+class _Slot:
+    index: int
+    server: MCPServer | None = None
+    restart: asyncio.Event = field(default_factory=asyncio.Event)
+    keeper: asyncio.Task | None = None
+
+
+class MCPServerPool:
+    """Fixed-size pool of connected MCP servers, leased one chat at a time.
+
+    ``factory`` returns a new, unconnected server. Idle servers are pinged
+    every ``health_check_interval`` seconds; a server that fails a ping, or
+    whose lease saw a transport error and then fails a ping, is cleaned up
+    and replaced in the background.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], MCPServer],
+        size: int,
+        *,
+        acquire_timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        restart_backoff: float = 1.0,
+    ) -> None:
+        self.factory = factory
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.restart_backoff = restart_backoff
+        self._slots: list[_Slot] = []
+        self._idle: asyncio.Queue[_Slot] = asyncio.Queue()
+        self._background: set[asyncio.Task] = set()
+        self._health_task: asyncio.Task | None = None
+        self._closing = False
+        self.leases = 0
+        self.in_use = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.failed_checks = 0
+
+    async def start(self) -> None:
+        """Launch the keeper tasks; servers come up in the background."""
+        self._slots = [_Slot(index) for index in range(self.size)]
+        for slot in self._slots:
+            slot.keeper = asyncio.create_task(
+                self._keep(slot), name=f"mcp-pool-slot-{slot.index}"
+            )
+        self._health_task = asyncio.create_task(self._check_health_periodically())
+
+    async def close(self) -> None:
+        """Stop health checks and shut every server down."""
+        self._closing = True
+        tasks = [t for t in (self._health_task, *self._background) if t is not None]
+        for task in tasks:
+            task.cancel()
+        for slot in self._slots:
+            slot.restart.set()
+        await asyncio.gather(
+            *tasks, *(s.keeper for s in self._slots if s.keeper), return_exceptions=True
+        )
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+    @contextlib.asynccontextmanager
+    async def lease(self, user_id: str) -> AsyncIterator[MCPServer]:
+        """Borrow a connected server, scoped to ``user_id``, for one chat turn.
+
+        Raises MCPPoolTimeoutError if none is free within acquire_timeout.
+        """
+        if self._idle.empty():
+            self.waited += 1
+        try:
+            slot = await asyncio.wait_for(self._idle.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise MCPPoolTimeoutError(
+                f"No MCP tool server free after {self.acquire_timeout:.0f}s"
+            ) from None
+
+        scoped = UserScopedServer(slot.server, user_id)
+        self.leases += 1
+        self.in_use += 1
+        try:
+            yield scoped
+        finally:
+            self.in_use -= 1
+            scoped.released = True
+            if self._closing:
+                slot.restart.set()
+            elif scoped.failed:
+                # Tool errors come back as results; an exception means the
+                # transport may be broken. Verify before reuse.
+                self._spawn(self._check(slot))
+            else:
+                self._idle.put_nowait(slot)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": self.in_use,
+            "leases": self.leases,
+            "waited": self.waited,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "failed_health_checks": self.failed_checks,
+        }
+
+    async def _keep(self, slot: _Slot) -> None:
+        """Own one slot's server: connect, serve until told, clean up, repeat."""
+        first = True
+        while not self._closing:
+            if not first:
+                self.restarts += 1
+            first = False
+            server = self.factory()
+            try:
+                await server.connect()
+            except Exception as e:
+                logger.warning("MCP pool slot %d failed to start: %s", slot.index, e)
+                with contextlib.suppress(Exception):
+                    await server.cleanup()
+                await asyncio.sleep(self.restart_backoff)
+                continue
+            try:
+                if self._closing:
+                    return
+                slot.restart.clear()
+                slot.server = server
+                self._idle.put_nowait(slot)
+                await slot.restart.wait()
+            finally:
+                slot.server = None
+                with contextlib.suppress(Exception):
+                    await server.cleanup()
+
+    async def _check_health_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for _ in range(self._idle.qsize()):
+                try:
+                    slot = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                await self._check(slot)
+
+    async def _check(self, slot: _Slot) -> None:
+        """Ping a slot taken out of the idle queue; requeue or restart it."""
+        if await self._ping(slot.server):
+            self._idle.put_nowait(slot)
+            return
+        self.failed_checks += 1
+        logger.warning("MCP pool slot %d failed its health check; restarting", slot.index)
+        slot.restart.set()
+
+    async def _ping(self, server: MCPServer | None) -> bool:
+        session = getattr(server, "session", None)
+        if session is None:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), self.health_check_timeout)
+        except Exception:
+            return False
+        return True
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
@@ -1,18 +1,35 @@
 """OpenAI Agents SDK agent configuration and runner.
 
-Creates a per-request Agent + MCPServerStdio instance.
-No state is cached between requests.
+Creates a per-request Agent. With the stdio MCP transport, tool servers
+are leased from a warm pool started with the app (see mcp_pool.py), or
+spawned per request when the pool is disabled; the in-process transport
+calls the same tools inside the API process (see mcp_inprocess.py).
+No conversation state is cached between requests. Simple, unambiguous
+commands can skip the agent entirely (see intent_router.py).
 
 When OPENAI_API_KEY is not configured, falls back to a dev agent
-that parses intent locally and calls MCP tools directly.
+that parses intent locally and calls MCP tools directly. The same agent
+answers while the LLM circuit breaker is open (see circuit_breaker.py).
 """
 
+import asyncio
+import contextlib
 import json
 import logging
 import os
 import sys
+import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 
+from app.agents.turn_metrics import (
+    PATH_DEGRADED,
+    PATH_DEV,
+    PATH_FAST,
+    TimingHooks,
+    ToolTiming,
+    TurnMetrics,
+)
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -37,6 +54,9 @@ You are TaskAssistant, a helpful task management assistant.
    - To complete a task → use the `complete_task` tool
    - To delete a task → use the `delete_task` tool
    - To update a task → use the `update_task` tool
+   - For two or more tasks at once → use `add_tasks`, `complete_tasks`,
+     `delete_tasks` or `update_tasks` in a single call, not one call per task.
+     Each item in their results has its own ok/error; report both.
 
 2. **Confirm actions** ONLY after the tool has executed successfully.
    - If a tool returns success, confirm the action to the user.
@@ -44,14 +64,23 @@ You are TaskAssistant, a helpful task management assistant.
 
 3. **Ask for clarification** when the user's intent is ambiguous.
    - If the user says something vague like "do that thing", ask what they mean.
-   - If the user references a task by name and multiple tasks could match, ask which one.
+   - If the user references a task by name, pass that name as `task_id` directly —
+     do not call `list_tasks` first. If the tool answers with candidate tasks
+     instead, show the user those options and ask which one they mean.
 
 4. **Stay in scope**: You only manage tasks. For off-topic questions, respond politely
    that you can only help with task management.
 
 5. **Be concise and conversational**. Use natural language, not JSON.
 
-6. **The user_id parameter** is always provided in tool calls — never ask the user for it.
+6. **Keep task lists small**. Call `list_tasks` with its default summary view
+   and narrow it with filters (status, priority, tags, due_before/due_after,
+   title_contains) rather than listing everything. Fetch the next page with
+   `cursor` only if the user wants more. Use view='full' only when you need
+   descriptions, priorities, tags or dates. The short IDs in the summary work
+   as task_id for the other tools.
+
+7. **The user_id parameter** is always provided in tool calls — never ask the user for it.
 """
 
 
@@ -82,122 +111,342 @@ def _build_subprocess_env() -> dict[str, str]:
     return env
 
 
+def _new_mcp_server():
+    """Build an unconnected MCPServerStdio for the task tools subprocess."""
+    from agents.mcp import MCPServerStdio
+
+    mcp_command = _get_mcp_server_command()
+    return MCPServerStdio(
+        name="TaskTools",
+        params={
+            "command": mcp_command[0],
+            "args": mcp_command[1:],
+            "cwd": _BACKEND_DIR,
+            "env": _build_subprocess_env(),
+        },
+        client_session_timeout_seconds=30,
+        cache_tools_list=True,
+    )
+
+
+_inprocess_server = None
+
+
+def _get_inprocess_server():
+    """Return the shared in-process MCP server for the task tools."""
+    global _inprocess_server
+    if _inprocess_server is None:
+        from app.agents.mcp_inprocess import InProcessMCPServer
+        from app.mcp_server.task_tools import mcp
+
+        _inprocess_server = InProcessMCPServer(mcp, name="TaskTools")
+    return _inprocess_server
+
+
+def _lease_mcp_server(user_id: str):
+    """Async context manager yielding the MCP server for one chat turn."""
+    if settings.mcp_transport == "inprocess":
+        from app.agents.mcp_pool import UserScopedServer
+
+        return contextlib.nullcontext(
+            UserScopedServer(_get_inprocess_server(), user_id)
+        )
+    if _mcp_pool is not None:
+        return _mcp_pool.lease(user_id)
+    return _new_mcp_server()
+
+
+# ---------------------------------------------------------------------------
+# MCP server pool — started/stopped by the app lifespan
+# ---------------------------------------------------------------------------
+
+_mcp_pool = None
+
+
+async def start_mcp_pool() -> None:
+    """Start the warm MCP server pool, if enabled and the real agent is in use."""
+    global _mcp_pool
+    if (
+        settings.mcp_transport != "stdio"
+        or settings.mcp_pool_size <= 0
+        or not _has_openai_key()
+    ):
+        return
+    from app.agents.mcp_pool import MCPServerPool
+
+    _mcp_pool = MCPServerPool(
+        _new_mcp_server,
+        settings.mcp_pool_size,
+        acquire_timeout=settings.mcp_pool_acquire_timeout_seconds,
+        health_check_interval=settings.mcp_pool_health_check_interval_seconds,
+    )
+    await _mcp_pool.start()
+    logger.info("Started MCP server pool (size=%d)", settings.mcp_pool_size)
+
+
+async def stop_mcp_pool() -> None:
+    """Shut down the MCP server pool and its subprocesses."""
+    global _mcp_pool
+    if _mcp_pool is not None:
+        pool, _mcp_pool = _mcp_pool, None
+        await pool.close()
+
+
+def mcp_pool_stats() -> dict | None:
+    """Pool utilisation counters, or None when the pool is not running."""
+    return _mcp_pool.stats() if _mcp_pool is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Shared LLM clients — created by the app lifespan, reused by every chat
+# ---------------------------------------------------------------------------
+
+_llm_clients = None
+
+
+def _get_llm_clients():
+    """Return the process-wide OpenAI client registry, creating it on first use."""
+    global _llm_clients
+    if _llm_clients is None:
+        from app.agents.llm_clients import OpenAIClientRegistry
+
+        _llm_clients = OpenAIClientRegistry(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+            http2=settings.openai_http2,
+        )
+    return _llm_clients
+
+
+def _get_model():
+    """The shared chat-completions model for the configured provider."""
+    return _get_llm_clients().model(
+        settings.openai_model, settings.openai_api_key, settings.openai_base_url
+    )
+
+
+async def start_llm_clients() -> None:
+    """Create the configured provider's client up front, if the real agent is in use."""
+    if _has_openai_key():
+        _get_model()
+
+
+async def stop_llm_clients() -> None:
+    """Close the shared LLM clients and their connection pools."""
+    global _llm_clients
+    if _llm_clients is not None:
+        registry, _llm_clients = _llm_clients, None
+        await registry.close()
+
+
+def llm_client_stats() -> dict | None:
+    """Connection pool utilisation, or None before any client exists."""
+    return _llm_clients.stats() if _llm_clients is not None else None
+
+
+# ---------------------------------------------------------------------------
+# LLM circuit breaker — skip the provider while it is failing or slow
+# ---------------------------------------------------------------------------
+
+_llm_breaker = None
+
+
+def _get_llm_breaker():
+    """Return the process-wide breaker around Runner calls, or None if disabled."""
+    global _llm_breaker
+    if _llm_breaker is None and settings.llm_breaker_enabled:
+        from app.agents.circuit_breaker import CircuitBreaker
+
+        _llm_breaker = CircuitBreaker(
+            "llm",
+            window_seconds=settings.llm_breaker_window_seconds,
+            min_calls=settings.llm_breaker_min_calls,
+            failure_rate=settings.llm_breaker_failure_rate,
+            slow_call_seconds=settings.llm_breaker_slow_call_seconds,
+            open_seconds=settings.llm_breaker_open_seconds,
+        )
+    return _llm_breaker
+
+
+async def _run_with_circuit_open(messages: list, user_id: str):
+    """Answer without the provider: the local agent, or fail fast."""
+    if settings.llm_breaker_fallback == "fail":
+        from app.agents.circuit_breaker import CircuitOpenError
+
+        raise CircuitOpenError("LLM provider circuit is open")
+    logger.info("LLM circuit open — using the local fallback agent")
+    return await _run_dev_fallback(messages, user_id, degraded=True)
+
+
+@contextlib.contextmanager
+def _release_probe_on_error(breaker):
+    """Release a half-open probe claimed by allow() if setup fails before the
+    provider is called (e.g. no MCP server could be leased).
+
+    Such failures say nothing about the provider; without this, the breaker
+    would wait forever for the probe's outcome and never call it again.
+    """
+    try:
+        yield
+    except BaseException:
+        if breaker is not None:
+            breaker.record_cancelled()
+        raise
+
+
+def llm_breaker_stats() -> dict | None:
+    """Breaker state and recent transitions, or None when disabled."""
+    breaker = _get_llm_breaker()
+    if breaker is None:
+        return None
+    return {"fallback": settings.llm_breaker_fallback, **breaker.stats()}
+
+
+# ---------------------------------------------------------------------------
+# Fast path — simple commands answered without the LLM
+# ---------------------------------------------------------------------------
+
+_FAST_PATH_INTENTS = {"add_task", "list_tasks", "complete_task", "delete_task"}
+
+
+async def _try_fast_path(messages: list, user_id: str):
+    """Answer a high-confidence simple command by calling its tool directly.
+
+    Returns None, sending the turn to the full agent, when the router is
+    off, the message is not confidently one command, or the tool raises.
+    """
+    if not settings.intent_router_enabled:
+        return None
+    from app.agents.intent_router import classify, router_stats
+
+    match = classify(_latest_user_message(messages))
+    routed = (
+        match is not None
+        and match.confidence >= settings.intent_router_threshold
+        and match.intent in _FAST_PATH_INTENTS
+    )
+    router_stats.record(match, routed)
+    if not routed:
+        return None
+    try:
+        result = await _run_intent(match, user_id)
+    except Exception as e:
+        logger.warning("Fast path %s failed; using the agent: %s", match.intent, e)
+        return None
+    logger.info("Fast path answered %s without the LLM", match.intent)
+    return result
+
+
+def intent_router_stats() -> dict:
+    """Pre-router hit counters for this worker."""
+    from app.agents.intent_router import router_stats
+
+    return {"enabled": settings.intent_router_enabled, **router_stats.stats()}
+
+
 # ---------------------------------------------------------------------------
 # Dev fallback agent — runs when no OpenAI key is configured
 # ---------------------------------------------------------------------------
 
-async def _run_dev_fallback(messages: list, user_id: str):
+_DEGRADED_NOTICE = (
+    "⚠️ The AI service is temporarily unavailable, so I can only handle "
+    "simple commands right now."
+)
+_COMMAND_HELP = (
+    "I understand these commands:\n"
+    "• **Add/Create** — \"add task <title>\"\n"
+    "• **List/Show** — \"show my tasks\"\n"
+    "• **Complete** — \"complete task <id>\"\n"
+    "• **Delete** — \"delete task <id>\""
+)
+
+
+async def _run_dev_fallback(messages: list, user_id: str, degraded: bool = False):
     """Simple intent-based agent that calls MCP tools directly.
 
-    Parses the latest user message for task intent and invokes the
-    corresponding MCP tool function. Returns a fake RunResult-like object.
+    Classifies the latest user message (see intent_router.py) at any
+    confidence and invokes the corresponding MCP tool function. Returns a
+    fake RunResult-like object.
+
+    ``degraded`` means a key is configured but the provider's circuit is
+    open. Real users' free-form messages then reach this agent, so only
+    confident matches run a tool; anything else gets the outage notice.
     """
-    from app.mcp_server.task_tools import (
-        add_task,
-        complete_task,
-        delete_task,
-        list_tasks,
-        update_task,
-    )
+    from app.agents.intent_router import classify
+
+    match = classify(_latest_user_message(messages))
+    if degraded and (
+        match is None or match.confidence < settings.intent_router_threshold
+    ):
+        return _DevResult(f"{_DEGRADED_NOTICE}\n\n{_COMMAND_HELP}")
+    if match is None:
+        return _DevResult(
+            "🤖 I'm running in dev mode (no OpenAI key).\n\n"
+            f"{_COMMAND_HELP}\n\n"
+            "💡 For full natural language support, add OPENAI_API_KEY to backend/.env"
+        )
+    if match.intent == "greeting":
+        return _DevResult(
+            "👋 Hi! I'm TaskAssistant (running in dev mode — no OpenAI key configured).\n\n"
+            "I can help you manage your tasks. Try:\n"
+            "• \"Add task Buy groceries\"\n"
+            "• \"Show my tasks\"\n"
+            "• \"Complete task <id>\"\n"
+            "• \"Delete task <id>\"\n\n"
+            "💡 To enable full AI mode, add your OPENAI_API_KEY to backend/.env"
+        )
+    if match.intent == "update_task":
+        return _DevResult("To update a task, please provide the task ID and the new title or description.")
+    if match.intent in ("complete_task", "delete_task") and "task_id" not in match.args:
+        action = "complete" if match.intent == "complete_task" else "delete"
+        return _DevResult(f"Which task would you like to {action}? Please provide the task name or ID.")
+
+    try:
+        return await _run_intent(match, user_id)
+    except Exception as e:
+        logger.error("Dev fallback tool call failed: %s", e)
+        return _DevResult(f"Sorry, something went wrong: {e}")
 
-    # Get the latest user message (strip the [user_id: ...] prefix)
+
+def _latest_user_message(messages: list) -> str:
+    """The newest user message, without the [user_id: ...] prefix chat_service adds."""
     last_msg = ""
     for m in reversed(messages):
         if m.get("role") == "user":
             last_msg = m["content"]
             break
 
-    # Strip the user_id prefix we add in chat_service
     if last_msg.startswith("[user_id:"):
         closing = last_msg.find("]")
         if closing != -1:
             last_msg = last_msg[closing + 1:].strip()
+    return last_msg
 
-    lower = last_msg.lower()
-    tool_name = None
-    tool_result = None
 
-    try:
-        if any(kw in lower for kw in ["add", "create", "new", "make"]):
-            # Extract title from message — everything after the keyword
-            title = last_msg
-            for prefix in ["add task ", "create task ", "add a task ", "create a task ",
-                           "new task ", "make a task ", "add ", "create ", "make ", "new "]:
-                if lower.startswith(prefix):
-                    title = last_msg[len(prefix):].strip()
-                    break
-            title = title.strip('"\'') or "Untitled Task"
-            tool_name = "add_task"
-            tool_result = await add_task(user_id=user_id, title=title)
-
-        elif any(kw in lower for kw in ["list", "show", "view", "my task", "all task", "get task"]):
-            tool_name = "list_tasks"
-            tool_result = await list_tasks(user_id=user_id)
-
-        elif any(kw in lower for kw in ["complete", "done", "finish", "mark done"]):
-            tool_name = "complete_task"
-            # Try to extract task ID — look for UUID-like pattern
-            import re
-            uuid_match = re.search(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', lower)
-            if uuid_match:
-                tool_result = await complete_task(user_id=user_id, task_id=uuid_match.group())
-            else:
-                return _DevResult("Which task would you like to complete? Please provide the task name or ID.")
-
-        elif any(kw in lower for kw in ["delete", "remove"]):
-            tool_name = "delete_task"
-            import re
-            uuid_match = re.search(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', lower)
-            if uuid_match:
-                tool_result = await delete_task(user_id=user_id, task_id=uuid_match.group())
-            else:
-                return _DevResult("Which task would you like to delete? Please provide the task name or ID.")
-
-        elif any(kw in lower for kw in ["update", "edit", "change", "rename"]):
-            tool_name = "update_task"
-            return _DevResult("To update a task, please provide the task ID and the new title or description.")
-
-        elif any(kw in lower for kw in ["hello", "hi", "hey", "help"]):
-            return _DevResult(
-                "👋 Hi! I'm TaskAssistant (running in dev mode — no OpenAI key configured).\n\n"
-                "I can help you manage your tasks. Try:\n"
-                "• \"Add task Buy groceries\"\n"
-                "• \"Show my tasks\"\n"
-                "• \"Complete task <id>\"\n"
-                "• \"Delete task <id>\"\n\n"
-                "💡 To enable full AI mode, add your OPENAI_API_KEY to backend/.env"
-            )
-        else:
-            return _DevResult(
-                "🤖 I'm running in dev mode (no OpenAI key).\n\n"
-                "I understand these commands:\n"
-                "• **Add/Create** — \"add task <title>\"\n"
-                "• **List/Show** — \"show my tasks\"\n"
-                "• **Complete** — \"complete task <id>\"\n"
-                "• **Delete** — \"delete task <id>\"\n\n"
-                "💡 For full natural language support, add OPENAI_API_KEY to backend/.env"
-            )
+async def _run_intent(match, user_id: str) -> "_DevResult":
+    """Call the MCP tool function for a classified intent and phrase the result."""
+    from app.mcp_server import task_tools
 
-    except Exception as e:
-        logger.error("Dev fallback tool call failed: %s", e)
-        return _DevResult(f"Sorry, something went wrong: {e}")
+    tool = getattr(task_tools, match.intent)
+    started = time.perf_counter()
+    tool_result = await tool(user_id=user_id, **match.args)
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
     # Parse tool result and build a friendly response
-    if tool_result:
-        try:
-            data = json.loads(tool_result) if isinstance(tool_result, str) else tool_result
-        except (json.JSONDecodeError, TypeError):
-            data = {"success": False, "error": str(tool_result)}
-
-        if data.get("success"):
-            return _DevResult(
-                _format_tool_success(tool_name, data.get("data", {})),
-                tool_calls=[{"tool": tool_name, "args": {"user_id": user_id}}],
-            )
-        else:
-            return _DevResult(f"❌ {data.get('error', 'Unknown error')}")
-
-    return _DevResult("I couldn't understand that. Try 'add task', 'show tasks', etc.")
+    try:
+        data = json.loads(tool_result) if isinstance(tool_result, str) else tool_result
+    except (json.JSONDecodeError, TypeError):
+        data = {"success": False, "error": str(tool_result)}
+
+    timing = [ToolTiming(match.intent, elapsed_ms, bool(data.get("success")))]
+    if data.get("success"):
+        return _DevResult(
+            _format_tool_success(match.intent, data.get("data", {})),
+            tool_calls=[{"tool": match.intent, "args": {"user_id": user_id, **match.args}}],
+            tool_timings=timing,
+        )
+    return _DevResult(f"❌ {data.get('error', 'Unknown error')}", tool_timings=timing)
 
 
 def _format_tool_success(tool_name: str, data: dict) -> str:
@@ -206,11 +455,16 @@ def _format_tool_success(tool_name: str, data: dict) -> str:
         return f"✅ Task created: **{data.get('title', 'Untitled')}**"
 
     if tool_name == "list_tasks":
-        tasks = data.get("tasks", [])
+        # Summary view: rows of [short id, title, status]
+        tasks = [
+            {"id": task_id, "title": title, "completed": status == "completed"}
+            for task_id, title, status in data.get("rows", [])
+        ] or data.get("tasks", [])
         count = data.get("count", len(tasks))
         if count == 0:
             return "📋 You don't have any tasks yet. Try \"add task Buy groceries\"!"
-        lines = [f"📋 **Your Tasks** ({count}):"]
+        more = "+" if data.get("next_cursor") else ""
+        lines = [f"📋 **Your Tasks** ({count}{more}):"]
         for t in tasks:
             status = "✅" if t.get("completed") else "⬜"
             lines.append(f"  {status} {t.get('title', 'Untitled')} (`{t.get('id', '?')[:8]}...`)")
@@ -231,9 +485,15 @@ def _format_tool_success(tool_name: str, data: dict) -> str:
 class _DevResult:
     """Minimal RunResult-like object for the dev fallback agent."""
 
-    def __init__(self, text: str, tool_calls: list | None = None):
+    def __init__(
+        self,
+        text: str,
+        tool_calls: list | None = None,
+        tool_timings: list[ToolTiming] | None = None,
+    ):
         self.final_output = text
-        self._tool_calls = tool_calls or []
+        self.tool_calls = tool_calls or []
+        self.tool_timings = tool_timings or []
 
     @property
     def raw_responses(self):
@@ -244,61 +504,187 @@ class _DevResult:
 # Main entry point
 # ---------------------------------------------------------------------------
 
-async def run_agent(messages: list, user_id: str):
+async def _answer_locally(messages: list, user_id: str, metrics: TurnMetrics):
+    """Answer without the LLM if possible: dev mode, the fast path, or an
+    open circuit. Returns None when the turn needs the full agent.
+    """
+    if not _has_openai_key():
+        logger.info("No OpenAI API key — using dev fallback agent")
+        result, metrics.path = await _run_dev_fallback(messages, user_id), PATH_DEV
+    elif (result := await _try_fast_path(messages, user_id)) is not None:
+        metrics.path = PATH_FAST
+    else:
+        breaker = _get_llm_breaker()
+        if breaker is None or breaker.allow():
+            return None
+        result = await _run_with_circuit_open(messages, user_id)
+        metrics.path = PATH_DEGRADED
+    metrics.tools.extend(getattr(result, "tool_timings", ()))
+    return result
+
+
+async def run_agent(
+    messages: list, user_id: str, metrics: TurnMetrics | None = None
+):
     """Run the TaskAssistant agent with conversation history.
 
-    Creates fresh Agent + MCPServerStdio per invocation (stateless).
-    Falls back to dev agent when no OpenAI key is configured.
+    Creates a fresh Agent per invocation with the configured MCP transport
+    (see _lease_mcp_server) and the shared LLM client, unless the fast path
+    answers a simple command first. Falls back to dev agent when no OpenAI
+    key is configured.
 
     Args:
         messages: Conversation history as list of dicts with 'role' and 'content'.
         user_id: The authenticated user's ID (injected into tool calls context).
+        metrics: Filled in with the path taken, model usage and timings.
 
     Returns:
         RunResult with final_output and tool call metadata.
     """
-    if not _has_openai_key():
-        logger.info("No OpenAI API key — using dev fallback agent")
-        return await _run_dev_fallback(messages, user_id)
+    metrics = metrics or TurnMetrics()
+    local = await _answer_locally(messages, user_id, metrics)
+    if local is not None:
+        return local
 
-    from openai import AsyncOpenAI
     from agents import Agent, Runner, RunConfig
-    from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
-    from agents.mcp import MCPServerStdio
 
-    # Build an OpenAI-compatible client (works with Groq, OpenAI, etc.)
-    client_kwargs: dict = {"api_key": settings.openai_api_key}
-    if settings.openai_base_url:
-        client_kwargs["base_url"] = settings.openai_base_url
-    openai_client = AsyncOpenAI(**client_kwargs)
+    breaker = _get_llm_breaker()
+    async with contextlib.AsyncExitStack() as stack:
+        with _release_probe_on_error(breaker):
+            # OpenAI-compatible client (works with Groq, OpenAI, etc.), kept warm
+            model = _get_model()
+            metrics.model = settings.openai_model
+            lease_started = time.perf_counter()
+            mcp_server = await stack.enter_async_context(_lease_mcp_server(user_id))
+        metrics.mcp_startup_ms = (time.perf_counter() - lease_started) * 1000
+        agent = Agent(
+            name="TaskAssistant",
+            instructions=SYSTEM_INSTRUCTIONS,
+            mcp_servers=[mcp_server],
+            model=model,
+        )
 
-    model = OpenAIChatCompletionsModel(
-        model=settings.openai_model,
-        openai_client=openai_client,
-    )
+        started = time.perf_counter()
+        try:
+            result = await Runner.run(
+                agent,
+                input=messages,
+                hooks=TimingHooks(metrics),
+                run_config=RunConfig(tracing_disabled=True),
+            )
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_cancelled()
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure(e)
+            raise
+        if breaker is not None:
+            breaker.record_success(time.perf_counter() - started)
+        return result
 
-    mcp_command = _get_mcp_server_command()
 
-    async with MCPServerStdio(
-        name="TaskTools",
-        params={
-            "command": mcp_command[0],
-            "args": mcp_command[1:],
-            "cwd": _BACKEND_DIR,
-            "env": _build_subprocess_env(),
-        },
-        client_session_timeout_seconds=30,
-    ) as mcp_server:
+async def run_agent_streamed(
+    messages: list, user_id: str, metrics: TurnMetrics | None = None
+) -> AsyncIterator[dict]:
+    """Run the TaskAssistant agent, yielding its progress as it happens.
+
+    Yields {"type": "delta", "text"} for output tokens, {"type": "tool_call",
+    "tool", "args"} and {"type": "tool_result", "tool", "output"} around each
+    tool call, then one {"type": "result", "result"} with the finished
+    RunResult. Closing the generator early cancels the run and releases the
+    MCP server. The circuit breaker judges streamed runs by their errors
+    and time to the first model response, not the full stream's length.
+    ``metrics`` is filled in as for run_agent.
+    """
+    metrics = metrics or TurnMetrics()
+    fast = await _answer_locally(messages, user_id, metrics)
+    if fast is not None:
+        for call in fast.tool_calls:
+            yield {"type": "tool_call", **call}
+        yield {"type": "delta", "text": fast.final_output}
+        yield {"type": "result", "result": fast}
+        return
+
+    from agents import Agent, Runner, RunConfig
+
+    breaker = _get_llm_breaker()
+    async with contextlib.AsyncExitStack() as stack:
+        with _release_probe_on_error(breaker):
+            model = _get_model()
+            metrics.model = settings.openai_model
+            lease_started = time.perf_counter()
+            mcp_server = await stack.enter_async_context(_lease_mcp_server(user_id))
+        metrics.mcp_startup_ms = (time.perf_counter() - lease_started) * 1000
         agent = Agent(
             name="TaskAssistant",
             instructions=SYSTEM_INSTRUCTIONS,
             mcp_servers=[mcp_server],
             model=model,
         )
-
-        result = await Runner.run(
+        result = Runner.run_streamed(
             agent,
             input=messages,
+            hooks=TimingHooks(metrics),
             run_config=RunConfig(tracing_disabled=True),
         )
-        return result
+        tool_names: dict[str, str] = {}
+        started = time.perf_counter()
+        first_response_at = None
+        try:
+            async for event in result.stream_events():
+                if first_response_at is None and event.type == "raw_response_event":
+                    first_response_at = time.perf_counter()
+                translated = _translate_stream_event(event, tool_names)
+                if translated is not None:
+                    yield translated
+        except (asyncio.CancelledError, GeneratorExit):
+            if breaker is not None:
+                breaker.record_cancelled()
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure(e)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success(
+                    (first_response_at or time.perf_counter()) - started
+                )
+        finally:
+            if not result.is_complete:
+                result.cancel()
+        yield {"type": "result", "result": result}
+
+
+def _translate_stream_event(event, tool_names: dict[str, str]) -> dict | None:
+    """Map an Agents SDK stream event to a chat stream event, or None to skip.
+
+    tool_names remembers call_id -> tool name, as tool outputs carry only
+    the call_id.
+    """
+    if event.type == "raw_response_event":
+        if getattr(event.data, "type", None) == "response.output_text.delta":
+            return {"type": "delta", "text": event.data.delta}
+        return None
+    if event.type != "run_item_stream_event":
+        return None
+
+    raw = event.item.raw_item
+    if event.name == "tool_called":
+        name = getattr(raw, "name", "unknown")
+        tool_names[getattr(raw, "call_id", "")] = name
+        try:
+            args = json.loads(raw.arguments or "{}")
+        except (AttributeError, json.JSONDecodeError, TypeError):
+            args = {}
+        return {"type": "tool_call", "tool": name, "args": args}
+    if event.name == "tool_output":
+        call_id = raw.get("call_id") if isinstance(raw, dict) else getattr(raw, "call_id", "")
+        return {
+            "type": "tool_result",
+            "tool": tool_names.get(call_id, "unknown"),
+            "output": str(event.item.output),
+        }
+    return None
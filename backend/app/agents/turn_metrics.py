@@ -0,0 +1,94 @@
+"""What one chat turn cost: model calls, tokens, and where the time went.
+
+chat_service creates a TurnMetrics per turn and passes it to run_agent /
+run_agent_streamed, which fill in the agent side: which path answered
+(LLM, fast path, dev or degraded fallback), model calls and token usage,
+time in the model, time per tool call, and MCP server startup. chat_service
+adds its own DB time and the total, then stores the result with the
+assistant message (see services/chat_stats.py).
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import RunHooks
+
+# Which part of task_agent answered the turn
+PATH_LLM = "llm"
+PATH_FAST = "fast_path"
+PATH_DEV = "dev"
+PATH_DEGRADED = "degraded"
+
+
+@dataclass
+class ToolTiming:
+    name: str
+    ms: float
+    ok: bool
+
+
+@dataclass
+class TurnMetrics:
+    path: str = PATH_LLM
+    model: str | None = None
+    # LLM requests made by the agent loop (one per agent turn)
+    model_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    model_ms: float = 0.0
+    mcp_startup_ms: float = 0.0
+    db_ms: float = 0.0
+    total_ms: float = 0.0
+    tools: list[ToolTiming] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def tool_ms(self) -> float:
+        return sum(t.ms for t in self.tools)
+
+
+def tool_succeeded(output: Any) -> bool:
+    """False when a task tool reported {"success": false}."""
+    try:
+        data = json.loads(output) if isinstance(output, str) else output
+    except (json.JSONDecodeError, TypeError):
+        return True
+    return not (isinstance(data, dict) and data.get("success") is False)
+
+
+class TimingHooks(RunHooks):
+    """Run hooks that time model and tool calls into a TurnMetrics."""
+
+    def __init__(self, metrics: TurnMetrics) -> None:
+        self.metrics = metrics
+        self._llm_started: float | None = None
+        # Tools of one model response may run concurrently; match FIFO by name
+        self._tool_started: dict[str, list[float]] = {}
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self._llm_started = time.perf_counter()
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        if self._llm_started is not None:
+            self.metrics.model_ms += (time.perf_counter() - self._llm_started) * 1000
+            self._llm_started = None
+        self.metrics.model_calls += 1
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.metrics.prompt_tokens += usage.input_tokens or 0
+            self.metrics.completion_tokens += usage.output_tokens or 0
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self._tool_started.setdefault(tool.name, []).append(time.perf_counter())
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        started = self._tool_started.get(tool.name)
+        if not started:
+            return
+        self.metrics.tools.append(ToolTiming(
+            tool.name,
+            (time.perf_counter() - started.pop(0)) * 1000,
+            tool_succeeded(result),
+        ))
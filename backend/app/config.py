@@ -1,5 +1,7 @@
 """Application configuration loaded from environment variables."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,16 +11,94 @@ class Settings(BaseSettings):
     database_url: str
     jwt_secret: str
     cors_origins: str = "http://localhost:3000"
+    # Comma-separated user IDs (JWT sub) allowed to read GET /api/metrics,
+    # which reports every user's activity; empty allows nobody
+    metrics_operator_ids: str = ""
 
     # Phase III — AI Chatbot (supports OpenAI or Groq via base_url)
     openai_api_key: str = ""
     openai_base_url: str = ""
     openai_model: str = "gpt-4o-mini"
 
+    # Connection pool of the shared LLM client (see agents/llm_clients.py)
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry_seconds: float = 60.0
+    openai_http2: bool = True
+
+    # Circuit breaker around LLM agent runs (see agents/circuit_breaker.py):
+    # opens when at least min_calls in the window failed or were slow at the
+    # given rate; while open, "dev" answers with the local fallback agent and
+    # "fail" returns 503 at once. One probe is let through after open_seconds.
+    llm_breaker_enabled: bool = True
+    llm_breaker_window_seconds: float = 60.0
+    llm_breaker_min_calls: int = 5
+    llm_breaker_failure_rate: float = 0.5
+    llm_breaker_slow_call_seconds: float = 20.0
+    llm_breaker_open_seconds: float = 30.0
+    llm_breaker_fallback: Literal["dev", "fail"] = "dev"
+
+    # Answer simple, unambiguous commands without the LLM when the intent
+    # classifier's confidence reaches the threshold (see agents/intent_router.py)
+    intent_router_enabled: bool = True
+    intent_router_threshold: float = 0.9
+
+    # Prompt tokens of raw chat history sent per turn; older turns are
+    # folded into a per-conversation summary (see services/chat_service.py)
+    chat_history_token_budget: int = 2000
+
+    # Newest messages per conversation kept in memory so a turn's history
+    # needs no messages query (see services/history_cache.py)
+    history_cache_enabled: bool = True
+    history_cache_max_conversations: int = 1000
+    history_cache_messages_per_conversation: int = 50
+    history_cache_ttl_seconds: float = 300.0
+
+    # Admission control for agent runs (see services/admission.py): slots
+    # across the worker and per user, then a fair queue with a max wait
+    chat_max_concurrent_runs: int = 8
+    chat_max_runs_per_user: int = 2
+    chat_max_queued: int = 64
+    chat_max_queued_per_user: int = 4
+    chat_queue_timeout_seconds: float = 10.0
+
+    # Per-user read cache for task lists/details (see services/cache.py)
+    task_cache_enabled: bool = True
+    task_cache_max_items: int = 50_000
+    task_cache_ttl_seconds: float = 30.0
+
+    # Idempotency-Key responses for chat and task creation (see
+    # services/idempotency.py): in-memory LRU size, how long keys are
+    # remembered, and when an unfinished claim counts as abandoned
+    idempotency_cache_max_entries: int = 10_000
+    idempotency_ttl_seconds: float = 86_400.0
+    idempotency_pending_timeout_seconds: float = 120.0
+
+    # Delta sync: how long deleted-task tombstones are kept
+    tombstone_retention_days: int = 30
+
+    # How the agent reaches the MCP task tools: "stdio" subprocesses, or
+    # "inprocess" calls sharing the API's DB engine (single-node deployments)
+    mcp_transport: Literal["stdio", "inprocess"] = "stdio"
+
+    # Warm pool of MCP tool server subprocesses (see agents/mcp_pool.py);
+    # 0 spawns one per chat request instead
+    mcp_pool_size: int = 4
+    mcp_pool_acquire_timeout_seconds: float = 30.0
+    mcp_pool_health_check_interval_seconds: float = 30.0
+
     @property
     def cors_origin_list(self) -> list[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def metrics_operator_id_set(self) -> frozenset[str]:
+        return frozenset(
+            user_id.strip()
+            for user_id in self.metrics_operator_ids.split(",")
+            if user_id.strip()
+        )
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
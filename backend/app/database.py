@@ -8,6 +8,7 @@ from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
+from app.migrations import run_migrations
 
 _connect_args: dict = {}
 _url = settings.database_url
@@ -30,9 +31,10 @@ engine = create_async_engine(_url, echo=False, connect_args=_connect_args)
 
 
 async def create_db_and_tables() -> None:
-    """Create all SQLModel tables."""
+    """Create all SQLModel tables and apply startup migrations."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(run_migrations)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
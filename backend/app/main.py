@@ -1,28 +1,79 @@
 """FastAPI application factory."""
 
+import asyncio
+import contextlib
+import logging
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
-from app.database import create_db_and_tables
+from app.agents.task_agent import (
+    start_llm_clients,
+    start_mcp_pool,
+    stop_llm_clients,
+    stop_mcp_pool,
+)
+from app.database import create_db_and_tables, engine
 from app.models.conversation import Conversation  # noqa: F401 — register for create_all
+from app.models.idempotency import IdempotencyRecord  # noqa: F401 — register for create_all
 from app.models.message import Message  # noqa: F401 — register for create_all
+from app.models.message_stats import MessageStats  # noqa: F401 — register for create_all
 from app.routers.auth import router as auth_router
 from app.routers.chat import router as chat_router
+from app.routers.metrics import router as metrics_router
 from app.routers.tasks import router as tasks_router
+from app.services import idempotency, task_service
 from app.utils.responses import error_response
 
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_INTERVAL_SECONDS = 3600
+
+
+async def _run_maintenance_periodically() -> None:
+    """Hourly: drop delta-sync tombstones past the retention window and
+    expired Idempotency-Key records."""
+    while True:
+        try:
+            cutoff = datetime.utcnow() - timedelta(
+                days=settings.tombstone_retention_days
+            )
+            async with AsyncSession(engine) as session:
+                removed = await task_service.compact_tombstones(session, cutoff)
+            if removed:
+                logger.info("Compacted %d task tombstones", removed)
+        except Exception as e:
+            logger.warning("Tombstone compaction failed: %s", e)
+        try:
+            async with AsyncSession(engine) as session:
+                removed = await idempotency.purge_expired(session, datetime.utcnow())
+            if removed:
+                logger.info("Purged %d expired idempotency keys", removed)
+        except Exception as e:
+            logger.warning("Idempotency key purge failed: %s", e)
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    """Create DB tables on startup."""
+    """Create DB tables, LLM clients and the MCP server pool; run background maintenance."""
     await create_db_and_tables()
+    await start_llm_clients()
+    await start_mcp_pool()
+    maintenance = asyncio.create_task(_run_maintenance_periodically())
     yield
+    maintenance.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await maintenance
+    await stop_mcp_pool()
+    await stop_llm_clients()
 
 
 app = FastAPI(
@@ -44,6 +95,7 @@ app.add_middleware(
 app.include_router(auth_router)
 app.include_router(tasks_router)
 app.include_router(chat_router)
+app.include_router(metrics_router)
 
 
 # ── Dev-only token endpoint (NOT for production) ──────────────────
@@ -1,15 +1,19 @@
 """MCP Server exposing task management tools via FastMCP.
 
 Each tool is stateless: opens its own DB session, executes, commits, closes.
-All tools scope queries by user_id for tenant isolation.
+All tools scope queries by user_id for tenant isolation. Reads and writes go
+through task_service so derived data (e.g. the task_tags index) stays in sync
+with the REST API.
 
 Run as subprocess: python -m app.mcp_server.task_tools
 """
 
 import json
 import logging
+import re
 import sys
 import uuid
+from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -20,42 +24,96 @@ if _backend_dir not in sys.path:
     sys.path.insert(0, _backend_dir)
 
 from mcp.server.fastmcp import FastMCP
-from sqlmodel import select
+from pydantic import BaseModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import engine
-from app.models.task import Task, TaskStatus
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.task import (
+    MAX_BATCH_OPERATIONS,
+    BatchComplete,
+    BatchCreate,
+    BatchDelete,
+    BatchUpdate,
+    TaskCreate,
+    TaskUpdate,
+)
+from app.services import cached_tasks, task_service
+from app.services.title_index import TitleIndex
 
 mcp = FastMCP("TaskTools")
 
+LIST_DEFAULT_LIMIT = 25
+LIST_MAX_LIMIT = 100
+_SHORT_ID = re.compile(rf"^[0-9a-fA-F]{{{task_service.TASK_ID_PREFIX_LENGTH}}}$")
+
+
+class NewTask(BaseModel):
+    """One task for add_tasks."""
+
+    title: str
+    description: str = ""
+
+
+class TaskChange(BaseModel):
+    """One edit for update_tasks."""
+
+    task_id: str
+    title: str = ""
+    description: str = ""
+
 
 async def _get_session() -> AsyncSession:
     """Create a fresh async DB session for a single tool invocation."""
     return AsyncSession(engine)
 
 
-@mcp.tool()
-async def add_task(user_id: str, title: str, description: str = "") -> str:
-    """Create a new task for the user. Use when the user wants to add, create, or make a new task."""
+def _new_task_error(title: str, description: str) -> str | None:
     if not title or not title.strip():
-        return json.dumps({"success": False, "error": "Title is required"})
+        return "Title is required"
     if len(title) > 200:
-        return json.dumps({"success": False, "error": "Title must be 200 characters or less"})
+        return "Title must be 200 characters or less"
+    if description and len(description) > 1000:
+        return "Description must be 1000 characters or less"
+    return None
+
+
+def _task_change_error(title: str, description: str) -> str | None:
+    if not title and not description:
+        return "No fields to update"
+    if title and len(title) > 200:
+        return "Title must be 200 characters or less"
     if description and len(description) > 1000:
-        return json.dumps({"success": False, "error": "Description must be 1000 characters or less"})
+        return "Description must be 1000 characters or less"
+    return None
+
+
+def _batch_size_error(items: list) -> str | None:
+    if not items:
+        return "At least one item is required"
+    if len(items) > MAX_BATCH_OPERATIONS:
+        return f"At most {MAX_BATCH_OPERATIONS} items per call"
+    return None
+
+
+@mcp.tool()
+async def add_task(user_id: str, title: str, description: str = "") -> str:
+    """Create a new task for the user. Use when the user wants to add, create, or make a new task."""
+    error = _new_task_error(title, description)
+    if error:
+        return json.dumps({"success": False, "error": error})
 
     logger.info("add_task called: user_id=%s, title=%s", user_id, title[:50])
     session = await _get_session()
     try:
-        task = Task(
-            title=title.strip(),
-            description=description.strip() if description else None,
-            status=TaskStatus.pending,
-            user_id=user_id,
+        task = await task_service.create_task(
+            session,
+            user_id,
+            TaskCreate(
+                title=title.strip(),
+                description=description.strip() if description else None,
+            ),
         )
-        session.add(task)
-        await session.commit()
-        await session.refresh(task)
         logger.info("add_task success: task_id=%s", task.id)
         return json.dumps({
             "success": True,
@@ -75,22 +133,62 @@ async def add_task(user_id: str, title: str, description: str = "") -> str:
 
 
 @mcp.tool()
-async def list_tasks(user_id: str, status: str = "") -> str:
-    """List all tasks for the user. Optionally filter by status ('pending' or 'completed'). Use when the user wants to see, show, view, or list their tasks."""
+async def list_tasks(
+    user_id: str,
+    status: str = "",
+    priority: str = "",
+    tags: list[str] | None = None,
+    due_before: str = "",
+    due_after: str = "",
+    title_contains: str = "",
+    limit: int = LIST_DEFAULT_LIMIT,
+    cursor: str = "",
+    view: str = "summary",
+) -> str:
+    """List the user's tasks, newest first. Use when the user wants to see, show, view, find, or list tasks.
+
+    Narrow with filters instead of listing everything: status ('pending' or 'completed'), priority ('low', 'medium', 'high'), tags (tasks having all of them), due_before / due_after (ISO dates), title_contains (case-insensitive). Returns at most `limit` tasks (default 25, max 100); pass the returned next_cursor to get the next page.
+    view='summary' (default) returns rows of [short id, title, status]; short ids work as task_id in the other tools. Use view='full' only when descriptions, priorities or dates are needed.
+    """
     if status and status not in ("pending", "completed"):
         return json.dumps({"success": False, "error": "Status must be 'pending', 'completed', or empty"})
+    if priority and priority not in TaskPriority.__members__:
+        return json.dumps({"success": False, "error": "Priority must be 'low', 'medium', 'high', or empty"})
+    if view not in ("summary", "full"):
+        return json.dumps({"success": False, "error": "View must be 'summary' or 'full'"})
+    if not 1 <= limit <= LIST_MAX_LIMIT:
+        return json.dumps({"success": False, "error": f"Limit must be between 1 and {LIST_MAX_LIMIT}"})
+    try:
+        due_range = {
+            name: datetime.fromisoformat(value) if value else None
+            for name, value in (("due_before", due_before), ("due_after", due_after))
+        }
+    except ValueError:
+        return json.dumps({"success": False, "error": "Due dates must be ISO dates, e.g. 2026-05-01"})
 
     session = await _get_session()
     try:
-        query = select(Task).where(Task.user_id == user_id)
-        if status:
-            query = query.where(Task.status == status)
-        query = query.order_by(Task.created_at.desc())
-        result = await session.exec(query)
-        tasks = list(result.all())
-        return json.dumps({
-            "success": True,
-            "data": {
+        tasks, next_cursor = await task_service.list_tasks_page(
+            session,
+            user_id,
+            limit=limit,
+            cursor=cursor or None,
+            status=TaskStatus(status) if status else None,
+            priority=priority or None,
+            tags=tags or None,
+            title_contains=title_contains.strip() or None,
+            **due_range,
+        )
+        if view == "summary":
+            data = {
+                "fields": ["id", "title", "status"],
+                "rows": [
+                    [task_service.short_task_id(t.id), t.title, t.status.value]
+                    for t in tasks
+                ],
+            }
+        else:
+            data = {
                 "tasks": [
                     {
                         "id": str(t.id),
@@ -98,47 +196,119 @@ async def list_tasks(user_id: str, status: str = "") -> str:
                         "description": t.description,
                         "completed": t.status == TaskStatus.completed,
                         "priority": t.priority.value if t.priority else "medium",
+                        "tags": t.tags,
+                        "due_date": t.due_date.isoformat() if t.due_date else None,
                         "created_at": t.created_at.isoformat() if t.created_at else None,
                     }
                     for t in tasks
                 ],
-                "count": len(tasks),
-            },
-        })
+            }
+        data["count"] = len(tasks)
+        data["next_cursor"] = next_cursor
+        return json.dumps({"success": True, "data": data}, separators=(",", ":"))
+    except ValueError as e:
+        return json.dumps({"success": False, "error": str(e)})
     except Exception as e:
         return json.dumps({"success": False, "error": f"Database error: {e}"})
     finally:
         await session.close()
 
 
+async def _resolve_task_ids(
+    session: AsyncSession, user_id: str, task_ids: list[str]
+) -> list[tuple[uuid.UUID | None, str | None]]:
+    """Resolve task references: full UUIDs, short ids, or task titles.
+
+    Short ids are looked up together in one query; anything else (and a
+    short id that matches no task) is matched against the user's cached
+    title index. Returns one (task UUID, None) or (None, error message)
+    per input, in order.
+    """
+    task_ids = [task_id.strip() for task_id in task_ids]
+    prefixes = [task_id for task_id in task_ids if _SHORT_ID.match(task_id)]
+    matches = (
+        await task_service.find_task_ids_by_prefixes(session, user_id, prefixes)
+        if prefixes
+        else {}
+    )
+    index = None
+    resolved: list[tuple[uuid.UUID | None, str | None]] = []
+    for task_id in task_ids:
+        if not task_id:
+            resolved.append((None, "Task ID or title is required"))
+            continue
+        if _SHORT_ID.match(task_id):
+            found = matches[task_id.lower()]
+            if len(found) == 1:
+                resolved.append((found[0], None))
+                continue
+            if found:
+                resolved.append(
+                    (None, "Short task ID is ambiguous; use the full ID from view='full'")
+                )
+                continue
+        else:
+            try:
+                resolved.append((uuid.UUID(task_id), None))
+                continue
+            except ValueError:
+                pass
+        if index is None:
+            version = await task_service.get_list_version(session, user_id)
+            index = await cached_tasks.title_index(session, user_id, version)
+        resolved.append(_match_title(index, task_id))
+    return resolved
+
+
+def _match_title(
+    index: TitleIndex, reference: str
+) -> tuple[uuid.UUID | None, str | None]:
+    match = index.resolve(reference)
+    if match.task is not None:
+        return match.task.id, None
+    if not match.candidates:
+        return None, "Task not found"
+    options = "; ".join(
+        f'{task_service.short_task_id(c.id)} "{c.title}" ({c.status.value})'
+        for c in match.candidates
+    )
+    if len(match.candidates) > 1:
+        return None, (
+            f'Several tasks match "{reference}": {options}. '
+            "Ask the user which one, then pass its ID"
+        )
+    return None, (
+        f'No task is titled "{reference}"; closest is {options}. '
+        "Ask the user whether they mean it, then pass its ID"
+    )
+
+
+async def _resolve_task_id(
+    session: AsyncSession, user_id: str, task_id: str
+) -> tuple[uuid.UUID | None, str | None]:
+    """Resolve one task reference; see _resolve_task_ids."""
+    return (await _resolve_task_ids(session, user_id, [task_id]))[0]
+
+
 @mcp.tool()
 async def complete_task(user_id: str, task_id: str) -> str:
-    """Mark a task as completed. Use when the user wants to complete, finish, or mark done a task."""
-    try:
-        task_uuid = uuid.UUID(task_id)
-    except ValueError:
-        return json.dumps({"success": False, "error": "Invalid task ID format"})
-
+    """Mark a task as completed. Use when the user wants to complete, finish, or mark done a task. task_id is a full or short task ID, or the task's title (no need to list tasks first)."""
     session = await _get_session()
     try:
-        query = select(Task).where(Task.id == task_uuid, Task.user_id == user_id)
-        result = await session.exec(query)
-        task = result.first()
+        task_uuid, error = await _resolve_task_id(session, user_id, task_id)
+        if error:
+            return json.dumps({"success": False, "error": error})
+        task, completed = await task_service.complete_task(session, user_id, task_uuid)
         if not task:
             return json.dumps({"success": False, "error": "Task not found"})
-        if task.status == TaskStatus.completed:
+        if not completed:
             return json.dumps({"success": False, "error": "Task is already completed"})
-
-        task.status = TaskStatus.completed
-        session.add(task)
-        await session.commit()
-        await session.refresh(task)
         return json.dumps({
             "success": True,
             "data": {
                 "id": str(task.id),
                 "title": task.title,
-                "completed": True,
+                "completed": task.status == TaskStatus.completed,
             },
         })
     except Exception as e:
@@ -150,28 +320,21 @@ async def complete_task(user_id: str, task_id: str) -> str:
 
 @mcp.tool()
 async def delete_task(user_id: str, task_id: str) -> str:
-    """Delete a task permanently. Use when the user wants to delete or remove a task."""
-    try:
-        task_uuid = uuid.UUID(task_id)
-    except ValueError:
-        return json.dumps({"success": False, "error": "Invalid task ID format"})
-
+    """Delete a task permanently. Use when the user wants to delete or remove a task. task_id is a full or short task ID, or the task's title (no need to list tasks first)."""
     session = await _get_session()
     try:
-        query = select(Task).where(Task.id == task_uuid, Task.user_id == user_id)
-        result = await session.exec(query)
-        task = result.first()
-        if not task:
+        task_uuid, error = await _resolve_task_id(session, user_id, task_id)
+        if error:
+            return json.dumps({"success": False, "error": error})
+        title = await task_service.delete_task_returning_title(
+            session, user_id, task_uuid
+        )
+        if title is None:
             return json.dumps({"success": False, "error": "Task not found"})
-
-        title = task.title
-        task_id_str = str(task.id)
-        await session.delete(task)
-        await session.commit()
         return json.dumps({
             "success": True,
             "data": {
-                "id": task_id_str,
+                "id": str(task_uuid),
                 "title": title,
                 "deleted": True,
             },
@@ -187,35 +350,27 @@ async def delete_task(user_id: str, task_id: str) -> str:
 async def update_task(
     user_id: str, task_id: str, title: str = "", description: str = ""
 ) -> str:
-    """Update a task's title or description. Use when the user wants to rename, edit, change, or update a task."""
-    try:
-        task_uuid = uuid.UUID(task_id)
-    except ValueError:
-        return json.dumps({"success": False, "error": "Invalid task ID format"})
-
-    if not title and not description:
-        return json.dumps({"success": False, "error": "No fields to update"})
-    if title and len(title) > 200:
-        return json.dumps({"success": False, "error": "Title must be 200 characters or less"})
-    if description and len(description) > 1000:
-        return json.dumps({"success": False, "error": "Description must be 1000 characters or less"})
+    """Update a task's title or description. Use when the user wants to rename, edit, change, or update a task. task_id is a full or short task ID, or the task's title (no need to list tasks first)."""
+    error = _task_change_error(title, description)
+    if error:
+        return json.dumps({"success": False, "error": error})
 
     session = await _get_session()
     try:
-        query = select(Task).where(Task.id == task_uuid, Task.user_id == user_id)
-        result = await session.exec(query)
-        task = result.first()
-        if not task:
-            return json.dumps({"success": False, "error": "Task not found"})
-
+        task_uuid, error = await _resolve_task_id(session, user_id, task_id)
+        if error:
+            return json.dumps({"success": False, "error": error})
+        changes: dict = {}
         if title:
-            task.title = title.strip()
+            changes["title"] = title.strip()
         if description:
-            task.description = description.strip()
+            changes["description"] = description.strip()
 
-        session.add(task)
-        await session.commit()
-        await session.refresh(task)
+        task = await task_service.update_task(
+            session, user_id, task_uuid, TaskUpdate(**changes)
+        )
+        if not task:
+            return json.dumps({"success": False, "error": "Task not found"})
         return json.dumps({
             "success": True,
             "data": {
@@ -232,5 +387,170 @@ async def update_task(
         await session.close()
 
 
+async def _run_batch(
+    session: AsyncSession,
+    user_id: str,
+    refs: list[str],
+    operations: list,
+    errors: dict[int, str],
+) -> str:
+    """Apply the valid operations in one transaction and report every item.
+
+    ``refs`` names each input item in the output; ``operations`` holds one
+    batch operation per item, None where ``errors`` has its rejection.
+    """
+    valid = [(i, op) for i, op in enumerate(operations) if op is not None]
+    outcomes = (
+        await task_service.apply_batch(session, user_id, [op for _, op in valid])
+        if valid
+        else []
+    )
+    done = {}
+    for (index, _), outcome in zip(valid, outcomes):
+        if outcome.ok:
+            done[index] = outcome
+        else:
+            errors[index] = outcome.message
+    results = [
+        {
+            "id": task_service.short_task_id(done[i].task_id),
+            "title": done[i].task.title,
+            "ok": True,
+        }
+        if i in done
+        else {"id": ref, "ok": False, "error": errors[i]}
+        for i, ref in enumerate(refs)
+    ]
+    return json.dumps(
+        {
+            "success": True,
+            "data": {
+                "results": results,
+                "succeeded": len(done),
+                "failed": len(results) - len(done),
+            },
+        },
+        separators=(",", ":"),
+    )
+
+
+async def _id_batch(user_id: str, task_ids: list[str], make_op) -> str:
+    """Shared body of the batch tools that act on existing tasks by ID."""
+    error = _batch_size_error(task_ids)
+    if error:
+        return json.dumps({"success": False, "error": error})
+    session = await _get_session()
+    try:
+        errors: dict[int, str] = {}
+        operations = []
+        for index, (task_uuid, error) in enumerate(
+            await _resolve_task_ids(session, user_id, task_ids)
+        ):
+            if error:
+                errors[index] = error
+                operations.append(None)
+            else:
+                operations.append(make_op(task_uuid))
+        return await _run_batch(session, user_id, task_ids, operations, errors)
+    except Exception as e:
+        await session.rollback()
+        return json.dumps({"success": False, "error": f"Database error: {e}"})
+    finally:
+        await session.close()
+
+
+@mcp.tool()
+async def add_tasks(user_id: str, tasks: list[NewTask]) -> str:
+    """Create several tasks in one call. Prefer this over repeated add_task when the user names more than one task. Each result reports its own success or error."""
+    error = _batch_size_error(tasks)
+    if error:
+        return json.dumps({"success": False, "error": error})
+
+    errors: dict[int, str] = {}
+    operations = []
+    for index, item in enumerate(tasks):
+        error = _new_task_error(item.title, item.description)
+        if error:
+            errors[index] = error
+            operations.append(None)
+            continue
+        operations.append(
+            BatchCreate(
+                op="create",
+                data=TaskCreate(
+                    title=item.title.strip(),
+                    description=item.description.strip() or None,
+                ),
+            )
+        )
+
+    logger.info("add_tasks called: user_id=%s, count=%d", user_id, len(tasks))
+    session = await _get_session()
+    try:
+        return await _run_batch(
+            session, user_id, [item.title for item in tasks], operations, errors
+        )
+    except Exception as e:
+        await session.rollback()
+        logger.error("add_tasks failed: %s", e)
+        return json.dumps({"success": False, "error": f"Database error: {e}"})
+    finally:
+        await session.close()
+
+
+@mcp.tool()
+async def complete_tasks(user_id: str, task_ids: list[str]) -> str:
+    """Mark several tasks as completed in one call. Prefer this over repeated complete_task. task_ids are full or short task IDs or task titles; each result reports its own success or error."""
+    return await _id_batch(
+        user_id, task_ids, lambda task_uuid: BatchComplete(op="complete", id=task_uuid)
+    )
+
+
+@mcp.tool()
+async def delete_tasks(user_id: str, task_ids: list[str]) -> str:
+    """Delete several tasks permanently in one call. Prefer this over repeated delete_task. task_ids are full or short task IDs or task titles; each result reports its own success or error."""
+    return await _id_batch(
+        user_id, task_ids, lambda task_uuid: BatchDelete(op="delete", id=task_uuid)
+    )
+
+
+@mcp.tool()
+async def update_tasks(user_id: str, updates: list[TaskChange]) -> str:
+    """Update the title or description of several tasks in one call. Prefer this over repeated update_task. Each task_id is a full or short task ID or a task title; each result reports its own success or error."""
+    error = _batch_size_error(updates)
+    if error:
+        return json.dumps({"success": False, "error": error})
+
+    session = await _get_session()
+    try:
+        errors: dict[int, str] = {}
+        operations = []
+        resolved = await _resolve_task_ids(
+            session, user_id, [item.task_id for item in updates]
+        )
+        for index, (item, (task_uuid, error)) in enumerate(zip(updates, resolved)):
+            error = error or _task_change_error(item.title, item.description)
+            if error:
+                errors[index] = error
+                operations.append(None)
+                continue
+            changes: dict = {}
+            if item.title:
+                changes["title"] = item.title.strip()
+            if item.description:
+                changes["description"] = item.description.strip()
+            operations.append(
+                BatchUpdate(op="update", id=task_uuid, data=TaskUpdate(**changes))
+            )
+        return await _run_batch(
+            session, user_id, [item.task_id for item in updates], operations, errors
+        )
+    except Exception as e:
+        await session.rollback()
+        return json.dumps({"success": False, "error": f"Database error: {e}"})
+    finally:
+        await session.close()
+
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
@@ -0,0 +1,43 @@
+"""Idempotency-Key handling for POST routes."""
+
+from collections.abc import Awaitable, Callable
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+from app.services.idempotency import (
+    IdempotencyError,
+    idempotency_store,
+    request_fingerprint,
+    validate_key,
+)
+from app.utils.responses import error_response
+
+
+async def idempotent(
+    user_id: str,
+    key: str | None,
+    scope: str,
+    body: BaseModel,
+    call: Callable[[], Awaitable[Response]],
+) -> Response:
+    """Run ``call``, or replay its stored response if ``key`` was seen before.
+
+    Without a key the call just runs. Raises 400 for a malformed key, 409
+    (with Retry-After) while the key is in progress in another worker, and
+    422 if the key was used for a different request.
+    """
+    if key is None:
+        return await call()
+    try:
+        validate_key(key)
+        return await idempotency_store.run(
+            user_id, key, request_fingerprint(scope, body), call
+        )
+    except IdempotencyError as e:
+        headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=error_response(e.code, e.message),
+            headers=headers,
+        )
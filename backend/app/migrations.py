@@ -0,0 +1,173 @@
+"""Idempotent startup schema upgrades.
+
+The app creates its schema with ``SQLModel.metadata.create_all``, which only
+creates missing tables. These steps bring databases created by an earlier
+release up to date (new indexes, columns, backfills) and are safe to run on
+every startup.
+"""
+
+import logging
+from itertools import groupby
+
+from sqlalchemy import Text, bindparam, func, inspect, insert, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel
+
+from app.models.conversation import Conversation  # noqa: F401 — messages' FK target
+from app.models.message import Message
+from app.models.task import Task, TaskListVersion, TaskTag, create_search_index
+from app.utils.tokens import CHARS_PER_TOKEN, MESSAGE_OVERHEAD_TOKENS
+
+logger = logging.getLogger(__name__)
+
+
+def run_migrations(conn: Connection) -> None:
+    """Apply all startup migrations on a sync connection (use via run_sync)."""
+    _migrate_tags_to_jsonb(conn)
+    _ensure_columns(conn)
+    _ensure_indexes(conn)
+    _backfill_task_tags(conn)
+    _backfill_change_seq(conn)
+    _ensure_search_index(conn)
+    _backfill_message_token_counts(conn)
+
+
+def _ensure_columns(conn: Connection) -> None:
+    """Add declared columns missing from existing tables.
+
+    New columns must be nullable or carry a server_default so existing rows
+    stay valid.
+    """
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            logger.info("Adding column %s.%s", table.name, column.name)
+            conn.execute(
+                text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+            )
+
+
+def _ensure_indexes(conn: Connection) -> None:
+    """Create any declared index that is missing on an existing table."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _migrate_tags_to_jsonb(conn: Connection) -> None:
+    """Convert a PostgreSQL tasks.tags TEXT column to JSONB in place.
+
+    Existing rows already hold JSON arrays, so the cast is lossless. Must run
+    before _ensure_indexes, since idx_task_tags_gin needs a JSONB column.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    columns = {c["name"]: c["type"] for c in inspect(conn).get_columns("tasks")}
+    if not isinstance(columns.get("tags"), Text):
+        return
+    logger.info("Migrating tasks.tags from TEXT to JSONB")
+    conn.execute(text("ALTER TABLE tasks ALTER COLUMN tags DROP DEFAULT"))
+    conn.execute(
+        text("ALTER TABLE tasks ALTER COLUMN tags TYPE JSONB USING tags::jsonb")
+    )
+
+
+def _backfill_task_tags(conn: Connection) -> None:
+    """Populate task_tags for tasks written before the side table existed.
+
+    Only needed where tag filters use the side table (not PostgreSQL).
+    """
+    if conn.dialect.name == "postgresql":
+        return
+    indexed = select(TaskTag.task_id).distinct()
+    rows = conn.execute(
+        select(Task.id, Task.user_id, Task.tags).where(
+            Task.tags != [], Task.id.not_in(indexed)
+        )
+    ).all()
+    tag_rows = [
+        {"task_id": task_id, "user_id": user_id, "tag": tag}
+        for task_id, user_id, tags in rows
+        for tag in dict.fromkeys(tags)
+    ]
+    if tag_rows:
+        conn.execute(insert(TaskTag), tag_rows)
+        logger.info("Backfilled %d task_tags rows for %d tasks", len(tag_rows), len(rows))
+
+
+def _backfill_change_seq(conn: Connection) -> None:
+    """Give tasks written before delta sync a unique change_seq.
+
+    Each legacy task takes the next value of its owner's task list version,
+    as if it had just been written, so change_seq stays unique per user.
+    """
+    rows = conn.execute(
+        select(Task.user_id, Task.id)
+        .where(Task.change_seq == 0)
+        .order_by(Task.user_id, Task.created_at)
+    ).all()
+    if not rows:
+        return
+    versions = dict(
+        conn.execute(select(TaskListVersion.user_id, TaskListVersion.version)).all()
+    )
+    task_updates = []
+    for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+        seq = versions.get(user_id, 0)
+        for _, task_id in user_rows:
+            seq += 1
+            task_updates.append({"task_id": task_id, "seq": seq})
+        if user_id in versions:
+            conn.execute(
+                update(TaskListVersion)
+                .where(TaskListVersion.user_id == user_id)
+                .values(version=seq)
+            )
+        else:
+            conn.execute(insert(TaskListVersion).values(user_id=user_id, version=seq))
+    tasks = Task.__table__
+    conn.execute(
+        update(tasks)
+        .where(tasks.c.id == bindparam("task_id"))
+        .values(change_seq=bindparam("seq")),
+        task_updates,
+    )
+    logger.info("Backfilled change_seq for %d tasks", len(task_updates))
+
+
+def _ensure_search_index(conn: Connection) -> None:
+    """Create the full-text search index on databases that predate it.
+
+    PostgreSQL computes the generated column for existing rows when it is
+    added; the SQLite FTS5 table is rebuilt from tasks once, on creation.
+    """
+    missing = "tasks_fts" not in inspect(conn).get_table_names()
+    create_search_index(conn)
+    if conn.dialect.name == "sqlite" and missing:
+        conn.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+        logger.info("Built tasks_fts search index")
+
+
+def _backfill_message_token_counts(conn: Connection) -> None:
+    """Estimate token_count for messages stored before it was recorded.
+
+    Same formula as utils/tokens.estimate_tokens, in SQL; every message
+    costs at least the per-message overhead, so 0 marks legacy rows.
+    """
+    messages = Message.__table__
+    text_tokens = (
+        func.length(messages.c.content) + CHARS_PER_TOKEN - 1
+    ) // CHARS_PER_TOKEN
+    result = conn.execute(
+        update(messages)
+        .where(messages.c.token_count == 0)
+        .values(token_count=text_tokens + MESSAGE_OVERHEAD_TOKENS)
+    )
+    if result.rowcount:
+        logger.info("Backfilled token_count for %d messages", result.rowcount)
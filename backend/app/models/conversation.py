@@ -3,8 +3,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Index
-from sqlmodel import Field, SQLModel
+from sqlalchemy import Index, Text
+from sqlmodel import Column, Field, SQLModel
 
 
 class Conversation(SQLModel, table=True):
@@ -16,5 +16,9 @@ class Conversation(SQLModel, table=True):
     user_id: str = Field(index=True, nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    # Rolling summary of turns folded out of the history token budget, and
+    # the created_at of the newest message it covers (see chat_service.py)
+    summary: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+    summary_through: datetime | None = Field(default=None)
 
     __table_args__ = (Index("idx_conversation_user_id", "user_id"),)
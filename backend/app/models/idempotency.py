@@ -0,0 +1,29 @@
+"""SQLModel entity for stored Idempotency-Key responses."""
+
+from datetime import datetime
+
+from sqlalchemy import Index, LargeBinary
+from sqlmodel import Column, Field, SQLModel
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """A request made with an Idempotency-Key, and its response once done.
+
+    The row is claimed (``status_code`` NULL) before the request runs and
+    completed with the response afterwards, so a retry that reaches another
+    worker sees the first attempt. Expired rows are purged periodically
+    (see services/idempotency.py).
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: str = Field(primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    # Endpoint and request body hash; a reused key with another request is rejected
+    fingerprint: str = Field(nullable=False, max_length=64)
+    status_code: int | None = Field(default=None)
+    body: bytes | None = Field(default=None, sa_column=Column(LargeBinary))
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    expires_at: datetime = Field(nullable=False)
+
+    __table_args__ = (Index("idx_idempotency_expires_at", "expires_at"),)
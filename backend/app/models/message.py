@@ -19,6 +19,8 @@ class Message(SQLModel, table=True):
     user_id: str = Field(index=True, nullable=False)
     role: str = Field(nullable=False)  # "user" or "assistant"
     content: str = Field(sa_column=Column(Text, nullable=False))
+    # Estimated prompt tokens (utils/tokens.py), set at write time
+    token_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
     __table_args__ = (
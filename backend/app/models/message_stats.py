@@ -0,0 +1,37 @@
+"""SQLModel entity for per-turn chat instrumentation."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Index, Text
+from sqlmodel import Column, Field, SQLModel
+
+
+class MessageStats(SQLModel, table=True):
+    """What producing one assistant message cost (see agents/turn_metrics.py).
+
+    One row per assistant message, written in the same commit. Durations
+    are whole milliseconds; ``tools`` is compact JSON, one
+    ``[name, ms, ok]`` triple per tool call in call order.
+    """
+
+    __tablename__ = "message_stats"
+
+    message_id: uuid.UUID = Field(foreign_key="messages.id", primary_key=True)
+    user_id: str = Field(nullable=False)
+    path: str = Field(nullable=False, max_length=16)
+    model: str | None = Field(default=None, max_length=100)
+    model_calls: int = Field(default=0, nullable=False)
+    prompt_tokens: int = Field(default=0, nullable=False)
+    completion_tokens: int = Field(default=0, nullable=False)
+    total_ms: int = Field(default=0, nullable=False)
+    model_ms: int = Field(default=0, nullable=False)
+    tool_ms: int = Field(default=0, nullable=False)
+    mcp_startup_ms: int = Field(default=0, nullable=False)
+    db_ms: int = Field(default=0, nullable=False)
+    tools: str = Field(default="[]", sa_column=Column(Text, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_message_stats_user_created", "user_id", "created_at"),
+    )
@@ -5,25 +5,40 @@ import json
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, Index, Text, TypeDecorator
+from sqlalchemy import Column, Index, Text, TypeDecorator, event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
 
 class JSONEncodedList(TypeDecorator):
-    """Store list[str] as JSON text — works with both PostgreSQL and SQLite."""
+    """Store list[str] as JSONB on PostgreSQL and as JSON text elsewhere.
+
+    JSONB gives PostgreSQL native containment (@>) backed by a GIN index;
+    SQLite keeps the JSON text encoding and filters through task_tags.
+    """
 
     impl = Text
     cache_ok = True
 
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+
     def process_bind_param(self, value, dialect):
+        if dialect.name == "postgresql":
+            return value if value is not None else []
         if value is not None:
             return json.dumps(value)
         return "[]"
 
     def process_result_value(self, value, dialect):
-        if value is not None:
-            return json.loads(value)
-        return []
+        if value is None:
+            return []
+        if dialect.name == "postgresql":
+            return value
+        return json.loads(value)
 
 
 class TaskStatus(str, enum.Enum):
@@ -63,8 +78,151 @@ class Task(SQLModel, table=True):
     user_id: str = Field(index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # User's task list version at this task's last write (delta sync cursor)
+    change_seq: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     __table_args__ = (
         Index("idx_task_user_id", "user_id"),
         Index("idx_task_user_status", "user_id", "status"),
+        Index("idx_task_user_created", "user_id", "created_at", "id"),
+        Index("idx_task_user_change_seq", "user_id", "change_seq"),
+        Index("idx_task_tags_gin", "tags", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
     )
+
+
+class TaskTag(SQLModel, table=True):
+    """One (task, tag) pair — normalized index for tag filters.
+
+    Mirrors Task.tags so tag lookups hit idx_task_tag_user_tag instead of
+    scanning the JSON text column. Kept in sync by task_service on dialects
+    without native JSON containment; PostgreSQL uses idx_task_tags_gin.
+    """
+
+    __tablename__ = "task_tags"
+
+    task_id: uuid.UUID = Field(
+        foreign_key="tasks.id", primary_key=True, ondelete="CASCADE"
+    )
+    tag: str = Field(primary_key=True)
+    user_id: str = Field(nullable=False)
+
+    __table_args__ = (Index("idx_task_tag_user_tag", "user_id", "tag"),)
+
+
+class TaskListVersion(SQLModel, table=True):
+    """Per-user task list version — bumped in the same transaction as every
+    task write, so readers can tell whether anything changed (ETag) with a
+    single primary-key lookup.
+    """
+
+    __tablename__ = "task_list_versions"
+
+    user_id: str = Field(primary_key=True)
+    version: int = Field(default=0, nullable=False)
+    # Highest change_seq whose tombstone was compacted away; delta syncs
+    # from before this point must fall back to a full resync.
+    purged_seq: int = Field(
+        default=0, nullable=False, sa_column_kwargs={"server_default": "0"}
+    )
+
+
+class TaskTombstone(SQLModel, table=True):
+    """Record of a deleted task, kept so delta sync can report deletions.
+
+    Compacted after a retention period (see task_service.compact_tombstones).
+    """
+
+    __tablename__ = "task_tombstones"
+
+    task_id: uuid.UUID = Field(primary_key=True)
+    user_id: str = Field(nullable=False)
+    change_seq: int = Field(nullable=False)
+    deleted_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_tombstone_user_seq", "user_id", "change_seq"),
+        Index("idx_tombstone_deleted_at", "deleted_at"),
+    )
+
+
+# ─── Full-text search index ──────────────────────────────────────────
+#
+# Maintained by the database itself, so every writer (REST API, batch,
+# the MCP tool subprocess, ad-hoc SQL) keeps it current without extra
+# round trips. SQLite uses an external-content FTS5 table keyed by the
+# tasks rowid and synced by triggers (run ``INSERT INTO tasks_fts(tasks_fts)
+# VALUES ('rebuild')`` after a VACUUM, which may renumber rowids).
+# PostgreSQL uses a generated tsvector column behind a GIN index. Both
+# tokenize without stemming and weight the title above the description.
+
+_SEARCH_DDL = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            user_id, title, description,
+            content='tasks', content_rowid='rowid', prefix='2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, user_id, title, description)
+            VALUES (new.rowid, new.user_id, new.title, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, user_id, title, description)
+            VALUES ('delete', old.rowid, old.user_id, old.title, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+        AFTER UPDATE OF user_id, title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, user_id, title, description)
+            VALUES ('delete', old.rowid, old.user_id, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, user_id, title, description)
+            VALUES (new.rowid, new.user_id, new.title, new.description);
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A')
+            || setweight(
+                to_tsvector('simple'::regconfig, coalesce(description, '')), 'B'
+            )
+        ) STORED
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_task_search_gin
+        ON tasks USING gin (search_vector)
+        """,
+    ],
+}
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the full-text search index for the connection's dialect.
+
+    Idempotent. Does not index existing rows on SQLite; see
+    migrations._ensure_search_index.
+    """
+    for statement in _SEARCH_DDL.get(conn.dialect.name, []):
+        conn.execute(text(statement))
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_search_index(target, connection, **kw) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(Task.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw) -> None:
+    # The FTS5 table is not part of the metadata; drop it with its content
+    # table so a recreated tasks table does not inherit stale rowids.
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS tasks_fts"))
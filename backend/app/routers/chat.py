@@ -1,31 +1,41 @@
-"""Chat API endpoint — POST /api/{user_id}/chat per contract."""
+"""Chat API endpoints — POST /api/{user_id}/chat per contract, plus a
+Server-Sent Events variant at POST /api/{user_id}/chat/stream."""
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.middleware.auth import get_current_user_id
+from app.middleware.idempotency import idempotent
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services import chat_service
-from app.utils.responses import error_response, success_response
+from app.services.admission import AdmissionRejectedError
+from app.utils.responses import (
+    EventStreamResponse,
+    error_response,
+    success_json_response,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["chat"])
 
 
-@router.post("/api/{user_id}/chat")
+@router.post("/api/{user_id}/chat", response_model=None)
 async def chat(
     user_id: str,
     body: ChatRequest,
     current_user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+    idempotency_key: str | None = Header(None),
+) -> Response:
     """Send a message to the AI task assistant and receive a response.
 
-    Path user_id must match the JWT sub claim (FR-012).
+    Path user_id must match the JWT sub claim (FR-012). With an
+    Idempotency-Key header, a retry of a completed turn gets the stored
+    response instead of running the agent again.
     """
     # Validate path user_id matches JWT subject
     if user_id != current_user_id:
@@ -34,6 +44,18 @@ async def chat(
             detail=error_response("FORBIDDEN", "Forbidden"),
         )
 
+    return await idempotent(
+        user_id,
+        idempotency_key,
+        "chat",
+        body,
+        lambda: _chat_turn(user_id, body, session),
+    )
+
+
+async def _chat_turn(
+    user_id: str, body: ChatRequest, session: AsyncSession
+) -> Response:
     try:
         response: ChatResponse = await chat_service.handle_chat(
             user_id=user_id,
@@ -41,7 +63,10 @@ async def chat(
             conversation_id=body.conversation_id,
             session=session,
         )
-        return success_response(response.model_dump(mode="json"))
+        return success_json_response(response.model_dump(mode="json"))
+
+    except AdmissionRejectedError as e:
+        raise _rejected(e)
 
     except ValueError as e:
         # Conversation not found or ownership mismatch
@@ -59,3 +84,50 @@ async def chat(
                 "SERVICE_ERROR", "Service temporarily unavailable"
             ),
         )
+
+
+@router.post("/api/{user_id}/chat/stream", response_model=None)
+async def chat_stream(
+    user_id: str,
+    body: ChatRequest,
+    current_user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Send a message and stream the assistant's reply as Server-Sent Events.
+
+    Events: start {conversation_id}, delta {text}, tool_call {tool, args},
+    tool_result {tool, output}, then done {conversation_id, response,
+    tool_calls} or error {message}. Path user_id must match the JWT sub
+    claim (FR-012).
+    """
+    if user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=error_response("FORBIDDEN", "Forbidden"),
+        )
+
+    try:
+        events = await chat_service.stream_chat(
+            user_id=user_id,
+            message=body.message,
+            conversation_id=body.conversation_id,
+            session=session,
+        )
+    except AdmissionRejectedError as e:
+        raise _rejected(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response("NOT_FOUND", str(e)),
+        )
+    return EventStreamResponse(events)
+
+
+def _rejected(e: AdmissionRejectedError) -> HTTPException:
+    """429 (this user is over their limits) or 503 (saturated) with Retry-After."""
+    logger.warning("Chat request rejected: %s", e.message)
+    return HTTPException(
+        status_code=e.status_code,
+        detail=error_response(e.code, e.message),
+        headers={"Retry-After": str(e.retry_after)},
+    )
@@ -0,0 +1,69 @@
+"""Operational metrics endpoints — GET /api/metrics, GET /api/metrics/chat."""
+
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.agents.task_agent import (
+    intent_router_stats,
+    llm_breaker_stats,
+    llm_client_stats,
+    mcp_pool_stats,
+)
+from app.config import settings
+from app.database import get_session
+from app.middleware.auth import get_current_user_id
+from app.services.admission import chat_admission
+from app.services.cache import task_cache
+from app.services.chat_service import history_stats
+from app.services.chat_stats import turn_stats, user_summary
+from app.services.history_cache import history_cache
+from app.services.idempotency import idempotency_store
+from app.utils.responses import error_response, success_response
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+# Longest window GET /api/metrics/chat aggregates over
+MAX_CHAT_STATS_HOURS = 24 * 30
+
+
+@router.get("")
+async def get_metrics(
+    user_id: str = Depends(get_current_user_id),
+) -> dict:
+    """Return in-process counters for this worker (cache hit/miss, etc.).
+
+    The figures span all users and include the LLM provider's base URL, so
+    only the IDs in METRICS_OPERATOR_IDS may read them.
+    """
+    if user_id not in settings.metrics_operator_id_set:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=error_response("FORBIDDEN", "Forbidden"),
+        )
+    return success_response(
+        {
+            "task_cache": task_cache.stats(),
+            "mcp_pool": mcp_pool_stats(),
+            "llm_clients": llm_client_stats(),
+            "llm_breaker": llm_breaker_stats(),
+            "chat_history": history_stats(),
+            "history_cache": history_cache.stats(),
+            "intent_router": intent_router_stats(),
+            "admission": chat_admission.stats(),
+            "idempotency": idempotency_store.stats(),
+            "chat_turns": turn_stats.stats(),
+        }
+    )
+
+
+@router.get("/chat")
+async def get_chat_metrics(
+    hours: int = Query(24, ge=1, le=MAX_CHAT_STATS_HOURS),
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """Return the caller's chat turn costs over the last ``hours``, by path and tool."""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    return success_response(await user_summary(session, user_id, since))
@@ -1,72 +1,237 @@
 """Task CRUD API endpoints under /api/tasks."""
 
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.middleware.auth import get_current_user_id
+from app.middleware.idempotency import idempotent
 from app.models.task import TaskPriority, TaskStatus
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from app.services import task_service
-from app.utils.responses import error_response, success_response
+from app.schemas.task import BatchRequest, TaskCreate, TaskUpdate, task_response_dict
+from app.services import cached_tasks, task_service
+from app.utils.etag import etag_matches, make_etag
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.responses import error_response, success_json_response
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+DEFAULT_SEARCH_PAGE_SIZE = 20
 
-@router.post("", status_code=status.HTTP_201_CREATED)
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=None)
 async def create_task(
     data: TaskCreate,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
-    """Create a new task. Ref: contracts/create-task.md"""
-    task = await task_service.create_task(session, user_id, data)
-    return success_response(TaskResponse.model_validate(task).model_dump(mode="json"))
+    idempotency_key: str | None = Header(None),
+) -> Response:
+    """Create a new task. Ref: contracts/create-task.md
+
+    With an Idempotency-Key header, a retry gets the first response back
+    instead of creating a duplicate.
+    """
+
+    async def create() -> Response:
+        task = await task_service.create_task(session, user_id, data)
+        return success_json_response(
+            task_response_dict(task), status_code=status.HTTP_201_CREATED
+        )
+
+    return await idempotent(user_id, idempotency_key, "tasks:create", data, create)
+
+
+@router.post("/batch", response_model=None)
+async def batch_tasks(
+    body: BatchRequest,
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Apply many task operations in one transaction. Ref: contracts/batch-tasks.md"""
+    outcomes = await task_service.apply_batch(session, user_id, body.operations)
+    results = []
+    for outcome in outcomes:
+        if not outcome.ok:
+            data = None
+            error = {"code": outcome.error_code, "message": outcome.message}
+        elif outcome.op == "delete":
+            data = {"id": str(outcome.task_id), "deleted": True}
+            error = None
+        else:
+            data = outcome.task.model_dump()
+            error = None
+        results.append(
+            {"index": outcome.index, "op": outcome.op, "ok": outcome.ok, "data": data, "error": error}
+        )
+    succeeded = sum(1 for outcome in outcomes if outcome.ok)
+    return success_json_response(
+        results,
+        meta={"succeeded": succeeded, "failed": len(outcomes) - succeeded},
+    )
 
 
-@router.get("")
+@router.get("", response_model=None)
 async def list_tasks(
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
     task_status: TaskStatus | None = Query(None, alias="status"),
     priority: TaskPriority | None = None,
-    tag: str | None = None,
-) -> dict:
-    """List tasks for authenticated user. Ref: contracts/list-tasks.md"""
-    tasks = await task_service.list_tasks(
-        session, user_id, status=task_status, priority=priority, tag=tag
+    tag: list[str] | None = Query(None),
+    tag_match: Literal["all", "any"] = "all",
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """List tasks for authenticated user. Ref: contracts/list-tasks.md
+
+    Paginated only when ``limit`` or ``cursor`` is given; otherwise every
+    matching task is returned. Answers 304 without touching task rows when
+    If-None-Match carries the current ETag.
+    """
+    if cursor is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    version = await task_service.get_list_version(session, user_id)
+    etag = make_etag(
+        version, user_id, task_status, priority, tag, tag_match, limit, cursor
+    )
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    try:
+        task_list, next_cursor, total = await cached_tasks.list_tasks_page(
+            session,
+            user_id,
+            version,
+            limit=limit,
+            cursor=cursor,
+            status=task_status,
+            priority=priority,
+            tags=tag,
+            match_all_tags=tag_match == "all",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error_response(
+                "VALIDATION_ERROR",
+                "Invalid query parameters",
+                [{"field": "cursor", "message": str(e)}],
+            ),
+        )
+    return success_json_response(
+        task_list,
+        meta={"total": total, "limit": limit, "next_cursor": next_cursor},
+        headers=_cache_headers(etag),
+    )
+
+
+@router.get("/search", response_model=None)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Ranked full-text search over title and description. Ref: contracts/search-tasks.md"""
+    version = await task_service.get_list_version(session, user_id)
+    etag = make_etag(version, user_id, "search", q, limit, cursor)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    try:
+        task_list, next_cursor = await cached_tasks.search_tasks(
+            session, user_id, version, q, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error_response(
+                "VALIDATION_ERROR",
+                "Invalid query parameters",
+                [{"field": "cursor", "message": str(e)}],
+            ),
+        )
+    return success_json_response(
+        task_list,
+        meta={"total": len(task_list), "limit": limit, "next_cursor": next_cursor},
+        headers=_cache_headers(etag),
     )
-    task_list = [
-        TaskResponse.model_validate(t).model_dump(mode="json") for t in tasks
-    ]
-    return success_response(task_list, meta={"total": len(task_list)})
 
 
-@router.get("/{task_id}")
+@router.get("/changes", response_model=None)
+async def list_changes(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+    since: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """Tasks created/updated and deleted since a sync cursor. Ref: contracts/list-changes.md"""
+    try:
+        since_seq = _decode_since(since) if since else 0
+        changed, deleted, next_seq, has_more = await task_service.list_changes(
+            session, user_id, since=since_seq, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error_response(
+                "VALIDATION_ERROR",
+                "Invalid query parameters",
+                [{"field": "since", "message": str(e)}],
+            ),
+        )
+    except task_service.ChangesExpiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=error_response("RESYNC_REQUIRED", str(e)),
+        )
+    return success_json_response(
+        {
+            "changed": [task_response_dict(t) for t in changed],
+            "deleted": [
+                {"id": str(d.task_id), "deleted_at": d.deleted_at.isoformat()}
+                for d in deleted
+            ],
+        },
+        meta={"next_cursor": encode_cursor([next_seq]), "has_more": has_more},
+    )
+
+
+@router.get("/{task_id}", response_model=None)
 async def get_task(
     task_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+    if_none_match: str | None = Header(None),
+) -> Response:
     """Get a single task. Ref: contracts/get-task.md"""
-    task = await task_service.get_task(session, user_id, task_id)
+    version = await task_service.get_list_version(session, user_id)
+    etag = make_etag(version, user_id, task_id)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    task = await cached_tasks.get_task(session, user_id, version, task_id)
     if task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_response("NOT_FOUND", "Task not found"),
         )
-    return success_response(TaskResponse.model_validate(task).model_dump(mode="json"))
+    return success_json_response(task, headers=_cache_headers(etag))
 
 
-@router.patch("/{task_id}")
+@router.patch("/{task_id}", response_model=None)
 async def update_task(
     task_id: uuid.UUID,
     data: TaskUpdate,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+) -> Response:
     """Update task fields. Ref: contracts/update-task.md"""
     try:
         task = await task_service.update_task(session, user_id, task_id, data)
@@ -84,15 +249,15 @@ async def update_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_response("NOT_FOUND", "Task not found"),
         )
-    return success_response(TaskResponse.model_validate(task).model_dump(mode="json"))
+    return success_json_response(task_response_dict(task))
 
 
-@router.patch("/{task_id}/toggle")
+@router.patch("/{task_id}/toggle", response_model=None)
 async def toggle_task(
     task_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+) -> Response:
     """Toggle task completion. Ref: contracts/toggle-task.md"""
     task = await task_service.toggle_task(session, user_id, task_id)
     if task is None:
@@ -100,15 +265,15 @@ async def toggle_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_response("NOT_FOUND", "Task not found"),
         )
-    return success_response(TaskResponse.model_validate(task).model_dump(mode="json"))
+    return success_json_response(task_response_dict(task))
 
 
-@router.delete("/{task_id}")
+@router.delete("/{task_id}", response_model=None)
 async def delete_task(
     task_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
-) -> dict:
+) -> Response:
     """Delete a task permanently. Ref: contracts/delete-task.md"""
     deleted = await task_service.delete_task(session, user_id, task_id)
     if not deleted:
@@ -116,4 +281,23 @@ async def delete_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_response("NOT_FOUND", "Task not found"),
         )
-    return success_response({"id": str(task_id), "deleted": True})
+    return success_json_response({"id": str(task_id), "deleted": True})
+
+
+def _decode_since(cursor: str) -> int:
+    values = decode_cursor(cursor)
+    # bool is an int subclass, so a [true] cursor must be ruled out by type
+    if len(values) != 1 or type(values[0]) is not int or values[0] < 0:
+        raise ValueError("Invalid cursor")
+    return values[0]
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    # Per-user data: clients may keep it but must revalidate every time.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag)
+    )
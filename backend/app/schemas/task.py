@@ -1,13 +1,26 @@
 """Pydantic request/response schemas for Task CRUD."""
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Annotated, Any, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
 from app.models.task import TaskPriority, TaskRecurrence, TaskStatus
 
 
+def _as_stored(value: datetime | None) -> datetime | None:
+    """Store offset-aware values as naive UTC; naive values are kept as given.
+
+    The due_date column is naive, and writes skip the post-commit refresh, so
+    responses are built from these values and must match what later reads
+    return.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class TaskCreate(BaseModel):
     """Schema for creating a task."""
 
@@ -26,6 +39,11 @@ class TaskCreate(BaseModel):
                 raise ValueError("Each tag must be a non-empty string")
         return [tag.strip() for tag in v]
 
+    @field_validator("due_date")
+    @classmethod
+    def validate_due_date(cls, v: datetime | None) -> datetime | None:
+        return _as_stored(v)
+
     @field_validator("recurrence")
     @classmethod
     def validate_recurrence_requires_due_date(
@@ -61,6 +79,11 @@ class TaskUpdate(BaseModel):
             return [tag.strip() for tag in v]
         return v
 
+    @field_validator("due_date")
+    @classmethod
+    def validate_due_date(cls, v: datetime | None) -> datetime | None:
+        return _as_stored(v)
+
 
 class TaskResponse(BaseModel):
     """Full task representation in API responses."""
@@ -79,6 +102,71 @@ class TaskResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+_TASK_RESPONSE_FIELDS = tuple(TaskResponse.model_fields)
+
+
+def task_response_dict(task: Any) -> dict[str, Any]:
+    """TaskResponse's fields read straight off a Task row, unvalidated.
+
+    Values keep their Python types (UUID, enums, datetime); encoded with
+    EnvelopeJSONResponse they match TaskResponse.model_dump(mode="json").
+    """
+    return {name: getattr(task, name) for name in _TASK_RESPONSE_FIELDS}
+
+
+MAX_BATCH_OPERATIONS = 100
+
+
+class BatchCreate(BaseModel):
+    """Batch item: create a task."""
+
+    op: Literal["create"]
+    data: TaskCreate
+
+
+class BatchUpdate(BaseModel):
+    """Batch item: partially update a task."""
+
+    op: Literal["update"]
+    id: uuid.UUID
+    data: TaskUpdate
+
+
+class BatchToggle(BaseModel):
+    """Batch item: toggle a task's completion."""
+
+    op: Literal["toggle"]
+    id: uuid.UUID
+
+
+class BatchDelete(BaseModel):
+    """Batch item: delete a task."""
+
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+class BatchComplete(BaseModel):
+    """Batch item: mark a task completed (MCP batch tools; not in the REST API)."""
+
+    op: Literal["complete"]
+    id: uuid.UUID
+
+
+BatchOperation = Annotated[
+    BatchCreate | BatchUpdate | BatchToggle | BatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    """Schema for POST /api/tasks/batch."""
+
+    operations: list[BatchOperation] = Field(
+        min_length=1, max_length=MAX_BATCH_OPERATIONS
+    )
+
+
 class ErrorDetail(BaseModel):
     """Single validation error detail."""
 
@@ -0,0 +1,221 @@
+"""Admission control for agent runs: concurrency caps and a fair wait queue.
+
+Each chat turn holds a slot while its agent runs (for streamed turns, until
+the stream ends). Slots are capped globally and per user. A turn that
+cannot start right away waits in a queue that is served round-robin
+across users, so one user's burst cannot starve everyone else, for at most
+``max_wait_seconds``. Turns that cannot be queued, or wait too long, are
+rejected at once with a Retry-After hint instead of piling up MCP servers
+and LLM calls until the process runs out of memory.
+"""
+
+import asyncio
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import settings
+
+# Smoothing for the average run time behind Retry-After estimates
+_RUN_TIME_EWMA_WEIGHT = 0.2
+
+
+class AdmissionRejectedError(Exception):
+    """A chat turn was not admitted; retry after ``retry_after`` seconds.
+
+    ``status_code`` is 429 when the user is over their own limits and 503
+    when the service as a whole is saturated.
+    """
+
+    def __init__(
+        self, status_code: int, code: str, message: str, retry_after: int
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class AdmissionController:
+    """Global and per-user slot caps with a round-robin queue per user."""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_per_user: int,
+        max_queued: int,
+        max_queued_per_user: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self.max_wait_seconds = max_wait_seconds
+        self._running: Counter[str] = Counter()
+        self._in_flight = 0
+        # Users with waiting turns, in round-robin order
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._queued = 0
+        self._avg_run_seconds = 1.0
+        self.admitted = 0
+        self.queued_total = 0
+        self.rejected: Counter[str] = Counter()
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def admit(self, user_id: str) -> AsyncIterator[None]:
+        """Hold a slot for ``user_id`` for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the turn cannot be queued or its
+                wait exceeds max_wait_seconds.
+        """
+        started = await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            self.release(user_id, started)
+
+    async def acquire(self, user_id: str) -> float:
+        """Take a slot, waiting in the fair queue if needed.
+
+        Returns the monotonic time the slot was granted; pass it to
+        release(). Raises AdmissionRejectedError as admit() does.
+        """
+        if self._has_slot(user_id) and user_id not in self._queues:
+            self._grant(user_id)
+            return time.monotonic()
+
+        if len(self._queues.get(user_id, ())) >= self.max_queued_per_user:
+            raise self._reject(
+                429, "TOO_MANY_REQUESTS", "Too many chat requests in progress"
+            )
+        if self._queued >= self.max_queued:
+            raise self._reject(503, "OVERLOADED", "Chat service is at capacity")
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), time.monotonic())
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self._queued += 1
+        self.queued_total += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait_seconds)
+        except BaseException as e:
+            if waiter.future.done():
+                # Granted just as the wait ended; hand the slot back
+                self.release(user_id, time.monotonic())
+            else:
+                waiter.future.cancel()
+                self._remove(user_id, waiter)
+            if isinstance(e, TimeoutError):
+                raise self._reject(
+                    503, "OVERLOADED", "Timed out waiting for the chat service"
+                ) from None
+            raise
+        self._record_wait(time.monotonic() - waiter.enqueued_at)
+        return time.monotonic()
+
+    def release(self, user_id: str, started: float) -> None:
+        """Return a slot taken by acquire() and admit the next waiter."""
+        self._in_flight -= 1
+        self._running[user_id] -= 1
+        if self._running[user_id] <= 0:
+            del self._running[user_id]
+        elapsed = time.monotonic() - started
+        self._avg_run_seconds += _RUN_TIME_EWMA_WEIGHT * (
+            elapsed - self._avg_run_seconds
+        )
+        self._dispatch()
+
+    def _has_slot(self, user_id: str) -> bool:
+        return (
+            self._in_flight < self.max_concurrent
+            and self._running[user_id] < self.max_per_user
+        )
+
+    def _grant(self, user_id: str) -> None:
+        self._in_flight += 1
+        self._running[user_id] += 1
+        self.admitted += 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting users, one turn per user per round."""
+        for user_id in list(self._queues):
+            if self._in_flight >= self.max_concurrent:
+                return
+            if not self._has_slot(user_id):
+                continue
+            queue = self._queues[user_id]
+            waiter = queue.popleft()
+            self._queued -= 1
+            self._grant(user_id)
+            waiter.future.set_result(None)
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+
+    def _remove(self, user_id: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(user_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[user_id]
+
+    def _reject(self, status_code: int, code: str, message: str) -> AdmissionRejectedError:
+        self.rejected[code] += 1
+        # Time for the slots to drain everything queued ahead, at the
+        # recent average run time
+        waves = (self._queued + 1) / max(self.max_concurrent, 1)
+        retry_after = max(1, math.ceil(self._avg_run_seconds * waves))
+        return AdmissionRejectedError(status_code, code, message, retry_after)
+
+    def _record_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self._queued,
+            "queued_users": len(self._queues),
+            "admitted": self.admitted,
+            "queued": self.queued_total,
+            "rejected": dict(self.rejected),
+            "avg_wait_ms": round(
+                self.wait_seconds_total / self.wait_count * 1000, 1
+            ) if self.wait_count else 0.0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 1),
+            "avg_run_ms": round(self._avg_run_seconds * 1000, 1),
+        }
+
+
+def _build_chat_admission() -> AdmissionController:
+    return AdmissionController(
+        max_concurrent=settings.chat_max_concurrent_runs,
+        max_per_user=settings.chat_max_runs_per_user,
+        max_queued=settings.chat_max_queued,
+        max_queued_per_user=settings.chat_max_queued_per_user,
+        max_wait_seconds=settings.chat_queue_timeout_seconds,
+    )
+
+
+# Agent runs across all chat requests in this worker
+chat_admission = _build_chat_admission()
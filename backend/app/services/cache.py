@@ -0,0 +1,191 @@
+"""Pluggable per-user read cache with an in-process LRU + TTL backend.
+
+Entries are grouped by namespace (a user_id) so that a write can drop
+everything cached for that user in O(1). Readers take a token before
+querying and pass it back to ``set``; if the namespace was invalidated in
+between, the (possibly stale) value is discarded instead of stored.
+"""
+
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from app.config import settings
+
+
+class CacheBackend(Protocol):
+    """Interface every task cache backend implements."""
+
+    def get(self, namespace: str, key: Hashable) -> Any | None: ...
+
+    def token(self, namespace: str) -> int: ...
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        *,
+        token: int,
+        weight: int = 1,
+    ) -> None: ...
+
+    def invalidate(self, namespace: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+@dataclass
+class _Bucket:
+    generation: int
+    entries: dict[Hashable, tuple[float, int, Any]] = field(default_factory=dict)
+    weight: int = 0
+
+
+class LRUTTLCache:
+    """In-process cache bounded by total weight, with per-entry TTL.
+
+    Weight is caller-defined (task lists use one unit per task), so the
+    bound tracks memory roughly rather than entry count; each namespace
+    costs one extra unit. When over budget, whole namespaces are evicted
+    least-recently-used first.
+    """
+
+    def __init__(self, max_weight: int, ttl_seconds: float) -> None:
+        self.max_weight = max_weight
+        self.ttl_seconds = ttl_seconds
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._generations = itertools.count(1)
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, namespace: str, key: Hashable) -> Any | None:
+        bucket = self._buckets.get(namespace)
+        entry = bucket.entries.get(key) if bucket else None
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, weight, value = entry
+        if expires_at <= time.monotonic():
+            del bucket.entries[key]
+            bucket.weight -= weight
+            self._weight -= weight
+            self.misses += 1
+            return None
+        self._buckets.move_to_end(namespace)
+        self.hits += 1
+        return value
+
+    def token(self, namespace: str) -> int:
+        bucket = self._buckets.get(namespace)
+        if bucket is None:
+            bucket = self._buckets[namespace] = _Bucket(next(self._generations))
+            self._evict()
+        return bucket.generation
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        *,
+        token: int,
+        weight: int = 1,
+    ) -> None:
+        bucket = self._buckets.get(namespace)
+        if bucket is None or bucket.generation != token or weight > self.max_weight:
+            return
+        old = bucket.entries.get(key)
+        if old is not None:
+            bucket.weight -= old[1]
+            self._weight -= old[1]
+        bucket.entries[key] = (time.monotonic() + self.ttl_seconds, weight, value)
+        bucket.weight += weight
+        self._weight += weight
+        self._buckets.move_to_end(namespace)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._buckets and self._weight + len(self._buckets) > self.max_weight:
+            _, evicted = self._buckets.popitem(last=False)
+            self._weight -= evicted.weight
+            self.evictions += 1
+
+    def invalidate(self, namespace: str) -> None:
+        bucket = self._buckets.get(namespace)
+        if bucket is None:
+            return
+        self._weight -= bucket.weight
+        bucket.entries.clear()
+        bucket.weight = 0
+        bucket.generation = next(self._generations)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._weight = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "lru_ttl",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "namespaces": len(self._buckets),
+            "weight": self._weight,
+            "max_weight": self.max_weight,
+        }
+
+
+class NullCache:
+    """Backend that never stores anything (caching disabled)."""
+
+    def get(self, namespace: str, key: Hashable) -> Any | None:
+        return None
+
+    def token(self, namespace: str) -> int:
+        return 0
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        *,
+        token: int,
+        weight: int = 1,
+    ) -> None:
+        return None
+
+    def invalidate(self, namespace: str) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "disabled"}
+
+
+def _build_task_cache() -> CacheBackend:
+    if not settings.task_cache_enabled:
+        return NullCache()
+    return LRUTTLCache(
+        max_weight=settings.task_cache_max_items,
+        ttl_seconds=settings.task_cache_ttl_seconds,
+    )
+
+
+# Task reads, namespaced by user_id. Invalidated by every task_service write.
+task_cache: CacheBackend = _build_task_cache()
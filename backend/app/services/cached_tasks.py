@@ -0,0 +1,135 @@
+"""Read-through cache over task_service reads.
+
+Caches TaskResponse-shaped dicts (not ORM objects), so a hit skips the
+database and ORM hydration; responses encode them with orjson directly. Keys include
+the user's task list version, so an entry can never be served once the DB
+version has moved on (including writes made by the MCP tool subprocess);
+task_service also drops the user's entries on every write to free memory.
+"""
+
+import uuid
+from typing import Any
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.task import TaskStatus
+from app.schemas.task import task_response_dict
+from app.services import task_service
+from app.services.cache import task_cache
+from app.services.title_index import TitleEntry, TitleIndex
+
+
+async def list_tasks_page(
+    session: AsyncSession,
+    user_id: str,
+    version: int,
+    *,
+    limit: int | None,
+    cursor: str | None = None,
+    status: TaskStatus | None = None,
+    priority: str | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = True,
+) -> tuple[list[dict[str, Any]], str | None, int]:
+    """Cached task_service.list_tasks_page returning serialized tasks.
+
+    Also returns how many tasks match the filters across all pages; it is
+    only counted separately when the page does not hold them all.
+    """
+    key = (
+        "list",
+        version,
+        limit,
+        cursor,
+        status,
+        priority,
+        tuple(tags or ()),
+        match_all_tags,
+    )
+    cached = task_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+
+    token = task_cache.token(user_id)
+    tasks, next_cursor = await task_service.list_tasks_page(
+        session,
+        user_id,
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        priority=priority,
+        tags=tags,
+        match_all_tags=match_all_tags,
+    )
+    if cursor is None and next_cursor is None:
+        total = len(tasks)
+    else:
+        total = await task_service.count_tasks(
+            session,
+            user_id,
+            status=status,
+            priority=priority,
+            tags=tags,
+            match_all_tags=match_all_tags,
+        )
+    page = ([task_response_dict(t) for t in tasks], next_cursor, total)
+    task_cache.set(user_id, key, page, token=token, weight=len(tasks) + 1)
+    return page
+
+
+async def search_tasks(
+    session: AsyncSession,
+    user_id: str,
+    version: int,
+    q: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Cached task_service.search_tasks returning serialized tasks."""
+    key = ("search", version, q, limit, cursor)
+    cached = task_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+
+    token = task_cache.token(user_id)
+    tasks, next_cursor = await task_service.search_tasks(
+        session, user_id, q, limit=limit, cursor=cursor
+    )
+    page = ([task_response_dict(t) for t in tasks], next_cursor)
+    task_cache.set(user_id, key, page, token=token, weight=len(tasks) + 1)
+    return page
+
+
+async def get_task(
+    session: AsyncSession, user_id: str, version: int, task_id: uuid.UUID
+) -> dict[str, Any] | None:
+    """Cached task_service.get_task returning a serialized task."""
+    key = ("task", version, task_id)
+    cached = task_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+
+    token = task_cache.token(user_id)
+    task = await task_service.get_task(session, user_id, task_id)
+    if task is None:
+        return None
+    data = task_response_dict(task)
+    task_cache.set(user_id, key, data, token=token)
+    return data
+
+
+async def title_index(
+    session: AsyncSession, user_id: str, version: int
+) -> TitleIndex:
+    """Cached fuzzy title index over all of the user's tasks."""
+    key = ("titles", version)
+    cached = task_cache.get(user_id, key)
+    if cached is not None:
+        return cached
+
+    token = task_cache.token(user_id)
+    rows = await task_service.list_task_titles(session, user_id)
+    index = TitleIndex([TitleEntry(*row) for row in rows])
+    task_cache.set(user_id, key, index, token=token, weight=len(index) + 1)
+    return index
@@ -2,32 +2,73 @@
 
 Implements the full request lifecycle:
 1. Load/create conversation from DB
-2. Fetch last 20 messages (sliding window)
-3. Store user message
-4. Build agent input from history
+2. Fetch the newest messages that fit the history token budget (from the
+   in-memory history cache when it is current), folding older ones into
+   the conversation's rolling summary
+3. Store user message (commit 1: new conversation, summary, user message)
+4. Build agent input from summary + history
 5. Run agent with MCP tools
 6. Extract response and tool calls
-7. Store assistant message
+7. Store assistant message (commit 2: assistant message, its turn stats,
+   updated_at)
 8. Return ChatResponse
 
-NO state is held between requests.
+Each turn commits exactly twice and never re-reads what it wrote: IDs and
+timestamps are generated in Python, and the conversation's updated_at is
+bumped with a bare UPDATE rather than a SELECT-then-save. Both commits set
+updated_at, which stamps the history cache entry they extend.
+
+stream_chat runs the same pipeline but yields the agent's progress as it
+happens and stores the assistant message when the stream completes.
+
+Both hold an admission slot (services/admission.py) from step 1 until the
+turn ends, so bursts queue fairly or are rejected instead of starting an
+unbounded number of agent runs.
+
+Every turn records a TurnMetrics (tokens, model, tool, MCP startup and DB
+time) that is stored with the assistant message (services/chat_stats.py).
+
+NO state is required between requests: the history cache is an
+optimization, checked against the DB on every turn.
 """
 
+import contextlib
 import logging
+import time
 import uuid
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
+from sqlalchemy import func, update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.agents.task_agent import run_agent
+from app.agents.task_agent import run_agent, run_agent_streamed
+from app.agents.turn_metrics import TurnMetrics
+from app.config import settings
+from app.database import engine
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.schemas.chat import ChatResponse, ToolCallInfo
+from app.services.admission import chat_admission
+from app.services.cache import task_cache
+from app.services.chat_stats import stats_row, turn_stats
+from app.services.history_cache import CachedMessage, history_cache
+from app.utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
-SLIDING_WINDOW_SIZE = 20
+# The fixed window history used to send regardless of length; kept as the
+# baseline for reporting prompt-token savings
+FIXED_WINDOW_SIZE = 20
+# Newest messages considered per turn; older unsummarized ones are dropped
+HISTORY_SCAN_LIMIT = 200
+# Rolling summary cap, and how much of each folded message it keeps
+SUMMARY_TOKEN_BUDGET = 300
+SUMMARY_LINE_CHARS = 200
+FALLBACK_RESPONSE = "I'm sorry, I couldn't process that request."
 
 
 async def handle_chat(
@@ -50,50 +91,240 @@ async def handle_chat(
     Raises:
         ValueError: If conversation_id doesn't exist or belongs to another user.
         RuntimeError: If OpenAI API or MCP execution fails.
+        AdmissionRejectedError: If the turn could not get an agent slot.
     """
-    # Step 1: Load or create conversation
-    conversation = await _load_or_create_conversation(
-        session, user_id, conversation_id
+    async with chat_admission.admit(user_id):
+        metrics = TurnMetrics()
+        # Steps 1-4: Load conversation, fetch history, store user message, build input
+        conv_id, stamp, agent_messages = await _begin_turn(
+            session, user_id, message, conversation_id
+        )
+        metrics.db_ms = (time.perf_counter() - metrics.started) * 1000
+
+        # Step 5: Run agent with MCP tools
+        try:
+            result = await run_agent(agent_messages, user_id, metrics)
+        except Exception as e:
+            logger.error("Agent execution failed: %s", e)
+            raise RuntimeError(f"AI service temporarily unavailable: {e}") from e
+        finally:
+            # MCP tools may have written tasks from the tool-server subprocess,
+            # which cannot reach this process's cache — drop it for this user.
+            task_cache.invalidate(user_id)
+
+        # Steps 6-8: Extract tool calls, store assistant message, return response
+        return await _finish_turn(session, conv_id, stamp, user_id, result, metrics)
+
+
+async def stream_chat(
+    user_id: str,
+    message: str,
+    conversation_id: uuid.UUID | None,
+    session: AsyncSession,
+) -> AsyncIterator[dict]:
+    """Process a chat message, streaming the agent's progress as events.
+
+    The conversation is resolved and the user message stored before this
+    returns, so an unknown conversation still raises ValueError up front.
+    The returned iterator yields "start", then "delta"/"tool_call"/
+    "tool_result" events as the agent runs, and finally "done" (with the
+    ChatResponse fields) once the assistant message is stored, or "error".
+
+    If the iterator is closed early (client disconnect), the agent run is
+    cancelled and no assistant message is stored. The turn's admission slot
+    is held until the iterator is exhausted or closed.
+
+    Raises:
+        ValueError: If conversation_id doesn't exist or belongs to another user.
+        AdmissionRejectedError: If the turn could not get an agent slot.
+    """
+    admitted_at = await chat_admission.acquire(user_id)
+    metrics = TurnMetrics()
+    try:
+        conv_id, stamp, agent_messages = await _begin_turn(
+            session, user_id, message, conversation_id
+        )
+    except BaseException:
+        chat_admission.release(user_id, admitted_at)
+        raise
+    metrics.db_ms = (time.perf_counter() - metrics.started) * 1000
+    return _AdmittedStream(
+        _stream_turn(conv_id, stamp, user_id, agent_messages, metrics),
+        user_id,
+        admitted_at,
     )
-    # Capture the ID as a plain value — subsequent commits expire ORM attributes
-    # and lazy-loading fails in async context (MissingGreenlet).
-    conv_id: uuid.UUID = conversation.id
 
-    # Step 2: Fetch message history (sliding window)
-    history = await _fetch_message_history(session, conv_id)
 
-    # Step 3: Store user message BEFORE agent run
-    await _store_message(session, conv_id, user_id, "user", message)
+class _AdmittedStream:
+    """A streamed turn's events; returns the admission slot exactly once.
 
-    # Step 4: Build agent input from history + new message
-    agent_messages = _build_agent_input(history, message, user_id)
+    A plain generator's finally block never runs if the generator is closed
+    before its first iteration, which would leak the slot.
+    """
 
-    # Step 5: Run agent with MCP tools
+    def __init__(
+        self, events: AsyncIterator[dict], user_id: str, admitted_at: float
+    ) -> None:
+        self._events = events
+        self._user_id = user_id
+        self._admitted_at = admitted_at
+        self._released = False
+
+    def __aiter__(self) -> "_AdmittedStream":
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return await anext(self._events)
+        except BaseException:
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._events.aclose()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            chat_admission.release(self._user_id, self._admitted_at)
+
+
+async def _stream_turn(
+    conv_id: uuid.UUID,
+    stamp: datetime,
+    user_id: str,
+    agent_messages: list[dict],
+    metrics: TurnMetrics,
+) -> AsyncIterator[dict]:
+    """Run the agent for one streamed turn; see stream_chat."""
+    yield {"type": "start", "conversation_id": conv_id}
+
+    started = time.perf_counter()
+    first_token_at = None
+    result = None
     try:
-        result = await run_agent(agent_messages, user_id)
+        async with contextlib.aclosing(
+            run_agent_streamed(agent_messages, user_id, metrics)
+        ) as events:
+            async for event in events:
+                if event["type"] == "result":
+                    result = event["result"]
+                    continue
+                if event["type"] == "delta" and first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    logger.info(
+                        "Chat stream first token after %.0f ms",
+                        (first_token_at - started) * 1000,
+                    )
+                yield event
     except Exception as e:
         logger.error("Agent execution failed: %s", e)
-        raise RuntimeError(f"AI service temporarily unavailable: {e}") from e
+        yield {"type": "error", "message": "AI service temporarily unavailable"}
+        return
+    finally:
+        task_cache.invalidate(user_id)
+
+    # The request's session may already be closed once the response streams
+    async with AsyncSession(engine) as session:
+        response = await _finish_turn(
+            session, conv_id, stamp, user_id, result, metrics
+        )
+    yield {"type": "done", **response.model_dump(mode="json")}
 
-    # Step 6: Extract response and tool calls
-    assistant_text = result.final_output or "I'm sorry, I couldn't process that request."
-    tool_calls = _extract_tool_calls(result)
 
-    # Step 7: Store assistant message AFTER agent run
-    await _store_message(
-        session, conv_id, user_id, "assistant", assistant_text
+async def _begin_turn(
+    session: AsyncSession,
+    user_id: str,
+    message: str,
+    conversation_id: uuid.UUID | None,
+) -> tuple[uuid.UUID, datetime, list[dict]]:
+    """Resolve the conversation and store the user message BEFORE the agent runs.
+
+    A new conversation, a folded summary, the user message and the new
+    updated_at are written in a single commit, so the message is durable
+    before the agent is called.
+
+    Returns the conversation ID, its updated_at as stored, and the agent
+    input (history + new message).
+    """
+    conversation = await _load_or_create_conversation(
+        session, user_id, conversation_id
+    )
+    # Capture values as plain data — the commit below expires ORM attributes
+    # and lazy-loading fails in async context (MissingGreenlet).
+    conv_id: uuid.UUID = conversation.id
+    summary = conversation.summary
+    previous_stamp = conversation.updated_at
+
+    if conversation_id is None:
+        # A conversation created just now has no history to fetch
+        history = HistoryWindow()
+    else:
+        history = await _load_message_history(
+            session,
+            conv_id,
+            stamp=previous_stamp,
+            after=conversation.summary_through,
+            budget=settings.chat_history_token_budget,
+        )
+    if history.overflow:
+        # Newest first; fold oldest first. Committed with the user message.
+        summary = _fold_into_summary(summary, history.overflow[::-1])
+        conversation.summary = summary
+        conversation.summary_through = history.overflow[0]["created_at"]
+    _record_history_tokens(conv_id, history, summary)
+
+    stamp = datetime.utcnow()
+    conversation.updated_at = stamp
+    session.add(conversation)
+    cached = _cached(_add_message(session, conv_id, user_id, "user", message))
+    await session.commit()
+    if conversation_id is None:
+        history_cache.seed(conv_id, stamp, [cached], floor=None)
+    else:
+        history_cache.append(conv_id, [cached], previous=previous_stamp, stamp=stamp)
+    return (
+        conv_id,
+        stamp,
+        _build_agent_input(history.messages, message, user_id, summary),
     )
 
-    # Update conversation timestamp
-    stmt = select(Conversation).where(Conversation.id == conv_id)
-    result_conv = await session.exec(stmt)
-    conv = result_conv.first()
-    if conv:
-        conv.updated_at = datetime.utcnow()
-        session.add(conv)
-        await session.commit()
 
-    # Step 8: Return response
+async def _finish_turn(
+    session: AsyncSession,
+    conv_id: uuid.UUID,
+    previous_stamp: datetime,
+    user_id: str,
+    result,
+    metrics: TurnMetrics,
+) -> ChatResponse:
+    """Store the assistant message AFTER the agent run and build the response.
+
+    The turn's stats row goes in the same commit, so its total_ms runs up
+    to that commit and its db_ms is _begin_turn's (history and commit 1).
+    """
+    assistant_text = (result.final_output if result else None) or FALLBACK_RESPONSE
+    tool_calls = _extract_tool_calls(result)
+
+    message = _add_message(session, conv_id, user_id, "assistant", assistant_text)
+    cached = _cached(message)
+    metrics.total_ms = (time.perf_counter() - metrics.started) * 1000
+    session.add(stats_row(message.id, user_id, metrics))
+    # Bump the timestamp in the same transaction, without loading the row
+    stamp = datetime.utcnow()
+    await session.exec(
+        update(Conversation)
+        .where(Conversation.id == conv_id)
+        .values(updated_at=stamp)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    history_cache.append(conv_id, [cached], previous=previous_stamp, stamp=stamp)
+    turn_stats.record(metrics)
+
     return ChatResponse(
         conversation_id=conv_id,
         response=assistant_text,
@@ -106,7 +337,11 @@ async def _load_or_create_conversation(
     user_id: str,
     conversation_id: uuid.UUID | None,
 ) -> Conversation:
-    """Load existing conversation or create a new one."""
+    """Load existing conversation or create a new one.
+
+    A new conversation is only added to the session; _begin_turn commits it
+    together with the first user message.
+    """
     if conversation_id is not None:
         query = select(Conversation).where(
             Conversation.id == conversation_id,
@@ -121,62 +356,226 @@ async def _load_or_create_conversation(
     # Create new conversation
     conversation = Conversation(user_id=user_id)
     session.add(conversation)
-    await session.commit()
-    await session.refresh(conversation)
     return conversation
 
 
-async def _fetch_message_history(
-    session: AsyncSession, conversation_id: uuid.UUID
-) -> list[dict]:
-    """Fetch last N messages for sliding window context.
+@dataclass
+class HistoryWindow:
+    """Messages selected for one turn's agent context."""
+
+    # Chronological role/content dicts within the token budget
+    messages: list[dict] = field(default_factory=list)
+    tokens: int = 0
+    # Unsummarized messages past the budget, newest first, to fold away
+    overflow: list[dict] = field(default_factory=list)
+    # What the old fixed window of FIXED_WINDOW_SIZE messages would cost
+    fixed_window_tokens: int = 0
+
 
-    Returns plain dicts (role, content) to avoid MissingGreenlet errors
-    when ORM objects are accessed after subsequent commits.
+async def _load_message_history(
+    session: AsyncSession,
+    conversation_id: uuid.UUID,
+    *,
+    stamp: datetime,
+    after: datetime | None,
+    budget: int,
+) -> HistoryWindow:
+    """The turn's history window, from the history cache or else the DB.
+
+    ``stamp`` is the conversation's updated_at as just loaded; a cache entry
+    with any other stamp is stale. A DB read re-seeds the cache.
     """
-    query = (
-        select(Message)
+    cached = history_cache.get(conversation_id, stamp, after)
+    if cached is None:
+        return await _fetch_message_history(
+            session, conversation_id, after=after, budget=budget, seed_stamp=stamp
+        )
+    return _build_window(_rank(cached[:HISTORY_SCAN_LIMIT]), after, budget)
+
+
+def _rank(newest_first: list[CachedMessage]) -> Iterable[tuple[int, int, Any]]:
+    """(position, running token total, message), as the history query ranks them."""
+    running = 0
+    for position, message in enumerate(newest_first, start=1):
+        running += message.token_count
+        yield position, running, message
+
+
+async def _fetch_message_history(
+    session: AsyncSession,
+    conversation_id: uuid.UUID,
+    *,
+    after: datetime | None,
+    budget: int,
+    seed_stamp: datetime | None = None,
+) -> HistoryWindow:
+    """Fetch the newest messages whose token counts fit ``budget``.
+
+    One query over idx_message_convo_created: the newest HISTORY_SCAN_LIMIT
+    messages, with a running token total (newest first), keeping those not
+    yet summarized (created after ``after``) plus the fixed window used as
+    the savings baseline. Returns plain dicts to avoid MissingGreenlet
+    errors when ORM objects are accessed after subsequent commits.
+
+    With ``seed_stamp``, the rows read are cached under that stamp unless
+    the scan limit cut them short.
+    """
+    newest = (
+        select(
+            Message.id,
+            Message.role,
+            Message.content,
+            Message.token_count,
+            Message.created_at,
+        )
         .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(SLIDING_WINDOW_SIZE)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(HISTORY_SCAN_LIMIT)
+        .subquery()
     )
-    result = await session.exec(query)
-    messages = [{"role": m.role, "content": m.content} for m in result.all()]
+    order = (newest.c.created_at.desc(), newest.c.id.desc())
+    ranked = select(
+        newest,
+        func.sum(newest.c.token_count).over(order_by=order).label("running"),
+        func.row_number().over(order_by=order).label("position"),
+    ).subquery()
+    query = select(*ranked.c).order_by(ranked.c.position)
+    if after is not None:
+        query = query.where(
+            (ranked.c.created_at > after) | (ranked.c.position <= FIXED_WINDOW_SIZE)
+        )
+
+    rows = (await session.exec(query)).all()
+    if seed_stamp is not None and (not rows or rows[-1].position < HISTORY_SCAN_LIMIT):
+        history_cache.seed(
+            conversation_id,
+            seed_stamp,
+            [_cached(row) for row in rows],
+            floor=after,
+        )
+    return _build_window(
+        ((row.position, row.running, row) for row in rows), after, budget
+    )
+
+
+def _build_window(
+    ranked: Iterable[tuple[int, int, Any]], after: datetime | None, budget: int
+) -> HistoryWindow:
+    """Select a HistoryWindow from ranked messages, newest first."""
+    window = HistoryWindow()
+    for position, running, row in ranked:
+        if position <= FIXED_WINDOW_SIZE:
+            window.fixed_window_tokens += row.token_count
+        if after is not None and row.created_at <= after:
+            continue
+        message = {"role": row.role, "content": row.content}
+        if running <= budget:
+            window.messages.append(message)
+            window.tokens += row.token_count
+        else:
+            window.overflow.append({**message, "created_at": row.created_at})
     # Reverse to chronological order (oldest first)
-    messages.reverse()
-    return messages
+    window.messages.reverse()
+    return window
 
 
-async def _store_message(
+def _fold_into_summary(summary: str | None, messages: list[dict]) -> str:
+    """Append messages (oldest first) to a rolling summary, one clipped line each.
+
+    Oldest lines drop off once the summary exceeds SUMMARY_TOKEN_BUDGET.
+    Extractive rather than model-written, so folding adds no LLM call.
+    """
+    lines = summary.splitlines() if summary else []
+    for message in messages:
+        text = " ".join(message["content"].split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[: SUMMARY_LINE_CHARS - 1] + "…"
+        lines.append(f"{message['role']}: {text}")
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > SUMMARY_TOKEN_BUDGET:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+_history_totals = {
+    "requests": 0,
+    "history_tokens": 0,
+    "fixed_window_tokens": 0,
+    "tokens_saved": 0,
+}
+
+
+def _record_history_tokens(
+    conv_id: uuid.UUID, history: HistoryWindow, summary: str | None
+) -> None:
+    """Log and count the prompt tokens history costs vs the old fixed window."""
+    sent = history.tokens + (estimate_tokens(summary) if summary else 0)
+    saved = history.fixed_window_tokens - sent
+    _history_totals["requests"] += 1
+    _history_totals["history_tokens"] += sent
+    _history_totals["fixed_window_tokens"] += history.fixed_window_tokens
+    _history_totals["tokens_saved"] += saved
+    logger.info(
+        "Conversation %s history: %d tokens (%d messages + summary), "
+        "fixed window %d, saved %d",
+        conv_id,
+        sent,
+        len(history.messages),
+        history.fixed_window_tokens,
+        saved,
+    )
+
+
+def history_stats() -> dict:
+    """Prompt-token totals for chat history in this worker."""
+    return dict(_history_totals)
+
+
+def _add_message(
     session: AsyncSession,
     conversation_id: uuid.UUID,
     user_id: str,
     role: str,
     content: str,
 ) -> Message:
-    """Persist a message to the database."""
+    """Add a message to the session; the caller commits it with the turn."""
     msg = Message(
         conversation_id=conversation_id,
         user_id=user_id,
         role=role,
         content=content,
+        token_count=estimate_tokens(content),
     )
     session.add(msg)
-    await session.commit()
-    await session.refresh(msg)
     return msg
 
 
+def _cached(message: Any) -> CachedMessage:
+    """The history cache's copy of a message (ORM object or history row)."""
+    return CachedMessage(
+        role=message.role,
+        content=message.content,
+        token_count=message.token_count,
+        created_at=message.created_at,
+    )
+
+
 def _build_agent_input(
-    history: list[dict], new_message: str, user_id: str
+    history: list[dict], new_message: str, user_id: str, summary: str | None = None
 ) -> list[dict]:
     """Transform DB message history into Agent SDK input format.
 
     The agent needs user_id context for tool calls, so we prepend it
-    as a system-level context note in the first user message.
+    as a system-level context note in the first user message. The rolling
+    summary of older turns, if any, leads the history.
     """
+    messages = []
+    if summary:
+        messages.append({
+            "role": "system",
+            "content": f"Summary of earlier turns in this conversation:\n{summary}",
+        })
     # history is already a list of {"role": ..., "content": ...} dicts
-    messages = list(history)
+    messages.extend(history)
 
     # Add the new user message with user_id context for tools
     messages.append({
@@ -189,7 +588,8 @@ def _build_agent_input(
 
 def _extract_tool_calls(result) -> list[ToolCallInfo]:
     """Extract tool call metadata from the agent RunResult."""
-    tool_calls = []
+    # Fast-path and dev-agent results list their calls directly
+    tool_calls = [ToolCallInfo(**call) for call in getattr(result, "tool_calls", [])]
     try:
         # Walk through the result's raw responses to find tool calls
         if hasattr(result, "raw_responses"):
@@ -0,0 +1,188 @@
+"""Per-turn chat cost: stored rows and aggregates by path and tool.
+
+Each assistant message gets a MessageStats row with the TurnMetrics of the
+turn that produced it (see agents/turn_metrics.py), written in the turn's
+second commit. turn_stats aggregates the same numbers in process for
+GET /api/metrics; user_summary aggregates a user's stored rows over a time
+window for GET /api/metrics/chat, so latency and token spend can be
+attributed to a user and to the tools their turns called.
+"""
+
+import json
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.agents.turn_metrics import TurnMetrics
+from app.models.message_stats import MessageStats
+
+logger = logging.getLogger(__name__)
+
+# Summed per path; the *_ms ones are reported as averages per turn
+_TOTAL_FIELDS = (
+    "model_calls",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_ms",
+    "model_ms",
+    "tool_ms",
+    "mcp_startup_ms",
+    "db_ms",
+)
+
+
+def stats_row(message_id: uuid.UUID, user_id: str, metrics: TurnMetrics) -> MessageStats:
+    """The MessageStats row for an assistant message; the caller commits it."""
+    return MessageStats(
+        message_id=message_id,
+        user_id=user_id,
+        path=metrics.path,
+        model=metrics.model,
+        model_calls=metrics.model_calls,
+        prompt_tokens=metrics.prompt_tokens,
+        completion_tokens=metrics.completion_tokens,
+        total_ms=round(metrics.total_ms),
+        model_ms=round(metrics.model_ms),
+        tool_ms=round(metrics.tool_ms),
+        mcp_startup_ms=round(metrics.mcp_startup_ms),
+        db_ms=round(metrics.db_ms),
+        tools=json.dumps(
+            [[t.name, round(t.ms), t.ok] for t in metrics.tools],
+            separators=(",", ":"),
+        ),
+    )
+
+
+def _new_path_totals() -> dict[str, int]:
+    return {"turns": 0, "max_total_ms": 0, **dict.fromkeys(_TOTAL_FIELDS, 0)}
+
+
+def _new_tool_totals() -> dict[str, int]:
+    return {"calls": 0, "errors": 0, "total_ms": 0, "max_ms": 0}
+
+
+def _add_tool_call(totals: dict[str, int], ms: int, ok: bool) -> None:
+    totals["calls"] += 1
+    totals["errors"] += not ok
+    totals["total_ms"] += ms
+    totals["max_ms"] = max(totals["max_ms"], ms)
+
+
+def _summarize(
+    paths: dict[str, dict[str, int]], tools: dict[str, dict[str, int]]
+) -> dict[str, Any]:
+    """Turn summed totals into the reported shape (averages per turn/call)."""
+    by_path = {}
+    for path, totals in sorted(paths.items()):
+        turns = totals["turns"] or 1
+        by_path[path] = {
+            "turns": totals["turns"],
+            "model_calls": totals["model_calls"],
+            "prompt_tokens": totals["prompt_tokens"],
+            "completion_tokens": totals["completion_tokens"],
+            **{
+                f"avg_{name}": round(totals[name] / turns, 1)
+                for name in _TOTAL_FIELDS
+                if name.endswith("_ms")
+            },
+            "max_total_ms": totals["max_total_ms"],
+        }
+    return {
+        "turns": sum(t["turns"] for t in paths.values()),
+        "prompt_tokens": sum(t["prompt_tokens"] for t in paths.values()),
+        "completion_tokens": sum(t["completion_tokens"] for t in paths.values()),
+        "by_path": by_path,
+        "tools": {
+            name: {
+                "calls": totals["calls"],
+                "errors": totals["errors"],
+                "avg_ms": round(totals["total_ms"] / totals["calls"], 1),
+                "max_ms": totals["max_ms"],
+            }
+            for name, totals in sorted(tools.items())
+        },
+    }
+
+
+class TurnStats:
+    """In-process totals of recorded turns, by path and by tool."""
+
+    def __init__(self) -> None:
+        self._paths: defaultdict[str, dict[str, int]] = defaultdict(_new_path_totals)
+        self._tools: defaultdict[str, dict[str, int]] = defaultdict(_new_tool_totals)
+
+    def record(self, metrics: TurnMetrics) -> None:
+        totals = self._paths[metrics.path]
+        totals["turns"] += 1
+        for name in _TOTAL_FIELDS:
+            totals[name] += round(getattr(metrics, name))
+        totals["max_total_ms"] = max(totals["max_total_ms"], round(metrics.total_ms))
+        for tool in metrics.tools:
+            _add_tool_call(self._tools[tool.name], round(tool.ms), tool.ok)
+
+        logger.info(
+            "Chat turn (%s): %.0f ms total, %d model calls %.0f ms, "
+            "%d+%d tokens, %d tool calls %.0f ms, MCP %.0f ms, DB %.0f ms",
+            metrics.path,
+            metrics.total_ms,
+            metrics.model_calls,
+            metrics.model_ms,
+            metrics.prompt_tokens,
+            metrics.completion_tokens,
+            len(metrics.tools),
+            metrics.tool_ms,
+            metrics.mcp_startup_ms,
+            metrics.db_ms,
+        )
+
+    def clear(self) -> None:
+        self._paths.clear()
+        self._tools.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return _summarize(self._paths, self._tools)
+
+
+async def user_summary(
+    session: AsyncSession, user_id: str, since: datetime
+) -> dict[str, Any]:
+    """Aggregate ``user_id``'s stored turns created at or after ``since``."""
+    window = (MessageStats.user_id == user_id, MessageStats.created_at >= since)
+    rows = await session.exec(
+        select(
+            MessageStats.path,
+            func.count(),
+            func.max(MessageStats.total_ms),
+            *(func.sum(getattr(MessageStats, name)) for name in _TOTAL_FIELDS),
+        )
+        .where(*window)
+        .group_by(MessageStats.path)
+    )
+    paths = {}
+    for path, turns, max_total_ms, *sums in rows.all():
+        paths[path] = {
+            "turns": turns,
+            "max_total_ms": max_total_ms,
+            **dict(zip(_TOTAL_FIELDS, (int(s or 0) for s in sums))),
+        }
+
+    # Tool calls are stored compactly per turn; only turns that made any
+    tools: defaultdict[str, dict[str, int]] = defaultdict(_new_tool_totals)
+    calls = await session.exec(
+        select(MessageStats.tools).where(*window, MessageStats.tools != "[]")
+    )
+    for encoded in calls.all():
+        for name, ms, ok in json.loads(encoded):
+            _add_tool_call(tools[name], ms, ok)
+
+    return {"since": since.isoformat(), **_summarize(paths, tools)}
+
+
+# Chat turn costs across all requests in this worker
+turn_stats = TurnStats()
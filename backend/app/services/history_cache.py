@@ -0,0 +1,181 @@
+"""In-process cache of each conversation's newest messages.
+
+chat_service writes every message of a turn itself, so it can keep a ring
+buffer of the newest messages per conversation and build the next turn's
+history window without re-reading the messages table. Conversations are
+evicted least-recently-used first.
+
+Cross-worker safety: each buffer is stamped with the conversation's
+``updated_at``, which chat_service sets on both commits of every turn. The
+turn already loads the conversation row (ownership check), so a buffer
+whose stamp differs — another worker wrote to the conversation — is
+dropped and the history is read from the DB. A TTL bounds staleness from
+any writer that bypasses chat_service.
+"""
+
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CachedMessage:
+    """The columns of a message that history windows need."""
+
+    role: str
+    content: str
+    token_count: int
+    created_at: datetime
+
+
+@dataclass
+class _Buffer:
+    stamp: datetime
+    expires_at: float
+    messages: deque[CachedMessage]
+    # Every message created after ``floor`` is buffered; None means the
+    # buffer holds the whole conversation
+    floor: datetime | None = None
+
+    def push(self, message: CachedMessage) -> None:
+        if len(self.messages) == self.messages.maxlen:
+            oldest = self.messages[0]
+            if self.floor is None or oldest.created_at > self.floor:
+                self.floor = oldest.created_at
+        self.messages.append(message)
+
+
+class HistoryCache:
+    """Ring buffers of the newest messages, one per conversation, LRU-bounded."""
+
+    def __init__(
+        self, max_conversations: int, messages_per_conversation: int, ttl_seconds: float
+    ) -> None:
+        self.max_conversations = max_conversations
+        self.messages_per_conversation = messages_per_conversation
+        self.ttl_seconds = ttl_seconds
+        self._buffers: OrderedDict[uuid.UUID, _Buffer] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(
+        self, conversation_id: uuid.UUID, stamp: datetime, after: datetime | None
+    ) -> list[CachedMessage] | None:
+        """Buffered messages, newest first, if they cover everything after ``after``.
+
+        Returns None (a miss) when nothing is cached, the entry expired, its
+        stamp differs from the conversation's ``updated_at``, or messages
+        newer than ``after`` have been dropped from the ring.
+        """
+        buffer = self._buffers.get(conversation_id)
+        if buffer is None:
+            self.misses += 1
+            return None
+        if buffer.stamp != stamp or buffer.expires_at <= time.monotonic():
+            del self._buffers[conversation_id]
+            self.stale += 1
+            self.misses += 1
+            return None
+        if buffer.floor is not None and (after is None or after < buffer.floor):
+            self.misses += 1
+            return None
+        self._buffers.move_to_end(conversation_id)
+        self.hits += 1
+        return list(reversed(buffer.messages))
+
+    def seed(
+        self,
+        conversation_id: uuid.UUID,
+        stamp: datetime,
+        newest_first: Iterable[CachedMessage],
+        floor: datetime | None,
+    ) -> None:
+        """Cache messages read from the DB: every message created after ``floor``."""
+        if self.max_conversations <= 0:
+            return
+        buffer = _Buffer(
+            stamp=stamp,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            messages=deque(maxlen=self.messages_per_conversation),
+            floor=floor,
+        )
+        for message in reversed(list(newest_first)):
+            buffer.push(message)
+        self._buffers[conversation_id] = buffer
+        self._buffers.move_to_end(conversation_id)
+        self._evict()
+
+    def append(
+        self,
+        conversation_id: uuid.UUID,
+        messages: Iterable[CachedMessage],
+        *,
+        previous: datetime,
+        stamp: datetime,
+    ) -> None:
+        """Record messages just committed, moving the stamp from ``previous``.
+
+        If the buffer's stamp is not ``previous``, someone else wrote in
+        between and the buffer is dropped instead.
+        """
+        buffer = self._buffers.get(conversation_id)
+        if buffer is None:
+            return
+        if buffer.stamp != previous:
+            del self._buffers[conversation_id]
+            self.stale += 1
+            return
+        for message in messages:
+            buffer.push(message)
+        buffer.stamp = stamp
+        buffer.expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self, conversation_id: uuid.UUID) -> None:
+        self._buffers.pop(conversation_id, None)
+
+    def _evict(self) -> None:
+        while len(self._buffers) > self.max_conversations:
+            self._buffers.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._buffers.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "conversations": len(self._buffers),
+            "max_conversations": self.max_conversations,
+        }
+
+
+def _build_history_cache() -> HistoryCache:
+    return HistoryCache(
+        max_conversations=(
+            settings.history_cache_max_conversations
+            if settings.history_cache_enabled
+            else 0
+        ),
+        # At least chat_service's fixed window, the history savings baseline
+        messages_per_conversation=max(
+            settings.history_cache_messages_per_conversation, 20
+        ),
+        ttl_seconds=settings.history_cache_ttl_seconds,
+    )
+
+
+# Newest messages per conversation, kept current by chat_service's writes
+history_cache = _build_history_cache()
@@ -0,0 +1,351 @@
+"""Idempotency-Key support for retried POSTs (chat turns, task creation).
+
+Mobile clients retry requests whose responses they never saw. With an
+Idempotency-Key header, the first request with a given key runs and its
+successful response is stored; retries with the same key get that
+response back instead of running the agent again or creating a duplicate
+task. A retry that arrives while the original is still running waits for
+it in this worker, or gets 409 if the original is running in another one.
+
+Responses live in a bounded in-process LRU in front of the
+``idempotency_keys`` table, both expiring after ``idempotency_ttl_seconds``.
+Only 2xx responses are stored: on an error the key is released, so a retry
+runs the request again. If the request succeeded but its response could not
+be stored, the key stays reserved and retries get 409 rather than running it
+twice. Keys are scoped per user.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.database import engine
+from app.models.idempotency import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyError(Exception):
+    """The request cannot run under its Idempotency-Key.
+
+    ``status_code`` is 400 for a malformed key, 409 while a request with
+    the key is in progress in another worker, and 422 when the key was
+    already used for a different request.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        code: str,
+        message: str,
+        retry_after: int | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Stored:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    expires_at: float  # time.monotonic()
+
+
+@dataclass
+class _InFlight:
+    fingerprint: str
+    # Resolves to the stored response, or None if the original failed
+    future: asyncio.Future
+
+
+def request_fingerprint(scope: str, body: BaseModel) -> str:
+    """Hash identifying the request a key was first used for."""
+    return hashlib.sha256(f"{scope}\n{body.model_dump_json()}".encode()).hexdigest()
+
+
+def validate_key(key: str) -> None:
+    """Raise IdempotencyError(400) unless ``key`` is 1-255 printable ASCII chars."""
+    if not 0 < len(key) <= MAX_KEY_LENGTH or not all(" " <= c <= "~" for c in key):
+        raise IdempotencyError(
+            400,
+            "INVALID_IDEMPOTENCY_KEY",
+            f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} printable ASCII characters",
+        )
+
+
+class IdempotencyStore:
+    """Per-user key → response store: LRU + TTL in memory, table behind it."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        pending_timeout_seconds: float,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pending_timeout_seconds = pending_timeout_seconds
+        self._responses: OrderedDict[tuple[str, str], _Stored] = OrderedDict()
+        self._in_flight: dict[tuple[str, str], _InFlight] = {}
+        # Keys whose request succeeded but whose response was not stored:
+        # fingerprint and expiry (time.monotonic())
+        self._unsaved: dict[tuple[str, str], tuple[str, float]] = {}
+        self.executed = 0
+        self.memory_replays = 0
+        self.db_replays = 0
+        self.waited = 0
+        self.conflicts = 0
+        self.mismatches = 0
+        self.evictions = 0
+        self.save_failures = 0
+
+    async def run(
+        self,
+        user_id: str,
+        key: str,
+        fingerprint: str,
+        call: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Return the stored response for ``key``, or run ``call`` once and store it.
+
+        Raises:
+            IdempotencyError: If the key is in progress elsewhere or was
+                used for a different request.
+        """
+        ident = (user_id, key)
+        while True:
+            stored = self._lookup(ident)
+            if stored is not None:
+                self._check(stored.fingerprint, fingerprint)
+                self.memory_replays += 1
+                return _replay(stored)
+            self._check_unsaved(ident, fingerprint)
+
+            flight = self._in_flight.get(ident)
+            if flight is None:
+                break
+            self._check(flight.fingerprint, fingerprint)
+            self.waited += 1
+            stored = await asyncio.shield(flight.future)
+            if stored is not None:
+                return _replay(stored)
+            # The original failed and released the key; try it ourselves
+
+        # Registered before the first await so duplicates in this worker wait
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[ident] = _InFlight(fingerprint, future)
+        stored = None
+        claimed = False
+        try:
+            stored = await self._claim(user_id, key, fingerprint)
+            if stored is not None:
+                self._remember(ident, stored)
+                self.db_replays += 1
+                return _replay(stored)
+            claimed = True
+
+            self.executed += 1
+            response = await call()
+            if 200 <= response.status_code < 300:
+                result = _Stored(
+                    fingerprint,
+                    response.status_code,
+                    bytes(response.body),
+                    time.monotonic() + self.ttl_seconds,
+                )
+                try:
+                    await self._complete(user_id, key, result)
+                except Exception:
+                    # The request took effect; releasing the key would let a
+                    # retry repeat it, so it stays claimed in the table too
+                    logger.exception("Could not store idempotent response for %s", user_id)
+                    self.save_failures += 1
+                    self._unsaved[ident] = (fingerprint, result.expires_at)
+                    claimed = False
+                    return response
+                stored = result
+                self._remember(ident, stored)
+            return response
+        finally:
+            if claimed and stored is None:
+                await self._release(user_id, key)
+            del self._in_flight[ident]
+            future.set_result(stored)
+
+    def _lookup(self, ident: tuple[str, str]) -> _Stored | None:
+        stored = self._responses.get(ident)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            del self._responses[ident]
+            return None
+        self._responses.move_to_end(ident)
+        return stored
+
+    def _remember(self, ident: tuple[str, str], stored: _Stored) -> None:
+        self._responses[ident] = stored
+        self._responses.move_to_end(ident)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+            self.evictions += 1
+
+    def _check_unsaved(self, ident: tuple[str, str], fingerprint: str) -> None:
+        """Raise 409 if ``ident``'s request ran but its response was not stored."""
+        unsaved = self._unsaved.get(ident)
+        if unsaved is None:
+            return
+        stored_fingerprint, expires_at = unsaved
+        if expires_at <= time.monotonic():
+            del self._unsaved[ident]
+            return
+        self._check(stored_fingerprint, fingerprint)
+        raise self._conflict()
+
+    def _check(self, stored_fingerprint: str, fingerprint: str) -> None:
+        if stored_fingerprint != fingerprint:
+            self.mismatches += 1
+            raise IdempotencyError(
+                422,
+                "IDEMPOTENCY_KEY_REUSED",
+                "Idempotency-Key was already used for a different request",
+            )
+
+    async def _claim(
+        self, user_id: str, key: str, fingerprint: str
+    ) -> _Stored | None:
+        """Claim ``key`` in the table, or return the response stored there."""
+        now = datetime.utcnow()
+        async with AsyncSession(engine) as session:
+            record = await session.get(IdempotencyRecord, (user_id, key))
+            if record is not None and record.expires_at > now:
+                self._check(record.fingerprint, fingerprint)
+                if record.status_code is not None:
+                    remaining = (record.expires_at - now).total_seconds()
+                    return _Stored(
+                        fingerprint,
+                        record.status_code,
+                        record.body or b"",
+                        time.monotonic() + remaining,
+                    )
+                age = (now - record.created_at).total_seconds()
+                if age < self.pending_timeout_seconds:
+                    raise self._conflict()
+                logger.warning("Taking over abandoned idempotency key for %s", user_id)
+
+            if record is None:
+                record = IdempotencyRecord(user_id=user_id, key=key, fingerprint="")
+                session.add(record)
+            # New, expired, or claimed by a request that never finished
+            record.fingerprint = fingerprint
+            record.status_code = None
+            record.body = None
+            record.created_at = now
+            record.expires_at = now + timedelta(seconds=self.ttl_seconds)
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another worker claimed the key between our read and insert
+                raise self._conflict() from None
+        return None
+
+    async def _complete(self, user_id: str, key: str, stored: _Stored) -> None:
+        async with AsyncSession(engine) as session:
+            await session.exec(
+                update(IdempotencyRecord)
+                .where(
+                    IdempotencyRecord.user_id == user_id,
+                    IdempotencyRecord.key == key,
+                )
+                .values(status_code=stored.status_code, body=stored.body)
+            )
+            await session.commit()
+
+    async def _release(self, user_id: str, key: str) -> None:
+        try:
+            async with AsyncSession(engine) as session:
+                await session.exec(
+                    delete(IdempotencyRecord).where(
+                        IdempotencyRecord.user_id == user_id,
+                        IdempotencyRecord.key == key,
+                        IdempotencyRecord.status_code.is_(None),
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            # The claim expires after pending_timeout_seconds anyway
+            logger.warning("Could not release idempotency key: %s", e)
+
+    def _conflict(self) -> IdempotencyError:
+        self.conflicts += 1
+        return IdempotencyError(
+            409,
+            "IDEMPOTENCY_KEY_IN_USE",
+            "A request with this Idempotency-Key is still in progress",
+            retry_after=1,
+        )
+
+    def clear(self) -> None:
+        self._responses.clear()
+        self._unsaved.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._responses),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "memory_replays": self.memory_replays,
+            "db_replays": self.db_replays,
+            "waited": self.waited,
+            "conflicts": self.conflicts,
+            "mismatches": self.mismatches,
+            "evictions": self.evictions,
+            "unsaved": len(self._unsaved),
+            "save_failures": self.save_failures,
+        }
+
+
+def _replay(stored: _Stored) -> Response:
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def purge_expired(session: AsyncSession, now: datetime) -> int:
+    """Delete stored keys that expired before ``now``; returns how many."""
+    result = await session.exec(
+        delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= now)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+# Idempotency-Key responses across all requests in this worker
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency_cache_max_entries,
+    ttl_seconds=settings.idempotency_ttl_seconds,
+    pending_timeout_seconds=settings.idempotency_pending_timeout_seconds,
+)
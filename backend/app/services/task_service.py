@@ -1,20 +1,88 @@
 """Task business logic — CRUD, validation, and tenant filtering."""
 
+import re
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy import text
+from sqlalchemy import (
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    table,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG, array
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.task import Task, TaskRecurrence, TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.models.task import (
+    Task,
+    TaskListVersion,
+    TaskRecurrence,
+    TaskStatus,
+    TaskTag,
+    TaskTombstone,
+)
+from app.schemas.task import (
+    BatchComplete,
+    BatchOperation,
+    TaskCreate,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.services.cache import task_cache
+from app.utils.pagination import decode_cursor, encode_cursor
+
+MAX_SEARCH_TERMS = 8
+# Short task IDs: this many leading hex digits of the UUID
+TASK_ID_PREFIX_LENGTH = 8
+
+RECURRENCE_REQUIRES_DUE_DATE = (
+    "Recurrence requires a due date. "
+    "Set a due_date or change recurrence to 'none'."
+)
+
+
+class ChangesExpiredError(Exception):
+    """The requested delta sync position predates compacted tombstones."""
+
+
+@dataclass
+class BatchOutcome:
+    """Result of one batch operation.
+
+    ``task`` is the task as left by this operation (for deletes, as it was
+    just before removal; None for failures); ``error_code`` is None on
+    success.
+    """
+
+    index: int
+    op: str
+    task_id: uuid.UUID | None
+    task: TaskResponse | None = None
+    error_code: str | None = None
+    message: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error_code is None
 
 
 async def create_task(
     session: AsyncSession, user_id: str, data: TaskCreate
 ) -> Task:
     """Create a new task for the given user."""
+    seq = await _bump_version(session, user_id)
     task = Task(
         title=data.title,
         description=data.description,
@@ -24,10 +92,11 @@ async def create_task(
         due_date=data.due_date,
         recurrence=data.recurrence,
         user_id=user_id,
+        change_seq=seq,
     )
     session.add(task)
-    await session.commit()
-    await session.refresh(task)
+    _add_tag_rows(session, task.id, user_id, task.tags)
+    await _commit_detached(session, user_id, task)
     return task
 
 
@@ -37,26 +106,255 @@ async def list_tasks(
     *,
     status: TaskStatus | None = None,
     priority: str | None = None,
-    tag: str | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = True,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    title_contains: str | None = None,
+    limit: int | None = None,
+    after: tuple[datetime, uuid.UUID] | None = None,
 ) -> list[Task]:
-    """List tasks for a user with optional filters."""
-    query = select(Task).where(Task.user_id == user_id)
+    """List tasks for a user with optional filters.
 
-    if status is not None:
-        query = query.where(Task.status == status)
-    if priority is not None:
-        query = query.where(Task.priority == priority)
-    if tag is not None:
-        # JSON-encoded list stored as text: search for tag in the JSON string
+    ``tags`` keeps tasks carrying all of the given tags, or any of them when
+    ``match_all_tags`` is False. ``due_before`` / ``due_after`` keep tasks
+    due in [due_after, due_before) and drop tasks without a due date.
+    ``title_contains`` is a case-insensitive substring match on the title.
+    Ordered newest first on (created_at, id).
+    When ``after`` is given, only rows strictly past that keyset position are
+    returned, so pages can be walked via idx_task_user_created without OFFSET
+    scans.
+    """
+    query = select(Task).where(
+        *_task_filters(
+            session,
+            user_id,
+            status=status,
+            priority=priority,
+            tags=tags,
+            match_all_tags=match_all_tags,
+            due_before=due_before,
+            due_after=due_after,
+            title_contains=title_contains,
+        )
+    )
+
+    if after is not None:
+        after_created, after_id = after
         query = query.where(
-            text("tags LIKE :tag_pattern").bindparams(tag_pattern=f'%"{tag}"%')
+            or_(
+                Task.created_at < after_created,
+                and_(Task.created_at == after_created, Task.id < after_id),
+            )
         )
 
-    query = query.order_by(Task.created_at.desc())
+    query = query.order_by(Task.created_at.desc(), Task.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
     result = await session.exec(query)
     return list(result.all())
 
 
+def _task_filters(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    status: TaskStatus | None = None,
+    priority: str | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = True,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    title_contains: str | None = None,
+) -> list:
+    """WHERE clauses for list_tasks' filters (see its docstring)."""
+    clauses = [Task.user_id == user_id]
+    if status is not None:
+        clauses.append(Task.status == status)
+    if priority is not None:
+        clauses.append(Task.priority == priority)
+    if tags:
+        clauses.append(_tag_filter(session, user_id, tags, match_all_tags))
+    if due_before is not None:
+        clauses.append(Task.due_date < due_before)
+    if due_after is not None:
+        clauses.append(Task.due_date >= due_after)
+    if title_contains:
+        clauses.append(Task.title.icontains(title_contains, autoescape=True))
+    return clauses
+
+
+async def count_tasks(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    status: TaskStatus | None = None,
+    priority: str | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = True,
+) -> int:
+    """Count the tasks list_tasks would return for the same filters."""
+    result = await session.exec(
+        select(func.count()).select_from(Task).where(
+            *_task_filters(
+                session,
+                user_id,
+                status=status,
+                priority=priority,
+                tags=tags,
+                match_all_tags=match_all_tags,
+            )
+        )
+    )
+    return result.one()
+
+
+async def list_tasks_page(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    limit: int | None,
+    cursor: str | None = None,
+    status: TaskStatus | None = None,
+    priority: str | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = True,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    title_contains: str | None = None,
+) -> tuple[list[Task], str | None]:
+    """Return one page of tasks plus the cursor for the next page.
+
+    Filters are those of list_tasks. The next cursor is None on the last
+    page; ``limit=None`` returns every remaining task as one page. Raises
+    ValueError if the cursor is malformed.
+    """
+    after = _decode_task_cursor(cursor) if cursor else None
+    tasks = await list_tasks(
+        session,
+        user_id,
+        status=status,
+        priority=priority,
+        tags=tags,
+        match_all_tags=match_all_tags,
+        due_before=due_before,
+        due_after=due_after,
+        title_contains=title_contains,
+        limit=None if limit is None else limit + 1,
+        after=after,
+    )
+    if limit is None or len(tasks) <= limit:
+        return tasks, None
+    page = tasks[:limit]
+    last = page[-1]
+    return page, encode_cursor([last.created_at.isoformat(), last.id.hex])
+
+
+def _decode_task_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a list cursor back into its (created_at, id) keyset."""
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(values[0]), uuid.UUID(values[1])
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def search_tasks(
+    session: AsyncSession,
+    user_id: str,
+    q: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[Task], str | None]:
+    """Full-text search over the user's task titles and descriptions.
+
+    Every word of ``q`` must match, as a prefix ("gro" finds "groceries").
+    Results are ranked best first, title hits above description hits, and
+    paged by a (score, id) cursor; the next cursor is None on the last
+    page. Raises ValueError if the cursor is malformed.
+    """
+    terms = _search_terms(q)
+    if not terms:
+        return [], None
+    after = _decode_search_cursor(cursor) if cursor else None
+    query, score = _search_query(session, user_id, terms)
+    if after is not None:
+        after_score, after_id = after
+        query = query.where(
+            or_(score < after_score, and_(score == after_score, Task.id < after_id))
+        )
+    result = await session.exec(
+        query.order_by(score.desc(), Task.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    page = [task for task, _ in rows[:limit]]
+    if len(rows) <= limit:
+        return page, None
+    last_task, last_score = rows[limit - 1]
+    return page, encode_cursor([last_score, last_task.id.hex])
+
+
+def _search_query(session: AsyncSession, user_id: str, terms: list[str]):
+    """Build the ranked search SELECT for the session's dialect.
+
+    Returns (query, score) where query selects (Task, score) rows and a
+    higher score is a better match. PostgreSQL probes idx_task_search_gin;
+    other dialects use the tasks_fts FTS5 table, whose MATCH also filters
+    on the owner so only their postings are scored.
+    """
+    if session.bind.dialect.name == "postgresql":
+        search_vector = literal_column("tasks.search_vector")
+        tsquery = func.to_tsquery(
+            literal("simple", REGCONFIG), " & ".join(f"{t}:*" for t in terms)
+        )
+        score = func.ts_rank(search_vector, tsquery)
+        query = select(Task, score).where(
+            Task.user_id == user_id, search_vector.op("@@")(tsquery)
+        )
+        return query, score
+
+    fts = literal_column("tasks_fts")
+    # Column weights: user_id (filter only), title, description
+    score = -func.bm25(fts, 0.0, 10.0, 1.0)
+    owner = '"' + user_id.replace('"', '""') + '"'
+    words = " AND ".join(f'"{t}"*' for t in terms)
+    query = (
+        select(Task, score)
+        .join(
+            table("tasks_fts", column("rowid")),
+            literal_column("tasks_fts.rowid") == literal_column("tasks.rowid"),
+        )
+        .where(
+            fts.op("MATCH")(f"user_id : {owner} AND {{title description}} : ({words})"),
+            Task.user_id == user_id,
+        )
+    )
+    return query, score
+
+
+def _search_terms(q: str) -> list[str]:
+    """Split a search query into lowercase words (letters and digits only).
+
+    Matches how both index tokenizers split text, and leaves no operator
+    syntax to inject into the FTS5 / tsquery expression.
+    """
+    return list(dict.fromkeys(re.findall(r"[^\W_]+", q.lower())))[:MAX_SEARCH_TERMS]
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Decode a search cursor back into its (score, id) keyset."""
+    values = decode_cursor(cursor)
+    if len(values) != 2 or not isinstance(values[0], (int, float)):
+        raise ValueError("Invalid cursor")
+    try:
+        return float(values[0]), uuid.UUID(values[1])
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
 async def get_task(
     session: AsyncSession, user_id: str, task_id: uuid.UUID
 ) -> Task | None:
@@ -66,66 +364,544 @@ async def get_task(
     return result.first()
 
 
+def short_task_id(task_id: uuid.UUID) -> str:
+    """The short form of a task ID shown in compact listings."""
+    return task_id.hex[:TASK_ID_PREFIX_LENGTH]
+
+
+async def find_task_ids_by_prefixes(
+    session: AsyncSession, user_id: str, prefixes: list[str]
+) -> dict[str, list[uuid.UUID]]:
+    """IDs of the user's tasks starting with each short ID, in one query.
+
+    Each prefix must be TASK_ID_PREFIX_LENGTH hex digits; those come before
+    the first dash in both the hex (SQLite) and text (PostgreSQL) forms of
+    the UUID column. Keys are the lowercased prefixes; more than one ID
+    means that short ID is ambiguous.
+    """
+    wanted = list(dict.fromkeys(p.lower() for p in prefixes))
+    matches: dict[str, list[uuid.UUID]] = {p: [] for p in wanted}
+    if not wanted:
+        return matches
+    id_text = cast(Task.id, String)
+    result = await session.exec(
+        select(Task.id).where(
+            Task.user_id == user_id,
+            or_(*(id_text.like(p + "%") for p in wanted)),
+        )
+    )
+    for task_id in result.all():
+        short = short_task_id(task_id)
+        if short in matches:
+            matches[short].append(task_id)
+    return matches
+
+
+async def list_task_titles(
+    session: AsyncSession, user_id: str
+) -> list[tuple[uuid.UUID, str, TaskStatus]]:
+    """(id, title, status) of every task the user has, newest first."""
+    result = await session.exec(
+        select(Task.id, Task.title, Task.status)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+    )
+    return list(result.all())
+
+
+async def get_list_version(session: AsyncSession, user_id: str) -> int:
+    """Return the user's task list version (0 if they never wrote a task).
+
+    Changes whenever any of the user's tasks is created, updated, toggled
+    or deleted — from the REST API or the MCP tools.
+    """
+    result = await session.exec(
+        select(TaskListVersion.version).where(TaskListVersion.user_id == user_id)
+    )
+    return result.first() or 0
+
+
+async def apply_batch(
+    session: AsyncSession,
+    user_id: str,
+    operations: list[BatchOperation | BatchComplete],
+) -> list[BatchOutcome]:
+    """Apply create/update/toggle/complete/delete operations in one transaction.
+
+    Round trips stay constant in the batch size: one SELECT loads every
+    referenced task, one upsert reserves a change_seq per operation, and
+    the flush/commit writes with multi-row INSERT, batched UPDATE and
+    DELETE ... IN statements. Operations run in order against the loaded
+    rows, so a later item sees the effect of an earlier one. A failing
+    item (not found, validation) is reported and does not abort the rest.
+    """
+    ids = {op.id for op in operations if op.op != "create"}
+    tasks: dict[uuid.UUID, Task] = {}
+    if ids:
+        result = await session.exec(
+            select(Task).where(Task.user_id == user_id, Task.id.in_(ids))
+        )
+        tasks = {t.id: t for t in result.all()}
+
+    last_seq = await _bump_version(session, user_id, len(operations))
+    first_seq = last_seq - len(operations) + 1
+    now = datetime.utcnow()
+    outcomes: list[BatchOutcome] = []
+    retagged: dict[uuid.UUID, Task] = {}
+    deleted: list[uuid.UUID] = []
+
+    for index, op in enumerate(operations):
+        seq = first_seq + index
+        if op.op == "create":
+            task = Task(
+                title=op.data.title,
+                description=op.data.description,
+                status=TaskStatus.pending,
+                priority=op.data.priority,
+                tags=op.data.tags,
+                due_date=op.data.due_date,
+                recurrence=op.data.recurrence,
+                user_id=user_id,
+                change_seq=seq,
+            )
+            session.add(task)
+            _add_tag_rows(session, task.id, user_id, task.tags)
+            tasks[task.id] = task
+            outcomes.append(
+                BatchOutcome(index, op.op, task.id, TaskResponse.model_validate(task))
+            )
+            continue
+
+        task = tasks.get(op.id)
+        if task is None:
+            outcomes.append(
+                BatchOutcome(index, op.op, op.id, error_code="NOT_FOUND", message="Task not found")
+            )
+            continue
+
+        if op.op == "update":
+            update_data = op.data.model_dump(exclude_unset=True)
+            new_recurrence = update_data.get("recurrence", task.recurrence)
+            new_due_date = update_data.get("due_date", task.due_date)
+            if new_recurrence != TaskRecurrence.none and new_due_date is None:
+                outcomes.append(
+                    BatchOutcome(
+                        index,
+                        op.op,
+                        op.id,
+                        error_code="VALIDATION_ERROR",
+                        message=RECURRENCE_REQUIRES_DUE_DATE,
+                    )
+                )
+                continue
+            for field, value in update_data.items():
+                setattr(task, field, value)
+            if "tags" in update_data:
+                retagged[task.id] = task
+        elif op.op == "toggle":
+            task.status = (
+                TaskStatus.completed
+                if task.status == TaskStatus.pending
+                else TaskStatus.pending
+            )
+        elif op.op == "complete":
+            if task.status == TaskStatus.completed:
+                outcomes.append(
+                    BatchOutcome(
+                        index,
+                        op.op,
+                        op.id,
+                        error_code="ALREADY_COMPLETED",
+                        message="Task is already completed",
+                    )
+                )
+                continue
+            task.status = TaskStatus.completed
+        else:
+            del tasks[task.id]
+            retagged.pop(task.id, None)
+            deleted.append(task.id)
+            session.add(TaskTombstone(task_id=task.id, user_id=user_id, change_seq=seq))
+            outcomes.append(
+                BatchOutcome(index, op.op, task.id, TaskResponse.model_validate(task))
+            )
+            continue
+
+        task.change_seq = seq
+        task.updated_at = now
+        outcomes.append(
+            BatchOutcome(index, op.op, task.id, TaskResponse.model_validate(task))
+        )
+
+    stale_tag_owners = [*retagged, *deleted]
+    if stale_tag_owners and not _native_tags(session):
+        await session.exec(
+            delete(TaskTag).where(TaskTag.task_id.in_(stale_tag_owners))
+        )
+    for task in retagged.values():
+        _add_tag_rows(session, task.id, user_id, task.tags)
+    if deleted:
+        await session.exec(
+            delete(Task)
+            .where(Task.user_id == user_id, Task.id.in_(deleted))
+            .execution_options(synchronize_session="fetch")
+        )
+    await session.commit()
+    task_cache.invalidate(user_id)
+    return outcomes
+
+
+async def list_changes(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    since: int,
+    limit: int,
+) -> tuple[list[Task], list[TaskTombstone], int, bool]:
+    """Return tasks written and tasks deleted after change sequence ``since``.
+
+    Both streams are merged in change_seq order and cut at ``limit`` items.
+    Returns (changed, deleted, next_since, has_more). ``since=0`` is a full
+    snapshot and skips tombstones. Raises ChangesExpiredError when deletions
+    after ``since`` may already have been compacted.
+    """
+    if since > 0:
+        result = await session.exec(
+            select(TaskListVersion.purged_seq).where(
+                TaskListVersion.user_id == user_id
+            )
+        )
+        if since < (result.first() or 0):
+            raise ChangesExpiredError("Sync position expired; full resync required")
+
+    changed_result = await session.exec(
+        select(Task)
+        .where(Task.user_id == user_id, Task.change_seq > since)
+        .order_by(Task.change_seq)
+        .limit(limit + 1)
+    )
+    changed = list(changed_result.all())
+    deleted: list[TaskTombstone] = []
+    if since > 0:
+        deleted_result = await session.exec(
+            select(TaskTombstone)
+            .where(TaskTombstone.user_id == user_id, TaskTombstone.change_seq > since)
+            .order_by(TaskTombstone.change_seq)
+            .limit(limit + 1)
+        )
+        deleted = list(deleted_result.all())
+
+    merged = sorted(changed + deleted, key=lambda row: row.change_seq)
+    has_more = len(merged) > limit
+    page = merged[:limit]
+    next_since = page[-1].change_seq if page else since
+    return (
+        [row for row in page if isinstance(row, Task)],
+        [row for row in page if isinstance(row, TaskTombstone)],
+        next_since,
+        has_more,
+    )
+
+
+async def compact_tombstones(session: AsyncSession, older_than: datetime) -> int:
+    """Drop tombstones deleted before ``older_than``; returns rows removed.
+
+    Records the highest compacted change_seq per user first, so list_changes
+    can reject sync positions that would now miss a deletion.
+    """
+    expired = TaskTombstone.deleted_at < older_than
+    purged = (
+        select(func.max(TaskTombstone.change_seq))
+        .where(TaskTombstone.user_id == TaskListVersion.user_id, expired)
+        .scalar_subquery()
+    )
+    await session.exec(
+        update(TaskListVersion)
+        .where(
+            TaskListVersion.user_id.in_(
+                select(TaskTombstone.user_id).where(expired)
+            )
+        )
+        .values(purged_seq=purged)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(
+        delete(TaskTombstone)
+        .where(expired)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount
+
+
 async def update_task(
     session: AsyncSession,
     user_id: str,
     task_id: uuid.UUID,
     data: TaskUpdate,
 ) -> Task | None:
-    """Update task fields. Returns None if not found/not owned."""
-    task = await get_task(session, user_id, task_id)
-    if task is None:
-        return None
+    """Update task fields. Returns None if not found/not owned.
 
+    Writes with a single UPDATE ... RETURNING scoped to the owner; there is
+    no SELECT before the write and no refresh after the commit.
+    """
     update_data = data.model_dump(exclude_unset=True)
+    conditions = []
 
-    # Enforce recurrence+due_date coupling (FR-012)
-    new_recurrence = update_data.get("recurrence", task.recurrence)
-    new_due_date = update_data.get("due_date", task.due_date)
-    if new_recurrence != TaskRecurrence.none and new_due_date is None:
-        raise ValueError(
-            "Recurrence requires a due date. "
-            "Set a due_date or change recurrence to 'none'."
-        )
+    # Enforce recurrence+due_date coupling (FR-012). When only one side is
+    # changing, the stored value of the other side is checked in the WHERE.
+    if "recurrence" in update_data and "due_date" in update_data:
+        if (
+            update_data["recurrence"] != TaskRecurrence.none
+            and update_data["due_date"] is None
+        ):
+            raise ValueError(RECURRENCE_REQUIRES_DUE_DATE)
+    elif update_data.get("recurrence", TaskRecurrence.none) != TaskRecurrence.none:
+        conditions.append(Task.due_date.is_not(None))
+    elif "due_date" in update_data and update_data["due_date"] is None:
+        conditions.append(Task.recurrence == TaskRecurrence.none)
+
+    seq = await _bump_version(session, user_id)
+    task = await _update_returning(
+        session,
+        user_id,
+        task_id,
+        {**update_data, "change_seq": seq, "updated_at": datetime.utcnow()},
+        *conditions,
+    )
+    if task is None:
+        await session.rollback()
+        if conditions and await get_task(session, user_id, task_id):
+            raise ValueError(RECURRENCE_REQUIRES_DUE_DATE)
+        return None
 
-    for field, value in update_data.items():
-        setattr(task, field, value)
+    if "tags" in update_data:
+        await _delete_tag_rows(session, task.id)
+        _add_tag_rows(session, task.id, user_id, task.tags)
 
-    task.updated_at = datetime.utcnow()
-    session.add(task)
-    await session.commit()
-    await session.refresh(task)
+    await _commit_detached(session, user_id, task)
     return task
 
 
 async def toggle_task(
     session: AsyncSession, user_id: str, task_id: uuid.UUID
 ) -> Task | None:
-    """Toggle task status between pending and completed."""
-    task = await get_task(session, user_id, task_id)
+    """Toggle task status between pending and completed.
+
+    The flip happens in SQL, so concurrent toggles cannot both read the same
+    status and write the same result.
+    """
+    status_type = Task.status.type
+    flipped = case(
+        (
+            Task.status == TaskStatus.pending,
+            literal(TaskStatus.completed, status_type),
+        ),
+        else_=literal(TaskStatus.pending, status_type),
+    )
+    seq = await _bump_version(session, user_id)
+    task = await _update_returning(
+        session,
+        user_id,
+        task_id,
+        {"status": flipped, "change_seq": seq, "updated_at": datetime.utcnow()},
+    )
     if task is None:
+        await session.rollback()
         return None
 
-    task.status = (
-        TaskStatus.completed
-        if task.status == TaskStatus.pending
-        else TaskStatus.pending
-    )
-    task.updated_at = datetime.utcnow()
-    session.add(task)
-    await session.commit()
-    await session.refresh(task)
+    await _commit_detached(session, user_id, task)
     return task
 
 
+async def complete_task(
+    session: AsyncSession, user_id: str, task_id: uuid.UUID
+) -> tuple[Task | None, bool]:
+    """Mark a pending task completed.
+
+    A single conditional UPDATE, so concurrent completes cannot undo each
+    other the way two toggles would. Returns (task, True) if this call
+    completed it, (task, False) if it was already completed, and
+    (None, False) if not found/not owned.
+    """
+    seq = await _bump_version(session, user_id)
+    task = await _update_returning(
+        session,
+        user_id,
+        task_id,
+        {
+            "status": TaskStatus.completed,
+            "change_seq": seq,
+            "updated_at": datetime.utcnow(),
+        },
+        Task.status == TaskStatus.pending,
+    )
+    if task is None:
+        await session.rollback()
+        return await get_task(session, user_id, task_id), False
+
+    await _commit_detached(session, user_id, task)
+    return task, True
+
+
 async def delete_task(
     session: AsyncSession, user_id: str, task_id: uuid.UUID
 ) -> bool:
-    """Delete a task permanently. Returns False if not found/not owned."""
-    task = await get_task(session, user_id, task_id)
-    if task is None:
-        return False
+    """Delete a task permanently. Returns False if not found/not owned.
 
-    await session.delete(task)
+    Leaves a tombstone so delta sync clients learn about the deletion.
+    """
+    return await delete_task_returning_title(session, user_id, task_id) is not None
+
+
+async def delete_task_returning_title(
+    session: AsyncSession, user_id: str, task_id: uuid.UUID
+) -> str | None:
+    """delete_task, returning the deleted task's title (None if not found)."""
+    seq = await _bump_version(session, user_id)
+    stmt = delete(Task).where(Task.id == task_id, Task.user_id == user_id)
+    if session.bind.dialect.delete_returning:
+        result = await session.exec(stmt.returning(Task.title))
+        title = result.scalars().first()
+    else:
+        title = (
+            await session.exec(
+                select(Task.title).where(Task.id == task_id, Task.user_id == user_id)
+            )
+        ).first()
+        result = await session.exec(stmt)
+        if result.rowcount == 0:
+            title = None
+    if title is None:
+        await session.rollback()
+        return None
+
+    await _delete_tag_rows(session, task_id)
+    session.add(TaskTombstone(task_id=task_id, user_id=user_id, change_seq=seq))
     await session.commit()
-    return True
+    task_cache.invalidate(user_id)
+    return title
+
+
+async def _update_returning(
+    session: AsyncSession,
+    user_id: str,
+    task_id: uuid.UUID,
+    values: dict,
+    *conditions,
+) -> Task | None:
+    """UPDATE one owned task and return the updated row, or None if no match.
+
+    Uses UPDATE ... RETURNING where the dialect supports it; otherwise
+    (SQLite before 3.35) checks rowcount and re-reads the row.
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id, *conditions)
+        .values(**values)
+    )
+    if session.bind.dialect.update_returning:
+        result = await session.exec(stmt.returning(Task))
+        return result.scalars().first()
+
+    result = await session.exec(stmt)
+    if result.rowcount == 0:
+        return None
+    reread = await session.exec(
+        select(Task)
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    return reread.first()
+
+
+async def _commit_detached(
+    session: AsyncSession, user_id: str, task: Task
+) -> None:
+    """Commit, keeping ``task`` usable without a post-commit refresh.
+
+    The task's attributes are already current (set in Python or returned by
+    the write), so it is detached before commit to stop expire_on_commit
+    from discarding them.
+    """
+    await session.flush()
+    session.expunge(task)
+    await session.commit()
+    task_cache.invalidate(user_id)
+
+
+async def _bump_version(
+    session: AsyncSession, user_id: str, count: int = 1
+) -> int:
+    """Increment the user's task list version inside the current transaction.
+
+    A single upsert ... RETURNING, so concurrent writers serialize on the
+    version row instead of racing a read-modify-write. ``count`` reserves a
+    contiguous block of sequence numbers; the last one is returned.
+    """
+    dialect_insert = (
+        postgresql.insert
+        if session.bind.dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    table = TaskListVersion.__table__
+    stmt = (
+        dialect_insert(table)
+        .values(user_id=user_id, version=count)
+        .on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"version": table.c.version + count},
+        )
+        .returning(table.c.version)
+    )
+    result = await session.exec(stmt)
+    return result.scalar_one()
+
+
+def _native_tags(session: AsyncSession) -> bool:
+    """True when Task.tags is JSONB and can be filtered with @> directly."""
+    return session.bind.dialect.name == "postgresql"
+
+
+def _tag_filter(
+    session: AsyncSession, user_id: str, tags: list[str], match_all: bool
+):
+    """Build the WHERE clause selecting tasks with all (or any) of ``tags``.
+
+    PostgreSQL uses JSONB containment on idx_task_tags_gin; other dialects
+    resolve through idx_task_tag_user_tag on the task_tags table.
+    """
+    wanted = list(dict.fromkeys(tags))
+    if _native_tags(session):
+        column = type_coerce(Task.tags, JSONB)
+        if match_all:
+            return column.contains(wanted)
+        return column.has_any(array(wanted))
+
+    query = select(TaskTag.task_id).where(
+        TaskTag.user_id == user_id, TaskTag.tag.in_(wanted)
+    )
+    if match_all and len(wanted) > 1:
+        query = query.group_by(TaskTag.task_id).having(
+            func.count(TaskTag.tag) == len(wanted)
+        )
+    return Task.id.in_(query)
+
+
+def _add_tag_rows(
+    session: AsyncSession, task_id: uuid.UUID, user_id: str, tags: list[str]
+) -> None:
+    """Stage task_tags rows mirroring a task's tag list."""
+    if _native_tags(session):
+        return
+    session.add_all(
+        TaskTag(task_id=task_id, user_id=user_id, tag=tag)
+        for tag in dict.fromkeys(tags)
+    )
+
+
+async def _delete_tag_rows(session: AsyncSession, task_id: uuid.UUID) -> None:
+    """Remove a task's task_tags rows."""
+    if _native_tags(session):
+        return
+    await session.exec(delete(TaskTag).where(TaskTag.task_id == task_id))
@@ -0,0 +1,126 @@
+"""Fuzzy lookup of a user's tasks by title, for the MCP tools.
+
+Lets the agent say "complete buy milk" without listing tasks first to find
+the ID. Titles are broken into trigrams the way PostgreSQL's pg_trgm does
+(lowercased words, padded with two spaces in front and one behind), and an
+inverted index from trigram to task keeps a lookup proportional to the
+tasks sharing a trigram with the query rather than to all of the user's
+tasks. Built indexes are cached per user in task_cache (see
+cached_tasks.title_index), so they are rebuilt only after a write.
+"""
+
+import re
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+from app.models.task import TaskStatus
+
+# Candidates scoring below this are not considered matches at all
+MIN_SIMILARITY = 0.3
+# The tools that resolve titles change or delete the task, so a candidate
+# is picked outright only when it is a near-exact match: a one-letter typo
+# ("pay grocries" for "Pay groceries" scores 0.76) or the whole query inside
+# one title. A different word ("buy eggs" for "Buy milk", 0.4) only makes
+# it a suggestion.
+AUTO_RESOLVE_SIMILARITY = 0.75
+# ...and only if it leads the next candidate by this much
+UNIQUE_MARGIN = 0.15
+# Most candidates reported back when a reference is ambiguous
+MAX_CANDIDATES = 5
+# A query fully contained in a longer title scores this, so an exact title
+# always beats a title that merely contains the query
+_CONTAINED_WEIGHT = 0.9
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class TitleEntry:
+    id: uuid.UUID
+    title: str
+    status: TaskStatus
+
+
+@dataclass(frozen=True)
+class TitleMatch:
+    """Outcome of TitleIndex.resolve.
+
+    ``task`` is set when the reference names exactly one task; otherwise
+    ``candidates`` holds the closest matches, best first (empty if none).
+    """
+
+    task: TitleEntry | None
+    candidates: list[TitleEntry]
+
+
+def normalize(title: str) -> str:
+    """Lowercased words of ``title`` joined by single spaces."""
+    return " ".join(_WORD.findall(title.lower()))
+
+
+def trigrams(title: str) -> set[str]:
+    """pg_trgm-style trigrams of ``title``."""
+    grams: set[str] = set()
+    for word in _WORD.findall(title.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TitleIndex:
+    """Immutable trigram index over one user's task titles."""
+
+    def __init__(self, entries: list[TitleEntry]) -> None:
+        self._entries = entries
+        self._by_title: dict[str, list[int]] = {}
+        self._grams: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for position, entry in enumerate(entries):
+            self._by_title.setdefault(normalize(entry.title), []).append(position)
+            grams = trigrams(entry.title)
+            self._grams.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, reference: str) -> TitleMatch:
+        """Find the task ``reference`` names.
+
+        An exact (case- and punctuation-insensitive) title match wins;
+        otherwise the best trigram match wins if it is near-exact and
+        clearly leads the rest. Anything else comes back as candidates.
+        """
+        exact = self._by_title.get(normalize(reference), [])
+        if len(exact) == 1:
+            return TitleMatch(self._entries[exact[0]], [])
+        if exact:
+            return TitleMatch(None, [self._entries[p] for p in exact[:MAX_CANDIDATES]])
+
+        ranked = self._rank(reference)
+        if ranked and ranked[0][0] >= AUTO_RESOLVE_SIMILARITY and (
+            len(ranked) == 1 or ranked[0][0] - ranked[1][0] >= UNIQUE_MARGIN
+        ):
+            return TitleMatch(self._entries[ranked[0][1]], [])
+        return TitleMatch(
+            None, [self._entries[p] for _, p in ranked[:MAX_CANDIDATES]]
+        )
+
+    def _rank(self, reference: str) -> list[tuple[float, int]]:
+        query = trigrams(reference)
+        if not query:
+            return []
+        shared: Counter[int] = Counter()
+        for gram in query:
+            shared.update(self._postings.get(gram, ()))
+        ranked = []
+        for position, common in shared.items():
+            similarity = common / (len(query) + self._grams[position] - common)
+            contained = _CONTAINED_WEIGHT * common / len(query)
+            score = max(similarity, contained)
+            if score >= MIN_SIMILARITY:
+                ranked.append((score, position))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
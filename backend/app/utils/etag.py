@@ -0,0 +1,25 @@
+"""Strong ETag helpers for conditional GETs (If-None-Match → 304)."""
+
+import hashlib
+
+
+def make_etag(version: int, *parts: object) -> str:
+    """Build a strong ETag from a version counter and the request identity.
+
+    ``parts`` should cover everything else that shapes the representation
+    (user, path, query parameters).
+    """
+    digest = hashlib.sha1(
+        "|".join(str(p) for p in parts).encode("utf-8")
+    ).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an If-None-Match header against ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(c.removeprefix("W/") == etag for c in candidates)
@@ -1,7 +1,13 @@
 """Consistent { data, error, meta } response envelope helpers."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
+import anyio
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
 
 def success_response(
     data: Any, meta: dict[str, Any] | None = None
@@ -23,3 +29,75 @@ def error_response(
         },
         "meta": None,
     }
+
+
+class EnvelopeJSONResponse(Response):
+    """JSON response rendered with orjson, skipping FastAPI's encoder pass.
+
+    Returning this from a route bypasses response_model validation and
+    jsonable_encoder. orjson converts UUID, enum and datetime values in C,
+    with output byte-identical to JSONResponse over model_dump(mode="json")
+    (compact separators, raw UTF-8, "Z" for UTC).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def success_json_response(
+    data: Any,
+    meta: dict[str, Any] | None = None,
+    *,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> EnvelopeJSONResponse:
+    """Return a success envelope, already encoded."""
+    return EnvelopeJSONResponse(
+        success_response(data, meta), status_code=status_code, headers=headers
+    )
+
+
+class EventStreamResponse(StreamingResponse):
+    """Server-Sent Events response over an async iterator of event dicts.
+
+    Each dict's "type" becomes the SSE event name and the remaining keys its
+    JSON data. The iterator is always closed when the response ends, even
+    when the client disconnects mid-stream, so its cleanup runs promptly
+    instead of whenever the generator is garbage collected.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(
+        self,
+        events: AsyncIterator[dict[str, Any]],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.events = events
+        super().__init__(
+            self._encode(events),
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+                **(headers or {}),
+            },
+        )
+
+    async def stream_response(self, send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+                await self.events.aclose()
+
+    @staticmethod
+    async def _encode(events: AsyncIterator[dict[str, Any]]) -> AsyncIterator[bytes]:
+        async for event in events:
+            data = {k: v for k, v in event.items() if k != "type"}
+            yield b"event: %s\ndata: %s\n\n" % (
+                event["type"].encode(),
+                orjson.dumps(data, option=orjson.OPT_UTC_Z),
+            )
@@ -0,0 +1,16 @@
+"""Cheap prompt-token estimates for chat history budgeting."""
+
+# Roughly 4 characters per token for English text with GPT-family
+# tokenizers, plus a few tokens of per-message framing (role, separators).
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(content: str) -> int:
+    """Estimated prompt tokens for one chat message with this content.
+
+    Deliberately tokenizer-free, so it costs nothing at write time and
+    the same formula can backfill existing rows in SQL.
+    """
+    text_tokens = (len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return text_tokens + MESSAGE_OVERHEAD_TOKENS
@@ -0,0 +1,85 @@
+"""Prompt tokens spent on chat history: fixed 20-message window vs token budget.
+
+Replays a conversation through chat_service.handle_chat with a stub agent
+whose replies alternate between short confirmations and long task lists,
+the pattern that inflated prompts. Prints, per turn, the history tokens
+each policy would send and the history query latency.
+
+Run from backend/:  python -m benchmarks.chat_history_tokens [turns]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import create_db_and_tables, engine  # noqa: E402
+from app.models.conversation import Conversation  # noqa: E402
+from app.services import chat_service  # noqa: E402
+
+USER_ID = "bench-user"
+TASK_LIST = "📋 **Your Tasks** (40):\n" + "\n".join(
+    f"  ⬜ Follow up on item number {i} for the quarterly review (`{i:08x}...`)"
+    for i in range(40)
+)
+
+
+class _Result:
+    def __init__(self, text: str) -> None:
+        self.final_output = text
+        self.raw_responses = []
+
+
+async def _stub_agent(messages, user_id, metrics=None):
+    if "show" in messages[-1]["content"]:
+        return _Result(TASK_LIST)
+    return _Result("✅ Task created: **Something**")
+
+
+async def main(turns: int) -> None:
+    await create_db_and_tables()
+    chat_service.run_agent = _stub_agent
+    conversation_id = None
+    print(f"{'turn':>5}{'fixed 20':>10}{'budgeted':>10}{'saved':>8}{'query ms':>10}")
+    async with AsyncSession(engine) as session:
+        for turn in range(1, turns + 1):
+            message = "show my tasks" if turn % 2 else f"add task number {turn}"
+            before = chat_service.history_stats()
+            response = await chat_service.handle_chat(
+                USER_ID, message, conversation_id, session
+            )
+            conversation_id = response.conversation_id
+            after = chat_service.history_stats()
+
+            conversation = await session.get(Conversation, conversation_id)
+            started = time.perf_counter()
+            await chat_service._fetch_message_history(
+                session,
+                conversation_id,
+                after=conversation.summary_through,
+                budget=chat_service.settings.chat_history_token_budget,
+            )
+            query_ms = (time.perf_counter() - started) * 1000
+
+            fixed = after["fixed_window_tokens"] - before["fixed_window_tokens"]
+            sent = after["history_tokens"] - before["history_tokens"]
+            if turn % 5 == 0 or turn == 1:
+                print(f"{turn:>5}{fixed:>10}{sent:>10}{fixed - sent:>8}{query_ms:>10.2f}")
+
+    totals = chat_service.history_stats()
+    share = totals["tokens_saved"] / max(totals["fixed_window_tokens"], 1)
+    print(
+        f"\ntotal history tokens: fixed {totals['fixed_window_tokens']}, "
+        f"budgeted {totals['history_tokens']} ({share:.0%} saved)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 40))
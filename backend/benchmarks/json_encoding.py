@@ -0,0 +1,68 @@
+"""Compare response encoding cost for a page of tasks, old path vs orjson.
+
+The old path is what a route returning a dict costs: TaskResponse
+validation + model_dump(mode="json"), FastAPI's jsonable_encoder pass over
+the envelope, then JSONResponse's json.dumps. The new path builds dicts
+off the rows and renders them with EnvelopeJSONResponse.
+
+Run from backend/:  python -m benchmarks.json_encoding
+"""
+
+import os
+import timeit
+import uuid
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.models.task import Task, TaskPriority  # noqa: E402
+from app.schemas.task import TaskResponse, task_response_dict  # noqa: E402
+from app.utils.responses import success_json_response, success_response  # noqa: E402
+
+PAGE_SIZES = (1, 100, 500)
+
+
+def _tasks(count: int) -> list[Task]:
+    return [
+        Task(
+            id=uuid.uuid4(),
+            title=f"Task number {i}",
+            description="Some longer description text for the task",
+            priority=TaskPriority.high,
+            tags=["work", "home"],
+            due_date=datetime(2026, 3, 1, 9, 30),
+            user_id="bench-user",
+        )
+        for i in range(count)
+    ]
+
+
+def old_path(tasks: list[Task]) -> bytes:
+    data = [TaskResponse.model_validate(t).model_dump(mode="json") for t in tasks]
+    content = jsonable_encoder(success_response(data, {"total": len(tasks)}))
+    return JSONResponse(content).body
+
+
+def new_path(tasks: list[Task]) -> bytes:
+    data = [task_response_dict(t) for t in tasks]
+    return success_json_response(data, {"total": len(tasks)}).body
+
+
+def main() -> None:
+    print(f"{'tasks':>6}{'old µs':>10}{'new µs':>10}{'speedup':>9}")
+    for size in PAGE_SIZES:
+        tasks = _tasks(size)
+        assert old_path(tasks) == new_path(tasks)
+        number = max(10, 2000 // size)
+        old = min(timeit.repeat(lambda: old_path(tasks), number=number, repeat=5))
+        new = min(timeit.repeat(lambda: new_path(tasks), number=number, repeat=5))
+        old_us, new_us = old / number * 1e6, new / number * 1e6
+        print(f"{size:>6}{old_us:>10.0f}{new_us:>10.0f}{old_us / new_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
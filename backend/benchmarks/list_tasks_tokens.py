@@ -0,0 +1,117 @@
+"""Prompt tokens spent on list_tasks tool output for a large account.
+
+Seeds one user with many tasks (titles, descriptions, tags, due dates),
+then compares the tool output the model receives: the old unbounded dump
+of every task, the new default summary page, the full view page, and a
+filtered summary. Tokens are estimated as in utils/tokens.py.
+
+Run from backend/:  python -m benchmarks.list_tasks_tokens [tasks]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import create_db_and_tables, engine  # noqa: E402
+from app.mcp_server import task_tools  # noqa: E402
+from app.models.conversation import Conversation  # noqa: E402,F401 — for create_all
+from app.models.task import TaskPriority, TaskStatus  # noqa: E402
+from app.schemas.task import TaskCreate  # noqa: E402
+from app.services import task_service  # noqa: E402
+from app.utils.tokens import estimate_tokens  # noqa: E402
+
+USER_ID = "bench-user"
+PRIORITIES = list(TaskPriority)
+
+
+async def _seed(count: int) -> None:
+    async with AsyncSession(engine) as session:
+        for i in range(count):
+            await task_service.create_task(
+                session,
+                USER_ID,
+                TaskCreate(
+                    title=f"Follow up on item {i} for the quarterly review",
+                    description=(
+                        f"Check the notes from meeting {i}, update the tracker, "
+                        "and send a short summary to the team before Friday."
+                    ),
+                    priority=PRIORITIES[i % 3],
+                    tags=["work", f"project-{i % 7}"],
+                    due_date=datetime(2026, 1, 1) + timedelta(days=i % 90),
+                ),
+            )
+
+
+async def _legacy_output() -> str:
+    """What list_tasks returned before: every task, full fields."""
+    async with AsyncSession(engine) as session:
+        tasks = await task_service.list_tasks(session, USER_ID)
+    return json.dumps({
+        "success": True,
+        "data": {
+            "tasks": [
+                {
+                    "id": str(t.id),
+                    "title": t.title,
+                    "description": t.description,
+                    "completed": t.status == TaskStatus.completed,
+                    "priority": t.priority.value,
+                    "created_at": t.created_at.isoformat(),
+                }
+                for t in tasks
+            ],
+            "count": len(tasks),
+        },
+    })
+
+
+async def _timed(label: str, call) -> tuple[str, int, float]:
+    started = time.perf_counter()
+    output = await call()
+    return label, estimate_tokens(output), (time.perf_counter() - started) * 1000
+
+
+async def main(count: int) -> None:
+    await create_db_and_tables()
+    await _seed(count)
+
+    rows = [
+        await _timed(f"before: all {count} tasks, full fields", _legacy_output),
+        await _timed(
+            "full view, default page",
+            lambda: task_tools.list_tasks(USER_ID, view="full"),
+        ),
+        await _timed(
+            "summary view, default page",
+            lambda: task_tools.list_tasks(USER_ID),
+        ),
+        await _timed(
+            "summary, high priority due in January",
+            lambda: task_tools.list_tasks(
+                USER_ID, priority="high", due_before="2026-02-01"
+            ),
+        ),
+        await _timed(
+            "summary, title contains 'item 12'",
+            lambda: task_tools.list_tasks(USER_ID, title_contains="item 12"),
+        ),
+    ]
+    baseline = rows[0][1]
+    print(f"{'output':<42}{'tokens':>8}{'vs before':>11}{'ms':>8}")
+    for label, tokens, ms in rows:
+        print(f"{label:<42}{tokens:>8}{tokens / baseline:>10.1%}{ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
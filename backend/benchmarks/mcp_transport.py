@@ -0,0 +1,71 @@
+"""Per-tool-call latency of the MCP task tools: stdio subprocess vs in-process.
+
+Both transports serve the same FastMCP tools against one SQLite database.
+The stdio server is connected once up front (as the warm pool does), so
+the numbers are per call, not per spawn.
+
+Run from backend/:  python -m benchmarks.mcp_transport [calls]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from app.agents.mcp_inprocess import InProcessMCPServer  # noqa: E402
+from app.agents.task_agent import _new_mcp_server  # noqa: E402
+from app.database import create_db_and_tables  # noqa: E402
+from app.mcp_server.task_tools import mcp  # noqa: E402
+
+USER_ID = "bench-user"
+SEED_TASKS = 20
+
+
+async def _time_calls(server, tool_name: str, arguments: dict, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        result = await server.call_tool(tool_name, arguments)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert not result.isError, result
+    return sorted(timings)
+
+
+async def main(calls: int) -> None:
+    await create_db_and_tables()
+    inprocess = InProcessMCPServer(mcp)
+    for i in range(SEED_TASKS):
+        await inprocess.call_tool("add_task", {"user_id": USER_ID, "title": f"Seed {i}"})
+
+    stdio = _new_mcp_server()
+    started = time.perf_counter()
+    await stdio.connect()
+    print(f"stdio connect: {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    workloads = [
+        ("list_tasks", {"user_id": USER_ID}),
+        ("add_task", {"user_id": USER_ID, "title": "Benchmark task"}),
+    ]
+    print(f"{'transport':<11}{'tool':<12}{'p50 ms':>8}{'p95 ms':>8}{'max ms':>8}")
+    try:
+        for tool_name, arguments in workloads:
+            for label, server in (("stdio", stdio), ("in-process", inprocess)):
+                # Warm up imports, tool list and connections before timing
+                await _time_calls(server, tool_name, arguments, 3)
+                t = await _time_calls(server, tool_name, arguments, calls)
+                p95 = t[min(len(t) - 1, int(len(t) * 0.95))]
+                print(
+                    f"{label:<11}{tool_name:<12}"
+                    f"{t[len(t) // 2]:>8.2f}{p95:>8.2f}{t[-1]:>8.2f}"
+                )
+    finally:
+        await stdio.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,74 @@
+"""Count database round trips per task_service mutation.
+
+Every statement and COMMIT is a network round trip to a remote database
+(Neon), so the count is a latency proxy independent of local timing noise.
+
+Run from backend/:  python -m benchmarks.round_trips
+"""
+
+import asyncio
+import os
+import tempfile
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from sqlalchemy import event  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import create_db_and_tables, engine  # noqa: E402
+from app.schemas.task import TaskCreate, TaskUpdate  # noqa: E402
+from app.services import task_service  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+class RoundTripCounter:
+    """Counts statements and commits issued on the engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def _record(self, *args, **kwargs) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "RoundTripCounter":
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+        event.listen(engine.sync_engine, "commit", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._record)
+        event.remove(engine.sync_engine, "commit", self._record)
+
+
+async def main() -> None:
+    await create_db_and_tables()
+    async with AsyncSession(engine) as session:
+        task = await task_service.create_task(
+            session, USER_ID, TaskCreate(title="Benchmark", tags=["a"])
+        )
+        task_id = task.id
+
+    operations = {
+        "toggle_task": lambda s: task_service.toggle_task(s, USER_ID, task_id),
+        "update_task": lambda s: task_service.update_task(
+            s, USER_ID, task_id, TaskUpdate(title="Renamed")
+        ),
+        "update_task (tags)": lambda s: task_service.update_task(
+            s, USER_ID, task_id, TaskUpdate(tags=["b"])
+        ),
+        "delete_task": lambda s: task_service.delete_task(s, USER_ID, task_id),
+    }
+    print(f"{'operation':<22}{'round trips':>12}")
+    for name, run in operations.items():
+        # Fresh session per call, as in a request: nothing in the identity map
+        async with AsyncSession(engine) as session:
+            with RoundTripCounter() as counter:
+                await run(session)
+        print(f"{name:<22}{counter.count:>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Time task_service.search_tasks for one user with many tasks.
+
+Seeds the tasks with the search index missing, then runs the startup
+migration, so the one-off FTS5 rebuild is timed as well.
+
+Run from backend/:  python -m benchmarks.search_latency [task_count]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from sqlalchemy import insert, text  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import create_db_and_tables, engine  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.services import task_service  # noqa: E402
+
+USER_ID = "bench-user"
+WORDS = (
+    "buy call email fix plan review write book clean pay send order "
+    "schedule prepare update check finish read cook walk water renew"
+).split()
+NOUNS = (
+    "groceries dentist report invoice garden car taxes slides budget "
+    "tickets laundry kitchen passport insurance package meeting draft"
+).split()
+QUERIES = ["invoice", "pay tax", "gro", "re", "dentist appointment", "xyz"]
+
+
+async def seed(count: int) -> None:
+    rng = random.Random(42)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"{rng.choice(WORDS)} {rng.choice(NOUNS)} {i}",
+            "description": " ".join(rng.choices(WORDS + NOUNS, k=8)),
+            "tags": [],
+            "user_id": USER_ID,
+            "change_seq": i + 1,
+        }
+        for i in range(count)
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(Task), rows)
+
+
+async def main(count: int) -> None:
+    await create_db_and_tables()
+    # Seed as a pre-search database would be, then let the migration index it
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE tasks_fts"))
+        for trigger in ("insert", "update", "delete"):
+            await conn.execute(text(f"DROP TRIGGER tasks_fts_{trigger}"))
+    await seed(count)
+    started = time.perf_counter()
+    await create_db_and_tables()
+    print(f"index build for {count} tasks: {time.perf_counter() - started:.2f}s")
+
+    print(f"{'query':<22}{'hits':>6}{'p50 ms':>9}{'max ms':>9}")
+    async with AsyncSession(engine) as session:
+        for q in QUERIES:
+            timings = []
+            for _ in range(20):
+                started = time.perf_counter()
+                tasks, _ = await task_service.search_tasks(
+                    session, USER_ID, q, limit=20
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(f"{q:<22}{len(tasks):>6}{timings[10]:>9.1f}{timings[-1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,144 @@
+"""Agent turns per action when tools resolve tasks by title.
+
+Before, complete/delete/update_task only took an ID, so acting on "the
+dentist task" took a list_tasks call to find the ID, then the action, then
+the reply: three model calls, with the listing in the prompt. Now the
+title goes straight to the action tool. Each flow below replays the tool
+calls the agent makes and counts model calls (tool rounds + the final
+reply) and the tool-output tokens fed back to the model, estimated as in
+utils/tokens.py.
+
+Also times title resolution on a cold and a cached per-user index.
+
+Run from backend/:  python -m benchmarks.title_references [tasks]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.database import create_db_and_tables, engine  # noqa: E402
+from app.mcp_server import task_tools  # noqa: E402
+from app.models.conversation import Conversation  # noqa: E402,F401 — for create_all
+from app.schemas.task import TaskCreate  # noqa: E402
+from app.services import task_service  # noqa: E402
+from app.services.cache import task_cache  # noqa: E402
+from app.utils.tokens import estimate_tokens  # noqa: E402
+
+USER_ID = "bench-user"
+VERBS = ["Call", "Email", "Book", "Review", "Pay", "Renew", "Order", "Plan",
+         "Clean", "Fix", "Buy", "Return", "Schedule", "Update", "Cancel",
+         "Prepare", "Send", "Check", "Sign", "Water"]
+NOUNS = ["dentist", "landlord", "flights", "budget", "invoice", "passport",
+         "groceries", "party", "garage", "bike", "printer", "library books",
+         "car service", "resume", "gym plan", "slides", "birthday card",
+         "insurance", "lease", "plants", "report", "taxes", "newsletter",
+         "backup drive", "vet visit"]
+
+
+def _title(i: int) -> str:
+    verb, noun = VERBS[i % len(VERBS)], NOUNS[i // len(VERBS) % len(NOUNS)]
+    round_ = i // (len(VERBS) * len(NOUNS))
+    return f"{verb} {noun}" + (f" #{round_ + 1}" if round_ else "")
+
+
+async def _seed(count: int) -> list:
+    async with AsyncSession(engine) as session:
+        return [
+            await task_service.create_task(session, USER_ID, TaskCreate(title=_title(i)))
+            for i in range(count)
+        ]
+
+
+async def _flow(rounds) -> tuple[int, int, bool]:
+    """Replay tool-call rounds (calls within a round run in parallel).
+
+    Returns (model calls, tool-output tokens, every call succeeded).
+    """
+    tokens = 0
+    ok = True
+    outputs: list[dict] = []
+    for calls in rounds:
+        raws = await asyncio.gather(*(call(outputs) for call in calls))
+        tokens += sum(estimate_tokens(raw) for raw in raws)
+        outputs = [json.loads(raw) for raw in raws]
+        ok = ok and all(o["success"] for o in outputs)
+        ok = ok and all(o["data"].get("failed", 0) == 0 for o in outputs)
+    return len(rounds) + 1, tokens, ok
+
+
+def _found_ids(outputs: list[dict]) -> list[str]:
+    return [out["data"]["rows"][0][0] for out in outputs]
+
+
+def _lookups(titles: list[str]) -> list:
+    return [
+        lambda _, t=t: task_tools.list_tasks(USER_ID, title_contains=t)
+        for t in titles
+    ]
+
+
+async def main(count: int) -> None:
+    await create_db_and_tables()
+    titles = [t.title for t in await _seed(count)]
+
+    # Before and after act on different tasks of the same shape
+    flows = {
+        "complete one task": (
+            [
+                _lookups([titles[7]]),
+                [lambda out: task_tools.complete_task(USER_ID, _found_ids(out)[0])],
+            ],
+            [[lambda _: task_tools.complete_task(USER_ID, titles[8].lower())]],
+        ),
+        "rename one task (typo)": (
+            [
+                _lookups([titles[123]]),
+                [lambda out: task_tools.update_task(
+                    USER_ID, _found_ids(out)[0], title="Renamed"
+                )],
+            ],
+            [[lambda _: task_tools.update_task(
+                USER_ID, titles[124].replace("e", "", 1), title="Renamed too"
+            )]],
+        ),
+        "delete three tasks": (
+            [
+                _lookups(titles[300:303]),
+                [lambda out: task_tools.delete_tasks(USER_ID, _found_ids(out))],
+            ],
+            [[lambda _: task_tools.delete_tasks(USER_ID, titles[303:306])]],
+        ),
+    }
+
+    print(f"{'action':<26}{'model calls':>24}{'tool tokens':>24}")
+    print(f"{'':<26}{'before':>12}{'after':>12}{'before':>12}{'after':>12}")
+    for label, (before, after) in flows.items():
+        b_calls, b_tokens, b_ok = await _flow(before)
+        a_calls, a_tokens, a_ok = await _flow(after)
+        assert b_ok and a_ok, label
+        print(f"{label:<26}{b_calls:>12}{a_calls:>12}{b_tokens:>12}{a_tokens:>12}")
+
+    resolve = task_tools._resolve_task_id
+    for state in ("cold index", "cached index"):
+        if state == "cold index":
+            task_cache.invalidate(USER_ID)
+        async with AsyncSession(engine) as session:
+            started = time.perf_counter()
+            task_id, error = await resolve(session, USER_ID, "renew pasport")
+            elapsed = (time.perf_counter() - started) * 1000
+        print(f"resolve title, {state} ({count} tasks): {elapsed:.2f} ms"
+              f" -> {error or task_service.short_task_id(task_id)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
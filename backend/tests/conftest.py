@@ -19,6 +19,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.main import app
+from app.services.cache import task_cache
+from app.services.chat_stats import turn_stats
+from app.services.history_cache import history_cache
+from app.services.idempotency import idempotency_store
 
 # Use SQLite for tests (no PostgreSQL dependency in CI)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -49,6 +53,38 @@ async def setup_database():
         await conn.run_sync(SQLModel.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def clear_task_cache():
+    """Start each test with an empty task cache (the DB is recreated too)."""
+    task_cache.clear()
+    yield
+    task_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_history_cache():
+    """Start each test with an empty chat history cache."""
+    history_cache.clear()
+    yield
+    history_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_idempotency_store():
+    """Forget remembered Idempotency-Key responses (the table is recreated too)."""
+    idempotency_store.clear()
+    yield
+    idempotency_store.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_turn_stats():
+    """Start each test with no recorded chat turns."""
+    turn_stats.clear()
+    yield
+    turn_stats.clear()
+
+
 @pytest_asyncio.fixture
 async def session() -> AsyncGenerator[AsyncSession, None]:
     """Provide a test database session."""
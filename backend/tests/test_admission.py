@@ -0,0 +1,145 @@
+"""Unit tests for agent-run admission control (services/admission.py)."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import chat_service
+from app.services.admission import AdmissionController, AdmissionRejectedError
+from tests.conftest import TEST_USER_ID, make_auth_header
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = {
+        "max_concurrent": 2,
+        "max_per_user": 1,
+        "max_queued": 10,
+        "max_queued_per_user": 3,
+        "max_wait_seconds": 5,
+    }
+    return AdmissionController(**{**options, **overrides})
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+    async def test_per_user_cap_queues_second_turn(self):
+        controller = _controller()
+        started = await controller.acquire("a")
+        second = asyncio.create_task(controller.acquire("a"))
+        await _settle()
+        assert not second.done()
+        assert controller.stats()["queue_depth"] == 1
+
+        controller.release("a", started)
+        await asyncio.wait_for(second, 1)
+        stats = controller.stats()
+        assert (stats["in_flight"], stats["queue_depth"]) == (1, 0)
+        assert stats["queued"] == 1
+
+    async def test_queue_is_served_round_robin_across_users(self):
+        controller = _controller(max_concurrent=1, max_per_user=1)
+        first = await controller.acquire("a")
+        order: list[str] = []
+
+        async def turn(user_id: str) -> None:
+            started = await controller.acquire(user_id)
+            order.append(user_id)
+            await _settle()
+            controller.release(user_id, started)
+
+        # "a" bursts three turns before "b" and "c" ask once each
+        tasks = [asyncio.create_task(turn(u)) for u in ("a", "a", "a", "b", "c")]
+        await _settle()
+        controller.release("a", first)
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        assert order == ["a", "b", "c", "a", "a"]
+
+    async def test_user_over_queue_limit_gets_429(self):
+        controller = _controller(max_queued_per_user=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("a"))
+        await _settle()
+        with pytest.raises(AdmissionRejectedError) as rejected:
+            await controller.acquire("a")
+        assert rejected.value.status_code == 429
+        assert rejected.value.retry_after >= 1
+        # Other users are unaffected
+        await controller.acquire("b")
+        waiting.cancel()
+
+    async def test_full_queue_gets_503(self):
+        controller = _controller(max_concurrent=1, max_queued=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        with pytest.raises(AdmissionRejectedError) as rejected:
+            await controller.acquire("c")
+        assert rejected.value.status_code == 503
+        assert controller.stats()["rejected"] == {"OVERLOADED": 1}
+        waiting.cancel()
+
+    async def test_wait_longer_than_max_gets_503(self):
+        controller = _controller(max_concurrent=1, max_wait_seconds=0.01)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejectedError) as rejected:
+            await controller.acquire("b")
+        assert rejected.value.status_code == 503
+        assert controller.stats()["queue_depth"] == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        controller = _controller(max_concurrent=1)
+        started = await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        waiting.cancel()
+        await _settle()
+        controller.release("a", started)
+        stats = controller.stats()
+        assert (stats["in_flight"], stats["queue_depth"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+class TestChatAdmission:
+    """POST /api/{user_id}/chat when agent slots are saturated."""
+
+    async def test_saturated_chat_gets_retry_after(
+        self, client: AsyncClient, monkeypatch
+    ):
+        controller = _controller(max_concurrent=1, max_queued=0)
+        monkeypatch.setattr(chat_service, "chat_admission", controller)
+        await controller.acquire("someone-else")
+
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 503
+        assert int(resp.headers["Retry-After"]) >= 1
+
+        stream = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )
+        assert stream.status_code == 503
+
+    async def test_stream_returns_slot_when_done(
+        self, client: AsyncClient, monkeypatch
+    ):
+        controller = _controller()
+        monkeypatch.setattr(chat_service, "chat_admission", controller)
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 200
+        stats = controller.stats()
+        assert (stats["admitted"], stats["in_flight"]) == (1, 0)
@@ -0,0 +1,50 @@
+"""Unit tests for the LRU + TTL task cache backend."""
+
+import time
+
+from app.services.cache import LRUTTLCache
+
+
+class TestLRUTTLCache:
+    """services/cache.py — bounded, per-user invalidation, stale-write guard."""
+
+    def test_hit_and_miss_counters(self):
+        cache = LRUTTLCache(max_weight=100, ttl_seconds=60)
+        assert cache.get("u1", "k") is None
+        cache.set("u1", "k", "v", token=cache.token("u1"))
+        assert cache.get("u1", "k") == "v"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_invalidate_drops_only_that_user(self):
+        cache = LRUTTLCache(max_weight=100, ttl_seconds=60)
+        cache.set("u1", "k", 1, token=cache.token("u1"))
+        cache.set("u2", "k", 2, token=cache.token("u2"))
+        cache.invalidate("u1")
+        assert cache.get("u1", "k") is None
+        assert cache.get("u2", "k") == 2
+
+    def test_stale_token_is_not_stored(self):
+        """A read that raced with a write must not repopulate the cache."""
+        cache = LRUTTLCache(max_weight=100, ttl_seconds=60)
+        token = cache.token("u1")
+        cache.invalidate("u1")
+        cache.set("u1", "k", "stale", token=token)
+        assert cache.get("u1", "k") is None
+
+    def test_expired_entries_miss(self):
+        cache = LRUTTLCache(max_weight=100, ttl_seconds=0.01)
+        cache.set("u1", "k", "v", token=cache.token("u1"))
+        time.sleep(0.02)
+        assert cache.get("u1", "k") is None
+
+    def test_evicts_least_recently_used_user_by_weight(self):
+        cache = LRUTTLCache(max_weight=10, ttl_seconds=60)
+        cache.set("u1", "k", "a", token=cache.token("u1"), weight=4)
+        cache.set("u2", "k", "b", token=cache.token("u2"), weight=4)
+        cache.get("u1", "k")  # u1 is now most recently used
+        cache.set("u3", "k", "c", token=cache.token("u3"), weight=2)
+        assert cache.get("u2", "k") is None
+        assert cache.get("u1", "k") == "a"
+        assert cache.get("u3", "k") == "c"
+        assert cache.stats()["weight"] <= 10
@@ -0,0 +1,177 @@
+"""Contract tests for the streaming chat endpoint (POST /api/{user_id}/chat/stream).
+
+No OpenAI key is configured in tests, so the dev fallback agent answers.
+"""
+
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.agents.task_agent import _translate_stream_event
+from app.models.message import Message
+from app.services import chat_service
+from tests.conftest import TEST_USER_ID, TEST_USER_ID_2, make_auth_header, test_engine
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _stored_messages(conversation_id) -> list[tuple[str, str]]:
+    async with AsyncSession(test_engine) as session:
+        result = await session.exec(
+            select(Message)
+            .where(Message.conversation_id == uuid.UUID(str(conversation_id)))
+            .order_by(Message.created_at)
+        )
+        return [(m.role, m.content) for m in result.all()]
+
+
+@pytest.mark.asyncio
+class TestChatStream:
+    """POST /api/{user_id}/chat/stream"""
+
+    async def test_streams_events_and_stores_reply(self, client: AsyncClient):
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "add task Buy milk"},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse_sse(resp.text)
+        assert [name for name, _ in events] == ["start", "tool_call", "delta", "done"]
+        start, tool_call, delta, done = (data for _, data in events)
+        assert tool_call["tool"] == "add_task"
+        assert "Buy milk" in delta["text"]
+        assert done["conversation_id"] == start["conversation_id"]
+        assert done["response"] == delta["text"]
+
+        assert await _stored_messages(done["conversation_id"]) == [
+            ("user", "add task Buy milk"),
+            ("assistant", delta["text"]),
+        ]
+
+    async def test_continues_existing_conversation(self, client: AsyncClient):
+        first = _parse_sse((await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )).text)
+        conversation_id = first[0][1]["conversation_id"]
+
+        second = _parse_sse((await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "show my tasks", "conversation_id": conversation_id},
+            headers=make_auth_header(),
+        )).text)
+        assert second[-1][1]["conversation_id"] == conversation_id
+        assert len(await _stored_messages(conversation_id)) == 4
+
+    async def test_unknown_conversation_returns_404(self, client: AsyncClient):
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "hello", "conversation_id": str(uuid.uuid4())},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 404
+
+    async def test_other_users_path_forbidden(self, client: AsyncClient):
+        resp = await client.post(
+            f"/api/{TEST_USER_ID_2}/chat/stream",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 403
+
+    async def test_agent_failure_emits_error_without_reply(
+        self, client: AsyncClient, monkeypatch
+    ):
+        async def failing_agent(messages, user_id, metrics=None):
+            yield {"type": "delta", "text": "Let me"}
+            raise ConnectionError("provider down")
+
+        monkeypatch.setattr(chat_service, "run_agent_streamed", failing_agent)
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "hello"},
+            headers=make_auth_header(),
+        )
+        events = _parse_sse(resp.text)
+        assert [name for name, _ in events] == ["start", "delta", "error"]
+        conversation_id = events[0][1]["conversation_id"]
+        assert await _stored_messages(conversation_id) == [("user", "hello")]
+
+    async def test_closing_stream_cancels_agent_run(self, session, monkeypatch):
+        cancelled = asyncio.Event()
+
+        async def slow_agent(messages, user_id, metrics=None):
+            try:
+                yield {"type": "delta", "text": "Working"}
+                await asyncio.sleep(60)
+                yield {"type": "result", "result": None}
+            finally:
+                cancelled.set()
+
+        monkeypatch.setattr(chat_service, "run_agent_streamed", slow_agent)
+        events = await chat_service.stream_chat(TEST_USER_ID, "hello", None, session)
+        start = await anext(events)
+        assert (await anext(events))["type"] == "delta"
+        await events.aclose()
+
+        assert cancelled.is_set()
+        assert await _stored_messages(start["conversation_id"]) == [("user", "hello")]
+
+
+class TestTranslateStreamEvent:
+    """agents/task_agent.py — Agents SDK stream events to chat events."""
+
+    def test_text_delta(self):
+        event = SimpleNamespace(
+            type="raw_response_event",
+            data=SimpleNamespace(type="response.output_text.delta", delta="Hi"),
+        )
+        assert _translate_stream_event(event, {}) == {"type": "delta", "text": "Hi"}
+
+    def test_tool_call_and_result_are_paired_by_call_id(self):
+        names: dict[str, str] = {}
+        called = SimpleNamespace(
+            type="run_item_stream_event",
+            name="tool_called",
+            item=SimpleNamespace(
+                raw_item=SimpleNamespace(
+                    name="add_task", call_id="c1", arguments='{"title": "x"}'
+                )
+            ),
+        )
+        output = SimpleNamespace(
+            type="run_item_stream_event",
+            name="tool_output",
+            item=SimpleNamespace(raw_item={"call_id": "c1"}, output='{"success": true}'),
+        )
+        assert _translate_stream_event(called, names) == {
+            "type": "tool_call", "tool": "add_task", "args": {"title": "x"},
+        }
+        assert _translate_stream_event(output, names) == {
+            "type": "tool_result", "tool": "add_task", "output": '{"success": true}',
+        }
+
+    def test_other_events_skipped(self):
+        event = SimpleNamespace(
+            type="raw_response_event", data=SimpleNamespace(type="response.created")
+        )
+        assert _translate_stream_event(event, {}) is None
+        assert _translate_stream_event(
+            SimpleNamespace(type="agent_updated_stream_event"), {}
+        ) is None
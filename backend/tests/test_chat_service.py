@@ -0,0 +1,312 @@
+"""Unit tests for chat history budgeting in chat_service.py."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.migrations import _backfill_message_token_counts
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services import chat_service
+from app.services.history_cache import history_cache
+from app.utils.tokens import estimate_tokens
+from tests.conftest import TEST_USER_ID, test_engine
+
+T0 = datetime(2026, 1, 1, 12, 0)
+TASK_LIST_REPLY = "Your tasks:\n" + "\n".join(f"- task {i}" for i in range(50))
+
+
+async def _conversation(session: AsyncSession, *tokens: int) -> Conversation:
+    """A conversation whose messages (oldest first) have the given token counts."""
+    conversation = Conversation(user_id=TEST_USER_ID)
+    session.add(conversation)
+    for i, count in enumerate(tokens):
+        session.add(Message(
+            conversation_id=conversation.id,
+            user_id=TEST_USER_ID,
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"message {i}",
+            token_count=count,
+            created_at=T0 + timedelta(minutes=i),
+        ))
+    await session.commit()
+    await session.refresh(conversation)
+    return conversation
+
+
+class _Result:
+    def __init__(self, text: str) -> None:
+        self.final_output = text
+        self.raw_responses = []
+
+
+@pytest.fixture
+def agent_inputs(monkeypatch) -> list[list[dict]]:
+    """Replace the agent with one that records its input and lists 50 tasks."""
+    inputs: list[list[dict]] = []
+
+    async def fake_run_agent(messages, user_id, metrics=None):
+        inputs.append(messages)
+        return _Result(TASK_LIST_REPLY)
+
+    monkeypatch.setattr(chat_service, "run_agent", fake_run_agent)
+    return inputs
+
+
+@pytest.mark.asyncio
+class TestFetchMessageHistory:
+    async def test_newest_messages_within_budget(self, session: AsyncSession):
+        conversation = await _conversation(session, 50, 10, 30, 20, 40)
+        window = await chat_service._fetch_message_history(
+            session, conversation.id, after=None, budget=95
+        )
+        assert [m["content"] for m in window.messages] == [
+            "message 2", "message 3", "message 4",
+        ]
+        assert window.tokens == 90
+        assert [m["content"] for m in window.overflow] == ["message 1", "message 0"]
+        assert window.fixed_window_tokens == 150
+
+    async def test_summarized_messages_excluded(self, session: AsyncSession):
+        conversation = await _conversation(session, 50, 10, 30, 20, 40)
+        window = await chat_service._fetch_message_history(
+            session, conversation.id, after=T0 + timedelta(minutes=2), budget=1000
+        )
+        assert [m["content"] for m in window.messages] == ["message 3", "message 4"]
+        assert window.overflow == []
+        assert window.fixed_window_tokens == 150
+
+    async def test_single_statement(self, session: AsyncSession):
+        conversation = await _conversation(session, *[10] * 30)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            window = await chat_service._fetch_message_history(
+                session, conversation.id, after=T0, budget=100
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert len(statements) == 1
+        assert len(window.messages) == 10
+        assert window.fixed_window_tokens == 200
+
+
+@pytest.mark.asyncio
+class TestTokenBudgetedChat:
+    async def test_messages_store_token_count(self, session, agent_inputs):
+        response = await chat_service.handle_chat(
+            TEST_USER_ID, "show my tasks", None, session
+        )
+        window = await chat_service._fetch_message_history(
+            session, response.conversation_id, after=None, budget=10_000
+        )
+        assert window.tokens == estimate_tokens("show my tasks") + estimate_tokens(
+            response.response
+        )
+
+    async def test_older_turns_fold_into_summary(
+        self, session, agent_inputs, monkeypatch
+    ):
+        monkeypatch.setattr(chat_service.settings, "chat_history_token_budget", 400)
+        conversation_id = None
+        for i in range(6):
+            response = await chat_service.handle_chat(
+                TEST_USER_ID, f"show my tasks {i}", conversation_id, session
+            )
+            conversation_id = response.conversation_id
+
+        last_input = agent_inputs[-1]
+        assert last_input[0]["role"] == "system"
+        assert "user: show my tasks 0" in last_input[0]["content"]
+        history = last_input[1:-1]
+        assert sum(estimate_tokens(m["content"]) for m in history) <= 400
+        assert "show my tasks 0" not in [m["content"] for m in history]
+        assert last_input[-1]["content"].endswith("show my tasks 5")
+
+        async with AsyncSession(test_engine) as fresh:
+            stored = await fresh.get(Conversation, conversation_id)
+        assert stored.summary.startswith("user: show my tasks 0")
+        assert stored.summary_through is not None
+        assert estimate_tokens(stored.summary) <= chat_service.SUMMARY_TOKEN_BUDGET
+
+    async def test_savings_reported(self, session, agent_inputs, monkeypatch):
+        monkeypatch.setattr(chat_service.settings, "chat_history_token_budget", 400)
+        before = chat_service.history_stats()
+        conversation_id = None
+        for i in range(8):
+            response = await chat_service.handle_chat(
+                TEST_USER_ID, f"list {i}", conversation_id, session
+            )
+            conversation_id = response.conversation_id
+        after = chat_service.history_stats()
+        assert after["requests"] - before["requests"] == 8
+        assert after["tokens_saved"] > before["tokens_saved"]
+
+
+@pytest.mark.asyncio
+class TestTurnRoundTrips:
+    """One chat turn commits twice and never re-reads what it wrote."""
+
+    @pytest.fixture
+    def recorded(self, session: AsyncSession):
+        calls: list[str] = []
+
+        def on_statement(conn, cursor, statement, *args):
+            calls.append(statement.split()[0].upper())
+
+        def on_commit(conn):
+            calls.append("COMMIT")
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", on_statement)
+        event.listen(engine, "commit", on_commit)
+        yield calls
+        event.remove(engine, "before_cursor_execute", on_statement)
+        event.remove(engine, "commit", on_commit)
+
+    async def test_new_conversation(self, session, agent_inputs, recorded):
+        await chat_service.handle_chat(TEST_USER_ID, "hello", None, session)
+        assert recorded == [
+            "INSERT", "INSERT", "COMMIT",  # conversation + user message
+            "INSERT", "INSERT", "UPDATE", "COMMIT",  # assistant message + stats, updated_at
+        ]
+
+    async def test_existing_conversation(self, session, agent_inputs, recorded):
+        conversation = await _conversation(session, 10, 10)
+        recorded.clear()
+        await chat_service.handle_chat(
+            TEST_USER_ID, "hello", conversation.id, session
+        )
+        assert recorded == [
+            "SELECT", "SELECT", "UPDATE", "INSERT", "COMMIT",
+            "INSERT", "INSERT", "UPDATE", "COMMIT",
+        ]
+
+    async def test_cached_history_skips_messages_query(
+        self, session, agent_inputs, recorded
+    ):
+        first = await chat_service.handle_chat(TEST_USER_ID, "hello", None, session)
+        recorded.clear()
+        await chat_service.handle_chat(
+            TEST_USER_ID, "show my tasks", first.conversation_id, session
+        )
+        assert recorded == [
+            "SELECT", "UPDATE", "INSERT", "COMMIT",  # conversation row only
+            "INSERT", "INSERT", "UPDATE", "COMMIT",
+        ]
+        history = [m["content"] for m in agent_inputs[-1][:-1]]
+        assert history == ["hello", TASK_LIST_REPLY]
+
+    async def test_user_message_durable_before_agent_runs(
+        self, session, monkeypatch
+    ):
+        seen: list[list[str]] = []
+
+        async def fake_run_agent(messages, user_id, metrics=None):
+            async with AsyncSession(test_engine) as other:
+                rows = await other.exec(select(Message.content))
+                seen.append(list(rows.all()))
+            return _Result("ok")
+
+        monkeypatch.setattr(chat_service, "run_agent", fake_run_agent)
+        response = await chat_service.handle_chat(
+            TEST_USER_ID, "hello", None, session
+        )
+        assert seen == [["hello"]]
+        async with AsyncSession(test_engine) as fresh:
+            stored = await fresh.get(Conversation, response.conversation_id)
+        assert stored.updated_at >= stored.created_at
+
+
+@pytest.mark.asyncio
+class TestHistoryCache:
+    async def test_cached_window_matches_db(self, session, agent_inputs, monkeypatch):
+        monkeypatch.setattr(chat_service.settings, "chat_history_token_budget", 400)
+        hits = history_cache.stats()["hits"]
+        conversation_id = None
+        for i in range(6):
+            response = await chat_service.handle_chat(
+                TEST_USER_ID, f"show my tasks {i}", conversation_id, session
+            )
+            conversation_id = response.conversation_id
+        assert history_cache.stats()["hits"] - hits == 5
+
+        async with AsyncSession(test_engine) as fresh:
+            conversation = await fresh.get(Conversation, conversation_id)
+            cached = await chat_service._load_message_history(
+                fresh,
+                conversation_id,
+                stamp=conversation.updated_at,
+                after=conversation.summary_through,
+                budget=400,
+            )
+            stored = await chat_service._fetch_message_history(
+                fresh, conversation_id, after=conversation.summary_through, budget=400
+            )
+        assert history_cache.stats()["hits"] - hits == 6
+        assert cached == stored
+
+    async def test_write_from_another_worker_invalidates(
+        self, session, agent_inputs
+    ):
+        stale = history_cache.stats()["stale"]
+        first = await chat_service.handle_chat(TEST_USER_ID, "hello", None, session)
+        # Another worker appends a turn: new message, new updated_at
+        async with AsyncSession(test_engine) as other:
+            other.add(Message(
+                conversation_id=first.conversation_id,
+                user_id=TEST_USER_ID,
+                role="user",
+                content="from another worker",
+            ))
+            conversation = await other.get(Conversation, first.conversation_id)
+            conversation.updated_at = datetime.utcnow()
+            await other.commit()
+
+        await chat_service.handle_chat(
+            TEST_USER_ID, "show my tasks", first.conversation_id, session
+        )
+        history = [m["content"] for m in agent_inputs[-1]]
+        assert "from another worker" in history
+        assert history_cache.stats()["stale"] - stale == 1
+
+
+class TestFoldIntoSummary:
+    def test_clips_lines_and_drops_oldest(self):
+        long = "word " * 200
+        summary = chat_service._fold_into_summary(
+            None, [{"role": "user", "content": long}] * 20
+        )
+        lines = summary.splitlines()
+        max_line = len("user: ") + chat_service.SUMMARY_LINE_CHARS
+        assert all(len(line) <= max_line for line in lines)
+        assert estimate_tokens(summary) <= chat_service.SUMMARY_TOKEN_BUDGET
+        assert 1 < len(lines) < 20
+
+
+@pytest.mark.asyncio
+class TestBackfillTokenCounts:
+    async def test_legacy_messages_get_estimates(self, session: AsyncSession):
+        conversation = await _conversation(session)
+        async with test_engine.begin() as conn:
+            await conn.execute(insert(Message), [{
+                "id": conversation.id,
+                "conversation_id": conversation.id,
+                "user_id": TEST_USER_ID,
+                "role": "user",
+                "content": "x" * 37,
+                "created_at": T0,
+            }])
+            await conn.run_sync(_backfill_message_token_counts)
+        window = await chat_service._fetch_message_history(
+            session, conversation.id, after=None, budget=1000
+        )
+        assert window.tokens == estimate_tokens("x" * 37) == 14
@@ -0,0 +1,170 @@
+"""Tests for per-turn chat instrumentation (agents/turn_metrics.py, services/chat_stats.py).
+
+No OpenAI key is configured in tests, so chat turns take the dev path;
+the LLM path is exercised with a fake Runner.run that calls the hooks.
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from agents import Runner
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.agents import task_agent
+from app.agents.turn_metrics import PATH_DEV, PATH_LLM, ToolTiming, TurnMetrics
+from app.config import settings
+from app.models.message import Message
+from app.models.message_stats import MessageStats
+from app.services.chat_stats import stats_row, turn_stats, user_summary
+from tests.conftest import TEST_USER_ID, TEST_USER_ID_2, make_auth_header
+
+
+def _usage(prompt: int, completion: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        usage=SimpleNamespace(input_tokens=prompt, output_tokens=completion)
+    )
+
+
+@pytest.mark.asyncio
+class TestTimingHooks:
+    @pytest.fixture(autouse=True)
+    def fake_provider(self, monkeypatch):
+        """A Runner.run that makes two model calls around one failing tool call."""
+
+        async def fake_run(agent, input, run_config, hooks, **kwargs):
+            tool = SimpleNamespace(name="complete_task")
+            await hooks.on_llm_start(None, agent, None, input)
+            await hooks.on_llm_end(None, agent, _usage(120, 15))
+            await hooks.on_tool_start(None, agent, tool)
+            await hooks.on_tool_end(
+                None, agent, tool, '{"success": false, "error": "Task not found"}'
+            )
+            await hooks.on_llm_start(None, agent, None, input)
+            await hooks.on_llm_end(None, agent, _usage(160, 25))
+            return SimpleNamespace(final_output="No such task.", raw_responses=[])
+
+        monkeypatch.setattr(task_agent, "_has_openai_key", lambda: True)
+        monkeypatch.setattr(task_agent, "_get_model", lambda: "test-model")
+        monkeypatch.setattr(settings, "mcp_transport", "inprocess")
+        monkeypatch.setattr(settings, "intent_router_enabled", False)
+        monkeypatch.setattr(settings, "llm_breaker_enabled", False)
+        monkeypatch.setattr(task_agent, "_llm_breaker", None)
+        monkeypatch.setattr(Runner, "run", fake_run)
+
+    async def test_llm_run_fills_metrics(self):
+        metrics = TurnMetrics()
+        await task_agent.run_agent(
+            [{"role": "user", "content": f"[user_id: {TEST_USER_ID}] finish the report"}],
+            TEST_USER_ID,
+            metrics,
+        )
+        assert metrics.path == PATH_LLM
+        assert metrics.model == settings.openai_model
+        assert metrics.model_calls == 2
+        assert (metrics.prompt_tokens, metrics.completion_tokens) == (280, 40)
+        assert [(t.name, t.ok) for t in metrics.tools] == [("complete_task", False)]
+        assert metrics.mcp_startup_ms >= 0
+
+
+@pytest.mark.asyncio
+class TestChatTurnStats:
+    async def _chat(self, client: AsyncClient, message: str, user_id: str = TEST_USER_ID):
+        resp = await client.post(
+            f"/api/{user_id}/chat",
+            json={"message": message},
+            headers=make_auth_header(user_id),
+        )
+        assert resp.status_code == 200
+        return resp.json()["data"]
+
+    async def test_turn_stored_with_assistant_message(
+        self, client: AsyncClient, session: AsyncSession
+    ):
+        await self._chat(client, "add task Buy milk")
+
+        row = (await session.exec(select(MessageStats))).one()
+        message = await session.get(Message, row.message_id)
+        assert (message.role, row.user_id, row.path) == ("assistant", TEST_USER_ID, PATH_DEV)
+        assert row.model is None and row.prompt_tokens == 0
+        assert [name for name, _, ok in json.loads(row.tools) if ok] == ["add_task"]
+        assert row.total_ms >= row.tool_ms
+
+    async def test_streamed_turn_is_recorded(self, client: AsyncClient):
+        resp = await client.post(
+            f"/api/{TEST_USER_ID}/chat/stream",
+            json={"message": "show my tasks"},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 200
+        stats = turn_stats.stats()
+        assert stats["turns"] == 1
+        assert stats["tools"]["list_tasks"]["calls"] == 1
+
+    async def test_metrics_endpoints(self, client: AsyncClient, monkeypatch):
+        await self._chat(client, "add task Buy milk")
+        await self._chat(client, "hello")
+        await self._chat(client, "add task Walk dog", user_id=TEST_USER_ID_2)
+
+        # Worker-wide totals span all users: operators only
+        resp = await client.get("/api/metrics", headers=make_auth_header())
+        assert resp.status_code == 403
+        assert resp.json()["detail"]["error"]["code"] == "FORBIDDEN"
+
+        monkeypatch.setattr(settings, "metrics_operator_ids", f"other, {TEST_USER_ID}")
+        resp = await client.get("/api/metrics", headers=make_auth_header())
+        assert resp.status_code == 200
+        chat_turns = resp.json()["data"]["chat_turns"]
+        assert chat_turns["turns"] == 3
+        assert chat_turns["by_path"][PATH_DEV]["turns"] == 3
+        assert chat_turns["tools"]["add_task"]["calls"] == 2
+
+        # Per-user aggregates only cover the caller's turns
+        resp = await client.get("/api/metrics/chat", headers=make_auth_header())
+        assert resp.status_code == 200
+        mine = resp.json()["data"]
+        assert mine["turns"] == 2
+        assert list(mine["tools"]) == ["add_task"]
+        assert (mine["tools"]["add_task"]["calls"], mine["tools"]["add_task"]["errors"]) == (1, 0)
+
+        resp = await client.get("/api/metrics/chat?hours=0", headers=make_auth_header())
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestUserSummary:
+    async def test_aggregates_window_by_path_and_tool(self, session: AsyncSession):
+        now = datetime.utcnow()
+        turns = [
+            (now, TurnMetrics(
+                path=PATH_LLM, model_calls=2, prompt_tokens=300, completion_tokens=40,
+                model_ms=800, total_ms=1000,
+                tools=[ToolTiming("list_tasks", 50, True), ToolTiming("complete_task", 30, False)],
+            )),
+            (now, TurnMetrics(
+                path=PATH_LLM, model_calls=1, prompt_tokens=100, completion_tokens=20,
+                model_ms=400, total_ms=600, tools=[ToolTiming("list_tasks", 70, True)],
+            )),
+            # Outside the window
+            (now - timedelta(days=2), TurnMetrics(path=PATH_DEV, total_ms=5)),
+        ]
+        for created_at, metrics in turns:
+            # SQLite does not enforce the message foreign key
+            row = stats_row(uuid.uuid4(), TEST_USER_ID, metrics)
+            row.created_at = created_at
+            session.add(row)
+        await session.commit()
+
+        summary = await user_summary(session, TEST_USER_ID, now - timedelta(hours=1))
+        assert (summary["turns"], summary["prompt_tokens"]) == (2, 400)
+        llm = summary["by_path"][PATH_LLM]
+        assert (llm["model_calls"], llm["avg_total_ms"], llm["max_total_ms"]) == (3, 800.0, 1000)
+        assert summary["tools"]["list_tasks"] == {
+            "calls": 2, "errors": 0, "avg_ms": 60.0, "max_ms": 70,
+        }
+        assert summary["tools"]["complete_task"]["errors"] == 1
+        assert (await user_summary(session, TEST_USER_ID_2, now))["turns"] == 0
@@ -0,0 +1,178 @@
+"""Unit tests for the LLM circuit breaker (agents/circuit_breaker.py)."""
+
+import contextlib
+
+import pytest
+from agents import Runner
+
+from app.agents import task_agent
+from app.agents.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.config import settings
+from tests.conftest import TEST_USER_ID
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **overrides) -> CircuitBreaker:
+    options = {
+        "window_seconds": 60,
+        "min_calls": 4,
+        "failure_rate": 0.5,
+        "slow_call_seconds": 5,
+        "open_seconds": 30,
+    }
+    return CircuitBreaker("llm", clock=clock, **{**options, **overrides})
+
+
+class TestCircuitBreaker:
+    def test_opens_at_failure_rate(self):
+        breaker = _breaker(FakeClock())
+        breaker.record_success(0.1)
+        breaker.record_failure(TimeoutError())
+        breaker.record_success(0.1)
+        assert breaker.state == "closed"
+        breaker.record_failure(TimeoutError())
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert breaker.stats()["short_circuited"] == 1
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = _breaker(FakeClock())
+        for _ in range(4):
+            breaker.record_success(6.0)
+        assert breaker.state == "open"
+        assert breaker.stats()["slow_calls"] == 4
+
+    def test_old_outcomes_leave_the_window(self):
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 61
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_success_closes(self):
+        clock = FakeClock()
+        breaker = _breaker(clock, min_calls=1)
+        breaker.record_failure()
+        clock.now += 31
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+        # Only one probe at a time
+        assert not breaker.allow()
+        breaker.record_success(0.1)
+        assert breaker.state == "closed"
+        assert [(t["from"], t["to"]) for t in breaker.stats()["transitions"]] == [
+            ("closed", "open"), ("open", "half_open"), ("half_open", "closed"),
+        ]
+
+    def test_half_open_probe_failure_reopens(self):
+        clock = FakeClock()
+        breaker = _breaker(clock, min_calls=1)
+        breaker.record_failure()
+        clock.now += 31
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+    def test_cancelled_probe_lets_the_next_call_probe(self):
+        clock = FakeClock()
+        breaker = _breaker(clock, min_calls=1)
+        breaker.record_failure()
+        clock.now += 31
+        assert breaker.allow()
+        breaker.record_cancelled()
+        assert breaker.allow()
+
+
+@pytest.mark.asyncio
+class TestRunAgentBreaker:
+    """task_agent.run_agent with a key configured and a failing provider."""
+
+    @pytest.fixture(autouse=True)
+    def failing_provider(self, monkeypatch):
+        calls = []
+
+        async def failing_run(agent, input, run_config, **kwargs):
+            calls.append(input)
+            raise ConnectionError("provider down")
+
+        monkeypatch.setattr(task_agent, "_has_openai_key", lambda: True)
+        monkeypatch.setattr(task_agent, "_get_model", lambda: "test-model")
+        monkeypatch.setattr(settings, "mcp_transport", "inprocess")
+        monkeypatch.setattr(settings, "intent_router_enabled", False)
+        monkeypatch.setattr(Runner, "run", failing_run)
+        monkeypatch.setattr(
+            task_agent, "_llm_breaker", _breaker(FakeClock(), min_calls=2)
+        )
+        return calls
+
+    async def _run(self, text: str):
+        return await task_agent.run_agent(
+            [{"role": "user", "content": f"[user_id: {TEST_USER_ID}] {text}"}],
+            TEST_USER_ID,
+        )
+
+    async def test_open_circuit_uses_local_agent(self, failing_provider):
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await self._run("what should I do today")
+        assert task_agent.llm_breaker_stats()["state"] == "open"
+
+        reply = await self._run("what should I do today")
+        assert reply.final_output.startswith("⚠️")
+        added = await self._run("add task Buy milk")
+        assert "Buy milk" in added.final_output
+        assert len(failing_provider) == 2
+
+    async def test_fail_fast_mode(self, failing_provider, monkeypatch):
+        monkeypatch.setattr(settings, "llm_breaker_fallback", "fail")
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await self._run("hello")
+        with pytest.raises(CircuitOpenError):
+            await self._run("hello")
+        assert len(failing_provider) == 2
+
+    async def test_lease_failure_releases_half_open_probe(
+        self, failing_provider, monkeypatch
+    ):
+        clock = FakeClock()
+        breaker = _breaker(clock, min_calls=2)
+        monkeypatch.setattr(task_agent, "_llm_breaker", breaker)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await self._run("hello")
+        clock.now += 31
+
+        @contextlib.asynccontextmanager
+        async def no_server(user_id):
+            raise TimeoutError("no MCP server available")
+            yield
+
+        with monkeypatch.context() as patched:
+            patched.setattr(task_agent, "_lease_mcp_server", no_server)
+            with pytest.raises(TimeoutError):
+                await self._run("hello")
+            events = task_agent.run_agent_streamed(
+                [{"role": "user", "content": f"[user_id: {TEST_USER_ID}] hello"}],
+                TEST_USER_ID,
+            )
+            with pytest.raises(TimeoutError):
+                async for _ in events:
+                    pass
+
+        # The probe was released, so the provider is tried again
+        assert breaker.state == "half_open"
+        with pytest.raises(ConnectionError):
+            await self._run("hello")
+        assert len(failing_provider) == 3
+        assert breaker.state == "open"
@@ -0,0 +1,75 @@
+"""Unit tests for the per-conversation chat history cache."""
+
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.services.history_cache import CachedMessage, HistoryCache
+
+T0 = datetime(2026, 1, 1, 12, 0)
+S1 = T0 + timedelta(days=1)
+S2 = S1 + timedelta(seconds=1)
+
+
+def _message(i: int) -> CachedMessage:
+    return CachedMessage("user", f"m{i}", 10, T0 + timedelta(minutes=i))
+
+
+def _cache(**overrides) -> HistoryCache:
+    options = {
+        "max_conversations": 10,
+        "messages_per_conversation": 3,
+        "ttl_seconds": 60,
+    }
+    return HistoryCache(**{**options, **overrides})
+
+
+class TestHistoryCache:
+    """services/history_cache.py — ring buffers, stamps, LRU, TTL."""
+
+    def test_append_moves_stamp(self):
+        cache, conv = _cache(), uuid.uuid4()
+        cache.seed(conv, S1, [_message(1), _message(0)], floor=None)
+        cache.append(conv, [_message(2)], previous=S1, stamp=S2)
+        assert cache.get(conv, S2, None) == [_message(2), _message(1), _message(0)]
+        # A conversation row still at the old stamp means the buffer is ahead
+        assert cache.get(conv, S1, None) is None
+
+    def test_append_after_foreign_write_drops_buffer(self):
+        cache, conv = _cache(), uuid.uuid4()
+        cache.seed(conv, S2, [_message(0)], floor=None)
+        cache.append(conv, [_message(1)], previous=S1, stamp=S2)
+        assert cache.get(conv, S2, None) is None
+        assert cache.stats()["stale"] == 1
+
+    def test_ring_overflow_misses_older_windows(self):
+        cache, conv = _cache(), uuid.uuid4()
+        cache.seed(conv, S1, [_message(i) for i in reversed(range(5))], floor=None)
+        # m0 and m1 were dropped: only windows after m1 can be served
+        assert cache.get(conv, S1, None) is None
+        assert cache.get(conv, S1, _message(0).created_at) is None
+        assert cache.get(conv, S1, _message(1).created_at) == [
+            _message(4), _message(3), _message(2),
+        ]
+
+    def test_least_recently_used_conversation_evicted(self):
+        cache = _cache(max_conversations=2)
+        a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cache.seed(a, S1, [], floor=None)
+        cache.seed(b, S1, [], floor=None)
+        assert cache.get(a, S1, None) == []
+        cache.seed(c, S1, [], floor=None)
+        assert cache.get(b, S1, None) is None
+        assert cache.get(a, S1, None) == []
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_miss(self):
+        cache, conv = _cache(ttl_seconds=0.01), uuid.uuid4()
+        cache.seed(conv, S1, [_message(0)], floor=None)
+        time.sleep(0.02)
+        assert cache.get(conv, S1, None) is None
+
+    def test_disabled_cache_stores_nothing(self):
+        cache, conv = _cache(max_conversations=0), uuid.uuid4()
+        cache.seed(conv, S1, [_message(0)], floor=None)
+        assert cache.get(conv, S1, None) is None
@@ -0,0 +1,187 @@
+"""Tests for Idempotency-Key replay (services/idempotency.py)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Response
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.idempotency import IdempotencyRecord
+from app.models.task import Task
+from app.schemas.chat import ChatResponse
+from app.services import chat_service
+from app.services.idempotency import IdempotencyError, IdempotencyStore, idempotency_store
+from tests.conftest import TEST_USER_ID, TEST_USER_ID_2, make_auth_header
+
+
+def _store(**overrides) -> IdempotencyStore:
+    options = {
+        "max_entries": 100,
+        "ttl_seconds": 3600,
+        "pending_timeout_seconds": 60,
+    }
+    return IdempotencyStore(**{**options, **overrides})
+
+
+class _Handler:
+    """Counts calls; each returns a distinct JSON body."""
+
+    def __init__(self, status_code: int = 201, delay: float = 0) -> None:
+        self.calls = 0
+        self.status_code = status_code
+        self.delay = delay
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return Response(
+            content=f'{{"n":{self.calls}}}',
+            status_code=self.status_code,
+            media_type="application/json",
+        )
+
+
+@pytest.mark.asyncio
+class TestIdempotencyStore:
+    async def test_retry_gets_stored_response(self):
+        store, handler = _store(), _Handler()
+        first = await store.run(TEST_USER_ID, "k1", "fp", handler)
+        retry = await store.run(TEST_USER_ID, "k1", "fp", handler)
+        assert handler.calls == 1
+        assert (retry.status_code, retry.body) == (201, first.body)
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        # Keys are per user
+        await store.run(TEST_USER_ID_2, "k1", "fp", handler)
+        assert handler.calls == 2
+
+    async def test_concurrent_duplicate_waits_for_original(self):
+        store, handler = _store(), _Handler(delay=0.05)
+        first, second = await asyncio.gather(
+            store.run(TEST_USER_ID, "k1", "fp", handler),
+            store.run(TEST_USER_ID, "k1", "fp", handler),
+        )
+        assert handler.calls == 1
+        assert first.body == second.body
+        assert store.stats()["waited"] == 1
+
+    async def test_failed_original_releases_the_key(self, session: AsyncSession):
+        store, failing = _store(), _Handler(status_code=503)
+        await store.run(TEST_USER_ID, "k1", "fp", failing)
+        assert (await session.exec(select(IdempotencyRecord))).all() == []
+
+        handler = _Handler()
+        await store.run(TEST_USER_ID, "k1", "fp", handler)
+        assert handler.calls == 1
+
+    async def test_key_reused_for_other_request(self):
+        store = _store()
+        await store.run(TEST_USER_ID, "k1", "fp", _Handler())
+        with pytest.raises(IdempotencyError) as rejected:
+            await store.run(TEST_USER_ID, "k1", "other", _Handler())
+        assert rejected.value.status_code == 422
+
+    async def test_table_serves_keys_evicted_from_memory(self):
+        store, handler = _store(max_entries=1), _Handler()
+        first = await store.run(TEST_USER_ID, "k1", "fp", handler)
+        await store.run(TEST_USER_ID, "k2", "fp", handler)
+        assert store.stats()["evictions"] == 1
+
+        # Also what another worker (its own memory) sees
+        for worker in (store, _store()):
+            replay = await worker.run(TEST_USER_ID, "k1", "fp", handler)
+            assert replay.body == first.body
+        assert handler.calls == 2
+
+    async def test_claim_in_another_worker(self, session: AsyncSession):
+        session.add(IdempotencyRecord(
+            user_id=TEST_USER_ID,
+            key="k1",
+            fingerprint="fp",
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+        ))
+        await session.commit()
+        with pytest.raises(IdempotencyError) as rejected:
+            await _store().run(TEST_USER_ID, "k1", "fp", _Handler())
+        assert (rejected.value.status_code, rejected.value.retry_after) == (409, 1)
+
+        # A claim older than the pending timeout was abandoned
+        handler = _Handler()
+        await _store(pending_timeout_seconds=0).run(TEST_USER_ID, "k1", "fp", handler)
+        assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+class TestIdempotentEndpoints:
+    async def test_create_task_retry_creates_one_task(
+        self, client: AsyncClient, session: AsyncSession
+    ):
+        headers = {**make_auth_header(), "Idempotency-Key": "create-1"}
+        first = await client.post("/api/tasks", json={"title": "Once"}, headers=headers)
+        retry = await client.post("/api/tasks", json={"title": "Once"}, headers=headers)
+        assert first.status_code == retry.status_code == 201
+        assert first.json() == retry.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert len((await session.exec(select(Task))).all()) == 1
+
+        reused = await client.post("/api/tasks", json={"title": "Twice"}, headers=headers)
+        assert reused.status_code == 422
+        assert reused.json()["detail"]["error"]["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    async def test_unsaved_response_keeps_key_reserved(
+        self, client: AsyncClient, session: AsyncSession, monkeypatch
+    ):
+        async def failing_complete(user_id, key, stored):
+            raise OSError("database unavailable")
+
+        monkeypatch.setattr(idempotency_store, "_complete", failing_complete)
+        headers = {**make_auth_header(), "Idempotency-Key": "create-1"}
+        first = await client.post("/api/tasks", json={"title": "Once"}, headers=headers)
+        assert first.status_code == 201
+
+        retry = await client.post("/api/tasks", json={"title": "Once"}, headers=headers)
+        assert retry.status_code == 409
+        assert retry.json()["detail"]["error"]["code"] == "IDEMPOTENCY_KEY_IN_USE"
+        assert len((await session.exec(select(Task))).all()) == 1
+        assert idempotency_store.stats()["save_failures"] == 1
+
+        # The claim stays in the table, so other workers refuse it too
+        record = (await session.exec(select(IdempotencyRecord))).one()
+        assert record.status_code is None
+        with pytest.raises(IdempotencyError) as rejected:
+            await _store().run(TEST_USER_ID, "create-1", record.fingerprint, _Handler())
+        assert rejected.value.status_code == 409
+
+    async def test_invalid_key(self, client: AsyncClient):
+        resp = await client.post(
+            "/api/tasks",
+            json={"title": "Bad key"},
+            headers={**make_auth_header(), "Idempotency-Key": "x" * 256},
+        )
+        assert resp.status_code == 400
+
+    async def test_concurrent_chat_retry_runs_the_turn_once(
+        self, client: AsyncClient, monkeypatch
+    ):
+        calls = []
+
+        async def slow_handle_chat(user_id, message, conversation_id, session):
+            calls.append(message)
+            await asyncio.sleep(0.05)
+            return ChatResponse(
+                conversation_id="00000000-0000-0000-0000-000000000001",
+                response=f"reply {len(calls)}",
+                tool_calls=[],
+            )
+
+        monkeypatch.setattr(chat_service, "handle_chat", slow_handle_chat)
+        headers = {**make_auth_header(), "Idempotency-Key": "turn-1"}
+        first, second = await asyncio.gather(*(
+            client.post(f"/api/{TEST_USER_ID}/chat", json={"message": "hi"}, headers=headers)
+            for _ in range(2)
+        ))
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert calls == ["hi"]
@@ -0,0 +1,195 @@
+"""Precision corpus for the fast-path intent router (agents/intent_router.py).
+
+Every message the router would answer without the LLM must be classified
+exactly right; anything doubtful must be left to the agent. Extend the
+corpus whenever a phrasing is misrouted.
+"""
+
+import pytest
+
+from app.agents import task_agent
+from app.agents.intent_router import IntentRouterStats, classify
+from app.config import settings
+from tests.conftest import TEST_USER_ID
+
+ID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+
+# (message, expected (intent, args) when routed, or None when the agent must answer)
+CORPUS = [
+    # list
+    ("show my tasks", ("list_tasks", {})),
+    ("Show my tasks", ("list_tasks", {})),
+    ("show me my tasks", ("list_tasks", {})),
+    ("show all my tasks", ("list_tasks", {})),
+    ("list my tasks", ("list_tasks", {})),
+    ("list tasks", ("list_tasks", {})),
+    ("view my todo list", ("list_tasks", {})),
+    ("what are my tasks?", None),
+    ("what are my tasks", ("list_tasks", {})),
+    ("what's on my to-do list", ("list_tasks", {})),
+    ("my tasks", ("list_tasks", {})),
+    ("please show my tasks", ("list_tasks", {})),
+    ("show my tasks please", ("list_tasks", {})),
+    ("show my tasks, thanks!", ("list_tasks", {})),
+    ("show my completed tasks", ("list_tasks", {"status": "completed"})),
+    ("show my done tasks", ("list_tasks", {"status": "completed"})),
+    ("list my pending tasks", ("list_tasks", {"status": "pending"})),
+    ("show my open tasks", ("list_tasks", {"status": "pending"})),
+    ("show my tasks due tomorrow", None),
+    ("show my high priority tasks", None),
+    ("show my tasks about groceries", None),
+    ("show the task about groceries", None),
+    ("how many tasks do I have", None),
+    ("do I have any tasks", None),
+    # add
+    ("add task Buy milk", ("add_task", {"title": "Buy milk"})),
+    ("Add task: Call Mom", ("add_task", {"title": "Call Mom"})),
+    ("add a task called Renew passport", ("add_task", {"title": "Renew passport"})),
+    ("add a new task to water the plants", None),
+    ("add a task for tomorrow", None),
+    ("create task Pay rent", ("add_task", {"title": "Pay rent"})),
+    ("create a task \"Book dentist\"", ("add_task", {"title": "Book dentist"})),
+    ("new task: Email Sam", ("add_task", {"title": "Email Sam"})),
+    ("add todo buy bread and milk", ("add_task", {"title": "buy bread and milk"})),
+    ("please add task Walk the dog", ("add_task", {"title": "Walk the dog"})),
+    ("add eggs to my list", ("add_task", {"title": "eggs"})),
+    ("add Call the bank to my tasks", ("add_task", {"title": "Call the bank"})),
+    ("add task buy milk and show my tasks", None),
+    ("add task buy milk then delete the old one", None),
+    ("add task buy milk; call mom", None),
+    ("add task buy milk?", None),
+    ("add a description to task 3", None),
+    ("add a due date to the groceries task", None),
+    ("add buy milk", None),
+    ("can you add something for tomorrow", None),
+    ("remind me to buy milk tomorrow", None),
+    ("make it urgent", None),
+    ("create a new list for work", None),
+    # complete
+    (f"complete {ID}", ("complete_task", {"task_id": ID})),
+    (f"complete task {ID}", ("complete_task", {"task_id": ID})),
+    (f"mark {ID} as done", ("complete_task", {"task_id": ID})),
+    (f"mark task {ID} complete", ("complete_task", {"task_id": ID})),
+    (f"finish task {ID.upper()}", ("complete_task", {"task_id": ID})),
+    (f"task {ID} is done", ("complete_task", {"task_id": ID})),
+    ("complete the groceries task", None),
+    ("mark buy milk as done", None),
+    ("I'm done with the dentist", None),
+    ("complete all my tasks", None),
+    (f"don't complete {ID}", None),
+    (f"complete {ID} tomorrow", None),
+    # delete
+    (f"delete {ID}", ("delete_task", {"task_id": ID})),
+    (f"delete task {ID}", ("delete_task", {"task_id": ID})),
+    (f"remove task {ID}", ("delete_task", {"task_id": ID})),
+    ("delete all tasks", None),
+    ("delete my completed tasks", None),
+    ("remove the milk task", None),
+    (f"delete {ID} and {ID}", None),
+    (f"should I delete {ID}?", None),
+    # other
+    ("hello", None),
+    ("help", None),
+    ("rename task 2 to Pay bills", None),
+    (f"update {ID} title to Pay bills", None),
+    ("what's the weather", None),
+    ("thanks!", None),
+]
+
+
+def _routed(message: str):
+    match = classify(message)
+    if match is None or match.confidence < settings.intent_router_threshold:
+        return None
+    return match.intent, match.args
+
+
+class TestPrecisionCorpus:
+    @pytest.mark.parametrize("message, expected", CORPUS)
+    def test_routing_decision(self, message, expected):
+        assert _routed(message) == expected
+
+    def test_precision_and_coverage(self):
+        routed = [(m, e) for m, e in CORPUS if _routed(m) is not None]
+        correct = [m for m, e in routed if _routed(m) == e]
+        assert len(correct) / len(routed) == 1.0
+        # Most simple commands in the corpus should skip the LLM
+        routable = [m for m, e in CORPUS if e is not None]
+        assert len(routed) / len(routable) >= 0.9
+
+
+class TestWeakMatches:
+    """Keyword matches stay available to the dev agent, below the threshold."""
+
+    def test_dev_keywords_still_classified(self):
+        assert classify("add buy milk").intent == "add_task"
+        assert classify("add buy milk").args == {"title": "buy milk"}
+        assert classify("complete the groceries task").intent == "complete_task"
+        assert classify("hello").intent == "greeting"
+        assert classify("what's the weather") is None
+
+
+class TestIntentRouterStats:
+    def test_counts_per_intent(self):
+        stats = IntentRouterStats()
+        stats.record(classify("show my tasks"), routed=True)
+        stats.record(classify("add buy milk"), routed=False)
+        stats.record(None, routed=False)
+        assert stats.stats() == {
+            "messages": 3,
+            "routed": 1,
+            "route_rate": 1 / 3,
+            "routed_by_intent": {"list_tasks": 1},
+            "below_threshold_by_intent": {"add_task": 1},
+            "unmatched": 1,
+        }
+
+
+@pytest.mark.asyncio
+class TestFastPath:
+    """task_agent.run_agent with a key configured: routed turns skip the LLM."""
+
+    @pytest.fixture(autouse=True)
+    def production_agent(self, monkeypatch):
+        monkeypatch.setattr(task_agent, "_has_openai_key", lambda: True)
+
+        def no_llm():
+            raise AssertionError("the LLM must not be called")
+
+        monkeypatch.setattr(task_agent, "_get_model", no_llm)
+
+    async def test_simple_command_answered_by_tool(self):
+        content = f"[user_id: {TEST_USER_ID}] add task Buy milk"
+        result = await task_agent.run_agent(
+            [{"role": "user", "content": content}], TEST_USER_ID
+        )
+        assert "Buy milk" in result.final_output
+        assert result.tool_calls == [
+            {"tool": "add_task", "args": {"user_id": TEST_USER_ID, "title": "Buy milk"}}
+        ]
+
+        listed = await task_agent.run_agent(
+            [{"role": "user", "content": "show my tasks"}], TEST_USER_ID
+        )
+        assert "Buy milk" in listed.final_output
+
+    async def test_ambiguous_command_goes_to_agent(self):
+        with pytest.raises(AssertionError, match="LLM"):
+            await task_agent.run_agent(
+                [{"role": "user", "content": "add task milk and show my tasks"}],
+                TEST_USER_ID,
+            )
+
+    async def test_disabled_router_goes_to_agent(self, monkeypatch):
+        monkeypatch.setattr(settings, "intent_router_enabled", False)
+        with pytest.raises(AssertionError, match="LLM"):
+            await task_agent.run_agent(
+                [{"role": "user", "content": "show my tasks"}], TEST_USER_ID
+            )
+
+    async def test_tool_failure_reported_without_agent(self):
+        result = await task_agent.run_agent(
+            [{"role": "user", "content": f"delete task {ID}"}], TEST_USER_ID
+        )
+        assert result.final_output.startswith("❌")
+        assert result.tool_calls == []
@@ -0,0 +1,83 @@
+"""Unit tests for the shared OpenAI client registry (agents/llm_clients.py)."""
+
+import asyncio
+
+import pytest
+
+from app.agents.llm_clients import OpenAIClientRegistry
+
+
+class FakeProvider:
+    """Minimal keep-alive HTTP server answering GET /v1/models."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+
+    async def __aenter__(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def __aexit__(self, *exc) -> None:
+        self.server.close()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        body = b'{"object": "list", "data": []}'
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    b"content-length: %d\r\n\r\n%s" % (len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.asyncio
+class TestOpenAIClientRegistry:
+    async def test_one_client_per_provider(self):
+        registry = OpenAIClientRegistry()
+        try:
+            a = registry.client("key", "http://provider-a/v1")
+            assert registry.client("key", "http://provider-a/v1") is a
+            assert registry.client("key", "http://provider-b/v1") is not a
+            model = registry.model("gpt-4o-mini", "key", "http://provider-a/v1")
+            assert registry.model("gpt-4o-mini", "key", "http://provider-a/v1") is model
+            assert model._client is a
+        finally:
+            await registry.close()
+
+    async def test_requests_reuse_kept_alive_connection(self):
+        provider = FakeProvider()
+        registry = OpenAIClientRegistry(max_connections=4, http2=False)
+        try:
+            async with provider as base_url:
+                client = registry.client("key", base_url)
+                for _ in range(3):
+                    await client.models.list()
+                stats = registry.stats()
+        finally:
+            await registry.close()
+
+        assert provider.requests == 3
+        assert provider.connections == 1
+        assert stats["requests"] == 3
+        assert stats["max_connections"] == 4
+        [pool] = stats["providers"]
+        assert pool["base_url"] == base_url + "/"
+        assert (pool["connections"], pool["idle"], pool["active"]) == (1, 1, 0)
+
+    async def test_close_drops_clients(self):
+        registry = OpenAIClientRegistry()
+        client = registry.client("key")
+        await registry.close()
+        assert client._client.is_closed
+        assert registry.stats()["providers"] == []
+        assert registry.client("key") is not client
+        await registry.close()
@@ -0,0 +1,64 @@
+"""Unit tests for the in-process MCP transport (agents/mcp_inprocess.py).
+
+The reference is the same FastMCP server reached through an MCP client
+session over memory streams — the protocol path stdio also takes.
+"""
+
+import json
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.agents.mcp_inprocess import InProcessMCPServer
+from app.agents.mcp_pool import UserScopedServer
+from app.mcp_server.task_tools import mcp
+from app.services import task_service
+from tests.conftest import TEST_USER_ID, TEST_USER_ID_2, test_engine
+
+
+def _comparable(result) -> dict:
+    return result.model_dump(exclude={"meta"})
+
+
+@pytest.mark.asyncio
+class TestInProcessMCPServer:
+    async def test_lists_same_tools_as_protocol_server(self):
+        server = InProcessMCPServer(mcp)
+        async with create_connected_server_and_client_session(mcp) as client:
+            expected = (await client.list_tools()).tools
+        tools = await server.list_tools()
+        assert [t.model_dump() for t in tools] == [t.model_dump() for t in expected]
+        assert {t.name for t in tools} >= {"add_task", "list_tasks", "complete_task"}
+
+    @pytest.mark.parametrize(
+        "tool_name, arguments",
+        [
+            ("add_task", {"user_id": TEST_USER_ID, "title": ""}),
+            ("list_tasks", {"user_id": TEST_USER_ID}),
+            ("complete_task", {"user_id": TEST_USER_ID, "task_id": "not-a-uuid"}),
+            ("list_tasks", {}),
+            ("no_such_tool", {"user_id": TEST_USER_ID}),
+        ],
+    )
+    async def test_results_match_protocol_server(self, tool_name, arguments):
+        server = InProcessMCPServer(mcp)
+        async with create_connected_server_and_client_session(mcp) as client:
+            expected = await client.call_tool(tool_name, arguments)
+        result = await server.call_tool(tool_name, arguments)
+        assert result.isError == expected.isError
+        if not expected.isError:
+            assert _comparable(result) == _comparable(expected)
+
+    async def test_tool_writes_share_the_api_database(self):
+        server = UserScopedServer(InProcessMCPServer(mcp), TEST_USER_ID)
+        result = await server.call_tool(
+            "add_task", {"user_id": TEST_USER_ID_2, "title": "From the agent"}
+        )
+        assert json.loads(result.content[0].text)["success"] is True
+
+        async with AsyncSession(test_engine) as session:
+            tasks = await task_service.list_tasks(session, TEST_USER_ID)
+            others = await task_service.list_tasks(session, TEST_USER_ID_2)
+        assert [t.title for t in tasks] == ["From the agent"]
+        assert others == []
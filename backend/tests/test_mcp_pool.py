@@ -0,0 +1,142 @@
+"""Unit tests for the warm MCP server pool (agents/mcp_pool.py)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents.mcp import MCPServer
+
+from app.agents.mcp_pool import MCPPoolTimeoutError, MCPServerPool
+
+
+class FakeServer(MCPServer):
+    """In-memory MCP server that echoes tool arguments."""
+
+    instances: list["FakeServer"] = []
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.connected = False
+        self.cleaned_up = False
+        self.healthy = True
+        self.session = SimpleNamespace(send_ping=self._ping)
+        FakeServer.instances.append(self)
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    async def connect(self):
+        self.connected = True
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+    async def _ping(self):
+        if not self.healthy:
+            raise ConnectionError("server gone")
+
+    async def list_tools(self, run_context=None, agent=None):
+        return []
+
+    async def call_tool(self, tool_name, arguments, meta=None):
+        if not self.healthy:
+            raise ConnectionError("server gone")
+        return {"tool": tool_name, "arguments": arguments}
+
+    async def list_prompts(self):
+        return []
+
+    async def get_prompt(self, name, arguments=None):
+        return None
+
+
+@pytest.fixture
+def fake_servers():
+    FakeServer.instances = []
+    return FakeServer.instances
+
+
+async def _started(size: int, **kwargs) -> MCPServerPool:
+    pool = MCPServerPool(FakeServer, size, restart_backoff=0.01, **kwargs)
+    await pool.start()
+    for _ in range(100):
+        if pool.stats()["idle"] == size:
+            break
+        await asyncio.sleep(0.01)
+    return pool
+
+
+@pytest.mark.asyncio
+class TestMCPServerPool:
+    """Leases reuse warm servers, enforce the lease user, and self-heal."""
+
+    async def test_leases_reuse_servers(self, fake_servers):
+        pool = await _started(2)
+        for _ in range(5):
+            async with pool.lease("u1") as server:
+                await server.call_tool("list_tasks", {})
+        assert len(fake_servers) == 2
+        assert pool.stats()["leases"] == 5
+        await pool.close()
+        assert all(s.cleaned_up for s in fake_servers)
+
+    async def test_tool_calls_act_as_lease_user(self, fake_servers):
+        pool = await _started(1)
+        async with pool.lease("alice") as server:
+            result = await server.call_tool(
+                "delete_task", {"user_id": "mallory", "task_id": "t1"}
+            )
+        assert result["arguments"] == {"user_id": "alice", "task_id": "t1"}
+        with pytest.raises(RuntimeError):
+            await server.call_tool("list_tasks", {})
+        await pool.close()
+
+    async def test_concurrent_leases_are_exclusive(self, fake_servers):
+        pool = await _started(2)
+        held: set[int] = set()
+
+        async def chat(user: str) -> None:
+            async with pool.lease(user) as server:
+                key = id(server._server)
+                assert key not in held
+                held.add(key)
+                await asyncio.sleep(0.01)
+                held.discard(key)
+
+        await asyncio.gather(*(chat(f"u{i}") for i in range(8)))
+        assert pool.stats()["in_use"] == 0
+        assert len(fake_servers) == 2
+        await pool.close()
+
+    async def test_acquire_timeout(self, fake_servers):
+        pool = await _started(1, acquire_timeout=0.05)
+        async with pool.lease("u1"):
+            with pytest.raises(MCPPoolTimeoutError):
+                async with pool.lease("u2"):
+                    pass
+        assert pool.stats()["timeouts"] == 1
+        await pool.close()
+
+    async def test_crashed_server_is_replaced(self, fake_servers):
+        pool = await _started(1)
+        with pytest.raises(ConnectionError):
+            async with pool.lease("u1") as server:
+                fake_servers[0].healthy = False
+                await server.call_tool("list_tasks", {})
+        async with pool.lease("u1") as server:
+            assert (await server.call_tool("list_tasks", {}))["tool"] == "list_tasks"
+        assert fake_servers[0].cleaned_up
+        assert pool.stats()["restarts"] == 1
+        await pool.close()
+
+    async def test_health_check_restarts_idle_server(self, fake_servers):
+        pool = await _started(1, health_check_interval=0.01)
+        fake_servers[0].healthy = False
+        for _ in range(100):
+            if pool.stats()["restarts"] and pool.stats()["idle"]:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats()["failed_health_checks"] >= 1
+        assert len(fake_servers) >= 2 and fake_servers[-1].healthy
+        await pool.close()
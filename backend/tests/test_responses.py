@@ -0,0 +1,133 @@
+"""Unit tests for the orjson envelope and event-stream response paths."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from app.models.task import Task, TaskPriority, TaskRecurrence, TaskStatus
+from app.schemas.task import TaskResponse, task_response_dict
+from app.utils.responses import (
+    EventStreamResponse,
+    success_json_response,
+    success_response,
+)
+
+
+def _default_body(task: Task, meta=None) -> bytes:
+    """What the routes returned before: FastAPI's JSONResponse over model_dump."""
+    data = TaskResponse.model_validate(task).model_dump(mode="json")
+    return JSONResponse(success_response(data, meta)).body
+
+
+class TestSuccessJsonResponse:
+    """utils/responses.py — byte-identical to the default JSONResponse path."""
+
+    @pytest.mark.parametrize(
+        "title, description",
+        [
+            ("Buy groceries", None),
+            ("Café ☕ — naïve 漢字 🎉", "quotes \" and \\ backslash / slash"),
+            ("tab\tnew\nline\rcr", "\x00\x01\x1f\x7f control chars"),
+            ("   separators", "<script>&amp;</script>"),
+        ],
+    )
+    def test_strings_match_default_encoder(self, title, description):
+        task = Task(title=title, description=description, user_id="u1")
+        assert success_json_response(task_response_dict(task)).body == _default_body(task)
+
+    @pytest.mark.parametrize(
+        "due_date",
+        [
+            None,
+            datetime(2026, 3, 1),
+            datetime(2026, 3, 1, 9, 30, 15, 123456),
+            datetime(2026, 3, 1, 9, 30, 15, 1000),
+            datetime(2026, 3, 1, tzinfo=timezone.utc),
+            datetime(2026, 3, 1, 9, 30, 15, 5, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        ],
+    )
+    def test_datetimes_match_default_encoder(self, due_date):
+        task = Task(
+            title="Dated",
+            due_date=due_date,
+            recurrence=TaskRecurrence.monthly if due_date else TaskRecurrence.none,
+            user_id="u1",
+            created_at=datetime(2026, 1, 2, 3, 4, 5),
+            updated_at=datetime(2026, 1, 2, 3, 4, 5, 678),
+        )
+        assert success_json_response(task_response_dict(task)).body == _default_body(task)
+
+    def test_full_envelope_matches_default_encoder(self):
+        tasks = [
+            Task(
+                id=uuid.uuid4(),
+                title=f"Task {i}",
+                status=TaskStatus.completed,
+                priority=TaskPriority.high,
+                tags=["work", "überfällig"],
+                user_id="u1",
+            )
+            for i in range(3)
+        ]
+        meta = {"total": 3, "limit": 100, "next_cursor": None}
+        expected = JSONResponse(
+            success_response(
+                [TaskResponse.model_validate(t).model_dump(mode="json") for t in tasks],
+                meta,
+            )
+        ).body
+        actual = success_json_response(
+            [task_response_dict(t) for t in tasks], meta
+        ).body
+        assert actual == expected
+
+    def test_status_and_headers(self):
+        response = success_json_response(
+            {"id": "x"}, status_code=201, headers={"ETag": '"1-abc"'}
+        )
+        assert response.status_code == 201
+        assert response.headers["etag"] == '"1-abc"'
+        assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+class TestEventStreamResponse:
+    """utils/responses.py — SSE framing and cleanup on disconnect."""
+
+    async def test_frames_events(self):
+        async def events():
+            yield {"type": "start", "conversation_id": uuid.UUID(int=1)}
+            yield {"type": "delta", "text": "Héllo\nworld"}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await EventStreamResponse(events()).stream_response(send)
+        body = b"".join(m.get("body", b"") for m in sent[1:])
+        assert body == (
+            b'event: start\ndata: {"conversation_id":"00000000-0000-0000-0000-000000000001"}\n\n'
+            b'event: delta\ndata: {"text":"H\xc3\xa9llo\\nworld"}\n\n'
+        )
+
+    async def test_closes_events_when_client_disconnects(self):
+        closed = asyncio.Event()
+
+        async def events():
+            try:
+                while True:
+                    yield {"type": "delta", "text": "x"}
+            finally:
+                closed.set()
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                raise OSError("client went away")
+
+        with pytest.raises(OSError):
+            await EventStreamResponse(events()).stream_response(send)
+        assert closed.is_set()
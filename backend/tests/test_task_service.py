@@ -2,12 +2,15 @@
 
 import uuid
 from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.task import TaskPriority, TaskRecurrence, TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import BatchComplete, BatchRequest, TaskCreate, TaskUpdate
 from app.services import task_service
 
 # Constants matching conftest.py
@@ -168,6 +171,84 @@ class TestGetUpdateToggle:
         assert toggled is not None
         assert toggled.status == TaskStatus.pending
 
+    async def test_update_recurrence_with_stored_due_date(
+        self, session: AsyncSession
+    ):
+        """Recurrence alone is accepted when the stored task has a due date."""
+        created = await task_service.create_task(
+            session,
+            TEST_USER_ID,
+            TaskCreate(title="Dated", due_date=datetime(2026, 3, 1)),
+        )
+        updated = await task_service.update_task(
+            session,
+            TEST_USER_ID,
+            created.id,
+            TaskUpdate(recurrence=TaskRecurrence.weekly),
+        )
+        assert updated is not None
+        assert updated.recurrence == TaskRecurrence.weekly
+
+    async def test_clear_due_date_on_recurring_task_raises(
+        self, session: AsyncSession
+    ):
+        """Clearing the due date of a recurring task raises (FR-012)."""
+        created = await task_service.create_task(
+            session,
+            TEST_USER_ID,
+            TaskCreate(
+                title="Recurring",
+                due_date=datetime(2026, 3, 1),
+                recurrence=TaskRecurrence.daily,
+            ),
+        )
+        task_id = created.id
+        with pytest.raises(ValueError, match="Recurrence requires a due date"):
+            await task_service.update_task(
+                session, TEST_USER_ID, task_id, TaskUpdate(due_date=None)
+            )
+        task = await task_service.get_task(session, TEST_USER_ID, task_id)
+        assert task.due_date is not None
+
+    async def test_update_other_user_returns_none(self, session: AsyncSession):
+        """A miss returns None and leaves the version untouched."""
+        created = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Mine")
+        )
+        version = await task_service.get_list_version(session, TEST_USER_ID_2)
+        updated = await task_service.update_task(
+            session, TEST_USER_ID_2, created.id, TaskUpdate(title="Theirs")
+        )
+        assert updated is None
+        assert await task_service.toggle_task(
+            session, TEST_USER_ID_2, created.id
+        ) is None
+        assert await task_service.get_list_version(session, TEST_USER_ID_2) == version
+
+    async def test_toggle_writes_without_select_or_refresh(
+        self, session: AsyncSession
+    ):
+        """Toggle is the version bump plus one UPDATE ... RETURNING."""
+        created = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Count me")
+        )
+        task_id = created.id
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            toggled = await task_service.toggle_task(session, TEST_USER_ID, task_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert toggled.status == TaskStatus.completed
+        assert len(statements) == 2
+        assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+
 
 # ─── US3: delete_task ────────────────────────────────────────────────
 
@@ -206,3 +287,461 @@ class TestDeleteTask:
             session, TEST_USER_ID, uuid.uuid4()
         )
         assert result is False
+
+
+# ─── Due date / title filters and short IDs ──────────────────────────
+
+
+@pytest.mark.asyncio
+class TestListTaskFilters:
+    """list_tasks due_before / due_after / title_contains, and short task IDs."""
+
+    async def test_due_range_and_title_substring(self, session: AsyncSession):
+        for title, due in [
+            ("Pay rent", datetime(2026, 5, 1)),
+            ("Pay 100% of tax", datetime(2026, 6, 1)),
+            ("Call mom", datetime(2026, 5, 15)),
+            ("Pay later", None),
+        ]:
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=title, due_date=due)
+            )
+
+        may = await task_service.list_tasks(
+            session,
+            TEST_USER_ID,
+            due_after=datetime(2026, 5, 1),
+            due_before=datetime(2026, 6, 1),
+        )
+        assert {t.title for t in may} == {"Pay rent", "Call mom"}
+
+        pay = await task_service.list_tasks(session, TEST_USER_ID, title_contains="PAY")
+        assert {t.title for t in pay} == {"Pay rent", "Pay 100% of tax", "Pay later"}
+        # LIKE wildcards in the substring are matched literally
+        percent = await task_service.list_tasks(
+            session, TEST_USER_ID, title_contains="100%"
+        )
+        assert [t.title for t in percent] == ["Pay 100% of tax"]
+
+    async def test_find_task_ids_by_prefixes(self, session: AsyncSession):
+        task = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Mine")
+        )
+        prefix = task_service.short_task_id(task.id)
+        assert len(prefix) == task_service.TASK_ID_PREFIX_LENGTH
+        assert await task_service.find_task_ids_by_prefixes(
+            session, TEST_USER_ID, [prefix.upper(), "deadbeef"]
+        ) == {prefix: [task.id], "deadbeef": []}
+        assert await task_service.find_task_ids_by_prefixes(
+            session, TEST_USER_ID_2, [prefix]
+        ) == {prefix: []}
+
+
+# ─── Keyset pagination ───────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+class TestListTasksPage:
+    """list_tasks_page walks (created_at, id) keyset pages newest first."""
+
+    async def test_pages_cover_all_tasks_once(self, session: AsyncSession):
+        """Following next_cursor visits every task exactly once, in order."""
+        for i in range(5):
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=f"Task {i}")
+            )
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page, cursor = await task_service.list_tasks_page(
+                session, TEST_USER_ID, limit=2, cursor=cursor
+            )
+            seen.extend(t.title for t in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"Task {i}" for i in reversed(range(5))]
+
+    async def test_last_page_has_no_cursor(self, session: AsyncSession):
+        """An exactly-full final page does not return a dangling cursor."""
+        for i in range(2):
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=f"Task {i}")
+            )
+        page, cursor = await task_service.list_tasks_page(
+            session, TEST_USER_ID, limit=2
+        )
+        assert len(page) == 2
+        assert cursor is None
+
+    async def test_pages_respect_filters(self, session: AsyncSession):
+        """Filters apply to every page, not just the first."""
+        for i in range(4):
+            await task_service.create_task(
+                session,
+                TEST_USER_ID,
+                TaskCreate(
+                    title=f"Task {i}",
+                    priority=TaskPriority.high if i % 2 else TaskPriority.low,
+                ),
+            )
+        page, cursor = await task_service.list_tasks_page(
+            session, TEST_USER_ID, limit=1, priority=TaskPriority.high
+        )
+        page2, _ = await task_service.list_tasks_page(
+            session, TEST_USER_ID, limit=1, cursor=cursor, priority=TaskPriority.high
+        )
+        assert [t.title for t in page + page2] == ["Task 3", "Task 1"]
+
+    async def test_invalid_cursor_raises(self, session: AsyncSession):
+        """A tampered cursor is rejected with ValueError."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await task_service.list_tasks_page(
+                session, TEST_USER_ID, limit=10, cursor="not-a-cursor"
+            )
+
+
+# ─── Tag index (task_tags) ───────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+class TestTagFilters:
+    """Tag filters resolve through the task_tags side table."""
+
+    async def _titles(self, session: AsyncSession, **filters) -> list[str]:
+        tasks = await task_service.list_tasks(session, TEST_USER_ID, **filters)
+        return sorted(t.title for t in tasks)
+
+    async def test_match_all_and_any(self, session: AsyncSession):
+        """AND keeps tasks with every tag; OR keeps tasks with at least one."""
+        for title, tags in [("A", ["work", "urgent"]), ("B", ["work"]), ("C", ["home"])]:
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=title, tags=tags)
+            )
+
+        assert await self._titles(session, tags=["work"]) == ["A", "B"]
+        assert await self._titles(session, tags=["work", "urgent"]) == ["A"]
+        assert await self._titles(
+            session, tags=["urgent", "home"], match_all_tags=False
+        ) == ["A", "C"]
+
+    async def test_update_and_delete_keep_index_in_sync(self, session: AsyncSession):
+        """Retagging moves the task between filters; deleting drops it."""
+        task = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Retag", tags=["old"])
+        )
+        await task_service.update_task(
+            session, TEST_USER_ID, task.id, TaskUpdate(tags=["new", "new"])
+        )
+        assert await self._titles(session, tags=["old"]) == []
+        assert await self._titles(session, tags=["new"]) == ["Retag"]
+
+        await task_service.delete_task(session, TEST_USER_ID, task.id)
+        assert await self._titles(session, tags=["new"]) == []
+
+    async def test_tag_filter_scoped_to_user(self, session: AsyncSession):
+        """Another user's identically tagged tasks are never matched."""
+        await task_service.create_task(
+            session, TEST_USER_ID_2, TaskCreate(title="Theirs", tags=["work"])
+        )
+        assert await self._titles(session, tags=["work"]) == []
+
+
+class TestNativeTagFilter:
+    """On PostgreSQL, tag filters use JSONB operators instead of task_tags."""
+
+    def _compile(self, tags: list[str], match_all: bool) -> str:
+        pg_session = SimpleNamespace(bind=SimpleNamespace(dialect=postgresql.dialect()))
+        clause = task_service._tag_filter(pg_session, TEST_USER_ID, tags, match_all)
+        return str(clause.compile(dialect=postgresql.dialect()))
+
+    def test_match_all_uses_containment(self):
+        sql = self._compile(["work", "urgent"], match_all=True)
+        assert "@>" in sql
+        assert "task_tags" not in sql
+
+    def test_match_any_uses_has_any(self):
+        assert "?|" in self._compile(["work", "urgent"], match_all=False)
+
+
+# ─── Full-text search ────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+class TestSearchTasks:
+    """search_tasks ranks prefix matches and follows every write path."""
+
+    async def _search(self, session: AsyncSession, q: str, user_id=TEST_USER_ID):
+        tasks, _ = await task_service.search_tasks(session, user_id, q, limit=50)
+        return [t.title for t in tasks]
+
+    async def test_prefix_match_on_all_words(self, session: AsyncSession):
+        for title in ["Buy groceries", "Buy a gift", "Groom the dog"]:
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title=title))
+
+        assert sorted(await self._search(session, "gro")) == [
+            "Buy groceries",
+            "Groom the dog",
+        ]
+        assert await self._search(session, "buy GRO") == ["Buy groceries"]
+        assert await self._search(session, "nothing") == []
+        assert await self._search(session, "!!! ") == []
+
+    async def test_title_match_ranks_above_description(self, session: AsyncSession):
+        await task_service.create_task(
+            session,
+            TEST_USER_ID,
+            TaskCreate(title="Call the bank", description="Ask about the invoice"),
+        )
+        await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Invoice for March")
+        )
+        assert await self._search(session, "invoice") == [
+            "Invoice for March",
+            "Call the bank",
+        ]
+
+    async def test_scoped_to_user(self, session: AsyncSession):
+        await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Secret plan"))
+        assert await self._search(session, "secret", TEST_USER_ID_2) == []
+
+    async def test_index_follows_writes(self, session: AsyncSession):
+        task = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Draft report")
+        )
+        task_id = task.id
+        await task_service.update_task(
+            session, TEST_USER_ID, task_id, TaskUpdate(title="Final report")
+        )
+        assert await self._search(session, "draft") == []
+        assert await self._search(session, "final") == ["Final report"]
+
+        await task_service.delete_task(session, TEST_USER_ID, task_id)
+        assert await self._search(session, "report") == []
+
+    async def test_mcp_tool_writes_are_searchable(self, session: AsyncSession):
+        from app.mcp_server import task_tools
+
+        await task_tools.add_task(
+            user_id=TEST_USER_ID, title="Water plants", description="balcony"
+        )
+        assert await self._search(session, "balc") == ["Water plants"]
+
+    async def test_pages_cover_all_matches_once(self, session: AsyncSession):
+        for i in range(7):
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=f"Errand {i}")
+            )
+        seen: list[uuid.UUID] = []
+        cursor = None
+        while True:
+            page, cursor = await task_service.search_tasks(
+                session, TEST_USER_ID, "errand", limit=3, cursor=cursor
+            )
+            seen.extend(t.id for t in page)
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 7
+
+    async def test_invalid_cursor_raises(self, session: AsyncSession):
+        with pytest.raises(ValueError):
+            await task_service.search_tasks(
+                session, TEST_USER_ID, "x", limit=5, cursor="bogus"
+            )
+
+
+class TestNativeSearch:
+    """On PostgreSQL, search uses the tsvector column instead of FTS5."""
+
+    def test_uses_tsvector_and_ts_rank(self):
+        pg_session = SimpleNamespace(bind=SimpleNamespace(dialect=postgresql.dialect()))
+        query, _ = task_service._search_query(pg_session, TEST_USER_ID, ["gro", "buy"])
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert "tasks.search_vector @@ to_tsquery" in sql
+        assert "ts_rank" in sql
+        assert "tasks_fts" not in sql
+
+
+# ─── Task list version (ETag source) ─────────────────────────────────
+
+
+@pytest.mark.asyncio
+class TestListVersion:
+    """Every write bumps the owner's task list version, and only theirs."""
+
+    async def test_each_write_bumps_version(self, session: AsyncSession):
+        assert await task_service.get_list_version(session, TEST_USER_ID) == 0
+        task = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Versioned")
+        )
+        await task_service.update_task(
+            session, TEST_USER_ID, task.id, TaskUpdate(title="Renamed")
+        )
+        await task_service.toggle_task(session, TEST_USER_ID, task.id)
+        await task_service.delete_task(session, TEST_USER_ID, task.id)
+
+        assert await task_service.get_list_version(session, TEST_USER_ID) == 4
+        assert await task_service.get_list_version(session, TEST_USER_ID_2) == 0
+
+    async def test_mcp_tool_writes_bump_version(self, session: AsyncSession):
+        from app.mcp_server import task_tools
+
+        await task_tools.add_task(user_id=TEST_USER_ID, title="From chat")
+        assert await task_service.get_list_version(session, TEST_USER_ID) == 1
+
+
+# ─── Delta sync (list_changes + tombstones) ──────────────────────────
+
+
+@pytest.mark.asyncio
+class TestListChanges:
+    """list_changes returns only writes and deletions after a sequence."""
+
+    async def test_reports_updates_and_deletions_since(self, session: AsyncSession):
+        keep_id = (
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Keep"))
+        ).id
+        gone_id = (
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Gone"))
+        ).id
+        await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Untouched")
+        )
+        since = await task_service.get_list_version(session, TEST_USER_ID)
+
+        await task_service.toggle_task(session, TEST_USER_ID, keep_id)
+        await task_service.delete_task(session, TEST_USER_ID, gone_id)
+
+        changed, deleted, next_since, has_more = await task_service.list_changes(
+            session, TEST_USER_ID, since=since, limit=10
+        )
+        assert [t.title for t in changed] == ["Keep"]
+        assert [d.task_id for d in deleted] == [gone_id]
+        assert next_since == since + 2
+        assert has_more is False
+
+    async def test_pages_in_change_order(self, session: AsyncSession):
+        for i in range(3):
+            await task_service.create_task(
+                session, TEST_USER_ID, TaskCreate(title=f"Task {i}")
+            )
+        changed, _, next_since, has_more = await task_service.list_changes(
+            session, TEST_USER_ID, since=0, limit=2
+        )
+        assert [t.title for t in changed] == ["Task 0", "Task 1"]
+        assert has_more is True
+        changed, _, _, has_more = await task_service.list_changes(
+            session, TEST_USER_ID, since=next_since, limit=2
+        )
+        assert [t.title for t in changed] == ["Task 2"]
+        assert has_more is False
+
+    async def test_compacted_position_requires_resync(self, session: AsyncSession):
+        task = await task_service.create_task(
+            session, TEST_USER_ID, TaskCreate(title="Short-lived")
+        )
+        await task_service.delete_task(session, TEST_USER_ID, task.id)
+
+        removed = await task_service.compact_tombstones(session, datetime(2999, 1, 1))
+        assert removed == 1
+        with pytest.raises(task_service.ChangesExpiredError):
+            await task_service.list_changes(session, TEST_USER_ID, since=1, limit=10)
+        # Positions at or after the compacted deletion are still valid
+        await task_service.list_changes(session, TEST_USER_ID, since=2, limit=10)
+
+
+# ─── Batch mutations ─────────────────────────────────────────────────
+
+
+def _ops(*ops: dict) -> list:
+    return BatchRequest(operations=list(ops)).operations
+
+
+@pytest.mark.asyncio
+class TestApplyBatch:
+    """apply_batch runs mixed operations in one transaction."""
+
+    async def test_mixed_operations_with_per_item_results(self, session: AsyncSession):
+        done_id = (
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Done"))
+        ).id
+        drop_id = (
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Drop"))
+        ).id
+        missing_id = uuid.uuid4()
+
+        outcomes = await task_service.apply_batch(
+            session,
+            TEST_USER_ID,
+            _ops(
+                {"op": "create", "data": {"title": "New", "tags": ["batch"]}},
+                {"op": "toggle", "id": str(done_id)},
+                {"op": "update", "id": str(done_id), "data": {"title": "Done!"}},
+                {"op": "delete", "id": str(drop_id)},
+                {"op": "toggle", "id": str(missing_id)},
+            ),
+        )
+
+        assert [o.ok for o in outcomes] == [True, True, True, True, False]
+        assert outcomes[1].task.status == TaskStatus.completed
+        assert outcomes[2].task.title == "Done!"
+        assert outcomes[4].error_code == "NOT_FOUND"
+
+        titles = sorted(t.title for t in await task_service.list_tasks(session, TEST_USER_ID))
+        assert titles == ["Done!", "New"]
+        tagged = await task_service.list_tasks(session, TEST_USER_ID, tags=["batch"])
+        assert [t.title for t in tagged] == ["New"]
+        _, deleted, _, _ = await task_service.list_changes(
+            session, TEST_USER_ID, since=2, limit=10
+        )
+        assert [d.task_id for d in deleted] == [drop_id]
+
+    async def test_complete_is_idempotent_unlike_toggle(self, session: AsyncSession):
+        task_id = (
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title="Once"))
+        ).id
+        outcomes = await task_service.apply_batch(
+            session,
+            TEST_USER_ID,
+            [BatchComplete(op="complete", id=task_id), BatchComplete(op="complete", id=task_id)],
+        )
+        assert [o.ok for o in outcomes] == [True, False]
+        assert outcomes[1].error_code == "ALREADY_COMPLETED"
+        task = await task_service.get_task(session, TEST_USER_ID, task_id)
+        assert task.status == TaskStatus.completed
+
+    async def test_cannot_touch_other_users_tasks(self, session: AsyncSession):
+        theirs = (
+            await task_service.create_task(session, TEST_USER_ID_2, TaskCreate(title="Theirs"))
+        ).id
+        outcomes = await task_service.apply_batch(
+            session, TEST_USER_ID, _ops({"op": "delete", "id": str(theirs)})
+        )
+        assert outcomes[0].error_code == "NOT_FOUND"
+        assert await task_service.get_task(session, TEST_USER_ID_2, theirs) is not None
+
+    async def test_statement_count_independent_of_batch_size(
+        self, session: AsyncSession
+    ):
+        """N creates cost the same number of round trips as 2."""
+
+        async def count_statements(n: int) -> int:
+            statements: list[str] = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            engine = session.bind.sync_engine
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                await task_service.apply_batch(
+                    session,
+                    TEST_USER_ID,
+                    _ops(*({"op": "create", "data": {"title": f"T{i}"}} for i in range(n))),
+                )
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            return len(statements)
+
+        assert await count_statements(2) == await count_statements(40)
@@ -0,0 +1,249 @@
+"""Tests for the MCP task tools (mcp_server/task_tools.py)."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.mcp_server import task_tools
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.task import TaskCreate
+from app.services import task_service
+from tests.conftest import TEST_USER_ID
+
+
+async def _seed(session: AsyncSession, count: int) -> list:
+    tasks = []
+    for i in range(count):
+        tasks.append(await task_service.create_task(
+            session,
+            TEST_USER_ID,
+            TaskCreate(
+                title=f"Task {i}",
+                description="A long description " * 10,
+                priority=TaskPriority.high if i % 2 else TaskPriority.low,
+                due_date=datetime(2026, 5, 1 + i),
+            ),
+        ))
+    return tasks
+
+
+async def _call(tool, **kwargs) -> dict:
+    return json.loads(await tool(user_id=TEST_USER_ID, **kwargs))
+
+
+@pytest.mark.asyncio
+class TestListTasksTool:
+    async def test_summary_rows_and_paging(self, session: AsyncSession):
+        tasks = await _seed(session, 5)
+        first = await _call(task_tools.list_tasks, limit=3)
+        assert first["success"] is True
+        data = first["data"]
+        assert data["fields"] == ["id", "title", "status"]
+        assert data["rows"][0] == [
+            task_service.short_task_id(tasks[4].id), "Task 4", "pending",
+        ]
+        assert data["count"] == 3
+        assert "description" not in json.dumps(data)
+
+        rest = await _call(task_tools.list_tasks, limit=3, cursor=data["next_cursor"])
+        assert [row[1] for row in rest["data"]["rows"]] == ["Task 1", "Task 0"]
+        assert rest["data"]["next_cursor"] is None
+
+    async def test_filters(self, session: AsyncSession):
+        await _seed(session, 6)
+        result = await _call(
+            task_tools.list_tasks,
+            priority="high",
+            due_after="2026-05-03",
+            title_contains="task",
+        )
+        assert [row[1] for row in result["data"]["rows"]] == ["Task 5", "Task 3"]
+
+    async def test_full_view(self, session: AsyncSession):
+        await _seed(session, 1)
+        result = await _call(task_tools.list_tasks, view="full")
+        [task] = result["data"]["tasks"]
+        assert task["description"].startswith("A long description")
+        assert task["due_date"] == "2026-05-01T00:00:00"
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"limit": 0},
+            {"limit": 101},
+            {"view": "verbose"},
+            {"priority": "urgent"},
+            {"due_before": "next week"},
+            {"cursor": "garbage"},
+        ],
+    )
+    async def test_invalid_arguments(self, kwargs):
+        result = await _call(task_tools.list_tasks, **kwargs)
+        assert result["success"] is False
+
+
+@pytest.mark.asyncio
+class TestShortTaskIds:
+    async def test_complete_by_short_id(self, session: AsyncSession):
+        [task] = await _seed(session, 1)
+        result = await _call(
+            task_tools.complete_task, task_id=task_service.short_task_id(task.id)
+        )
+        assert result["success"] is True
+        assert result["data"]["id"] == str(task.id)
+
+    async def test_unknown_short_id(self):
+        result = await _call(task_tools.delete_task, task_id="deadbeef")
+        assert result == {"success": False, "error": "Task not found"}
+
+
+@pytest.mark.asyncio
+class TestCompleteAndDelete:
+    async def test_concurrent_completes_leave_task_completed(self, session: AsyncSession):
+        (task,) = await _seed(session, 1)
+        results = await asyncio.gather(*(
+            _call(task_tools.complete_task, task_id=str(task.id)) for _ in range(2)
+        ))
+        assert sorted(r["success"] for r in results) == [False, True]
+        assert any(r.get("error") == "Task is already completed" for r in results)
+        stored = await task_service.get_task(session, TEST_USER_ID, task.id)
+        assert stored.status == TaskStatus.completed
+
+    async def test_complete_missing_task(self):
+        result = await _call(
+            task_tools.complete_task, task_id="00000000-0000-0000-0000-000000000000"
+        )
+        assert result == {"success": False, "error": "Task not found"}
+
+    async def test_concurrent_deletes_report_one_deletion(self, session: AsyncSession):
+        (task,) = await _seed(session, 1)
+        results = await asyncio.gather(*(
+            _call(task_tools.delete_task, task_id=str(task.id)) for _ in range(2)
+        ))
+        assert sorted(r["success"] for r in results) == [False, True]
+        deleted = next(r for r in results if r["success"])
+        assert deleted["data"] == {"id": str(task.id), "title": "Task 0", "deleted": True}
+
+
+@pytest.mark.asyncio
+class TestBatchTools:
+    async def test_add_tasks_reports_each_item(self, session: AsyncSession):
+        result = await _call(
+            task_tools.add_tasks,
+            tasks=[
+                task_tools.NewTask(title="Milk"),
+                task_tools.NewTask(title="  "),
+                task_tools.NewTask(title="Eggs", description="a dozen"),
+            ],
+        )
+        data = result["data"]
+        assert [(r["ok"], r.get("title")) for r in data["results"]] == [
+            (True, "Milk"), (False, None), (True, "Eggs"),
+        ]
+        assert data["results"][1]["error"] == "Title is required"
+        assert (data["succeeded"], data["failed"]) == (2, 1)
+        titles = sorted(t.title for t in await task_service.list_tasks(session, TEST_USER_ID))
+        assert titles == ["Eggs", "Milk"]
+
+    async def test_complete_and_delete_many(self, session: AsyncSession):
+        tasks = await _seed(session, 3)
+        short = [task_service.short_task_id(t.id) for t in tasks]
+
+        completed = await _call(
+            task_tools.complete_tasks,
+            task_ids=[short[0], str(tasks[1].id), "deadbeef", ""],
+        )
+        assert [r["ok"] for r in completed["data"]["results"]] == [True, True, False, False]
+        assert [r.get("error") for r in completed["data"]["results"][2:]] == [
+            "Task not found", "Task ID or title is required",
+        ]
+        again = await _call(task_tools.complete_tasks, task_ids=[short[0]])
+        assert again["data"]["results"][0]["error"] == "Task is already completed"
+
+        deleted = await _call(task_tools.delete_tasks, task_ids=short[1:])
+        assert [r["title"] for r in deleted["data"]["results"]] == ["Task 1", "Task 2"]
+        remaining = await task_service.list_tasks(session, TEST_USER_ID)
+        assert [t.title for t in remaining] == ["Task 0"]
+
+    async def test_update_tasks(self, session: AsyncSession):
+        tasks = await _seed(session, 2)
+        result = await _call(
+            task_tools.update_tasks,
+            updates=[
+                task_tools.TaskChange(task_id=str(tasks[0].id), title="Renamed"),
+                task_tools.TaskChange(task_id=str(tasks[1].id)),
+            ],
+        )
+        assert [r["ok"] for r in result["data"]["results"]] == [True, False]
+        assert result["data"]["results"][0]["title"] == "Renamed"
+        assert result["data"]["results"][1]["error"] == "No fields to update"
+
+    @pytest.mark.parametrize("count", [0, 101])
+    async def test_batch_size_limits(self, count):
+        result = await _call(task_tools.delete_tasks, task_ids=["deadbeef"] * count)
+        assert result["success"] is False
+
+
+@pytest.mark.asyncio
+class TestTitleReferences:
+    """complete/delete/update_task accept a title instead of an ID."""
+
+    async def _add(self, session: AsyncSession, *titles: str) -> list:
+        return [
+            await task_service.create_task(session, TEST_USER_ID, TaskCreate(title=t))
+            for t in titles
+        ]
+
+    async def test_unique_fuzzy_match(self, session: AsyncSession):
+        passport, _ = await self._add(session, "Renew passport", "Call the dentist")
+        result = await _call(task_tools.complete_task, task_id="renew pasport")
+        assert result["success"] is True
+        assert result["data"]["id"] == str(passport.id)
+
+    async def test_loose_match_is_not_acted_on(self, session: AsyncSession):
+        (milk,) = await self._add(session, "Buy milk")
+        result = await _call(task_tools.delete_task, task_id="buy eggs")
+        assert result["success"] is False
+        assert result["error"].startswith('No task is titled "buy eggs"; closest is')
+        assert '"Buy milk"' in result["error"]
+        assert await task_service.get_task(session, TEST_USER_ID, milk.id) is not None
+
+    async def test_ambiguous_match_lists_candidates(self, session: AsyncSession):
+        await self._add(session, "Buy milk", "Buy oat milk", "Call the dentist")
+        result = await _call(task_tools.delete_task, task_id="milk")
+        assert result["success"] is False
+        assert result["error"].startswith('Several tasks match "milk"')
+        assert "Buy oat milk" in result["error"]
+        assert "dentist" not in result["error"]
+
+    async def test_exact_title_beats_longer_titles(self, session: AsyncSession):
+        milk, _ = await self._add(session, "Milk", "Buy oat milk")
+        result = await _call(task_tools.update_task, task_id="MILK!", title="Milk x2")
+        assert result["data"]["id"] == str(milk.id)
+
+    async def test_index_is_cached_until_a_write(self, session: AsyncSession, monkeypatch):
+        await self._add(session, "Buy milk", "Water plants")
+        loads = []
+        list_task_titles = task_service.list_task_titles
+
+        async def counting(*args):
+            loads.append(args[1])
+            return await list_task_titles(*args)
+
+        monkeypatch.setattr(task_service, "list_task_titles", counting)
+        await _call(task_tools.update_task, task_id="water plants", description="Twice")
+        await _call(task_tools.update_task, task_id="buy milk", description="2 litres")
+        assert len(loads) == 2  # each update_task bumps the list version
+
+        await _call(task_tools.complete_tasks, task_ids=["nothing like it"])
+        await _call(task_tools.complete_tasks, task_ids=["still nothing"])
+        assert len(loads) == 3
+
+        added = await _call(task_tools.add_tasks, tasks=[task_tools.NewTask(title="Pay rent")])
+        assert added["data"]["succeeded"] == 1
+        result = await _call(task_tools.delete_task, task_id="pay rent")
+        assert result["success"] is True
+        assert len(loads) == 4
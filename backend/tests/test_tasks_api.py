@@ -4,6 +4,8 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 
+from app.config import settings
+from app.utils.pagination import encode_cursor
 from tests.conftest import TEST_USER_ID, TEST_USER_ID_2, make_auth_header
 
 
@@ -48,6 +50,20 @@ class TestCreateTask:
         assert data["tags"] == ["work", "urgent"]
         assert data["recurrence"] == "weekly"
 
+    async def test_create_response_matches_stored_task(self, client: AsyncClient):
+        """US1: POST echoes the task as stored, even for an offset due_date."""
+        headers = make_auth_header()
+        created = await client.post(
+            "/api/tasks",
+            json={"title": "Call", "due_date": "2026-05-01T10:00:00+02:00"},
+            headers=headers,
+        )
+        assert created.status_code == 201
+        task = created.json()["data"]
+        fetched = await client.get(f"/api/tasks/{task['id']}", headers=headers)
+        assert fetched.content == created.content
+        assert task["due_date"] == "2026-05-01T08:00:00"
+
     async def test_create_task_empty_title_rejected(self, client: AsyncClient):
         """US1: Empty title → 422 validation error."""
         resp = await client.post(
@@ -109,6 +125,57 @@ class TestListTasks:
         assert len(data) == 1
         assert data[0]["title"] == "User1 task"
 
+    async def test_list_paginates_with_cursor(self, client: AsyncClient):
+        """US1: limit + next_cursor page through the list."""
+        headers = make_auth_header()
+        for i in range(3):
+            await client.post(
+                "/api/tasks", json={"title": f"Task {i}"}, headers=headers
+            )
+
+        resp = await client.get("/api/tasks?limit=2", headers=headers)
+        body = resp.json()
+        assert [t["title"] for t in body["data"]] == ["Task 2", "Task 1"]
+        assert body["meta"]["limit"] == 2
+        cursor = body["meta"]["next_cursor"]
+        assert cursor
+
+        resp = await client.get(
+            "/api/tasks", params={"limit": 2, "cursor": cursor}, headers=headers
+        )
+        body = resp.json()
+        assert [t["title"] for t in body["data"]] == ["Task 0"]
+        assert body["meta"]["next_cursor"] is None
+
+    async def test_list_unpaginated_by_default(self, client: AsyncClient):
+        """US1: Without limit/cursor every task is returned; total counts them all."""
+        headers = make_auth_header()
+        for batch in (range(100), range(100, 105)):
+            await client.post(
+                "/api/tasks/batch",
+                json={"operations": [
+                    {"op": "create", "data": {"title": f"Task {i}"}} for i in batch
+                ]},
+                headers=headers,
+            )
+
+        resp = await client.get("/api/tasks", headers=headers)
+        body = resp.json()
+        assert len(body["data"]) == 105
+        assert body["meta"] == {"total": 105, "limit": None, "next_cursor": None}
+
+        resp = await client.get("/api/tasks?limit=10", headers=headers)
+        body = resp.json()
+        assert len(body["data"]) == 10
+        assert body["meta"]["total"] == 105
+
+    async def test_list_invalid_cursor_rejected(self, client: AsyncClient):
+        """US1: Malformed cursor → 422."""
+        resp = await client.get(
+            "/api/tasks?cursor=garbage", headers=make_auth_header()
+        )
+        assert resp.status_code == 422
+
     async def test_list_no_auth(self, client: AsyncClient):
         """US1: No auth → 401/403."""
         resp = await client.get("/api/tasks")
@@ -176,6 +243,24 @@ class TestUpdateTask:
         assert resp.status_code == 200
         assert resp.json()["data"]["title"] == "New title"
 
+    async def test_update_due_date_with_offset_stored_as_utc(self, client: AsyncClient):
+        """US2: An offset due_date is converted to UTC; a naive one is kept."""
+        headers = make_auth_header()
+        created = await client.post(
+            "/api/tasks", json={"title": "Standup"}, headers=headers
+        )
+        task_id = created.json()["data"]["id"]
+        for sent, stored in [
+            ("2026-05-01T22:30:00-05:00", "2026-05-02T03:30:00"),
+            ("2026-05-01T22:30:00", "2026-05-01T22:30:00"),
+        ]:
+            resp = await client.patch(
+                f"/api/tasks/{task_id}", json={"due_date": sent}, headers=headers
+            )
+            assert resp.json()["data"]["due_date"] == stored
+            fetched = await client.get(f"/api/tasks/{task_id}", headers=headers)
+            assert fetched.json()["data"]["due_date"] == stored
+
     async def test_update_other_users_task_returns_404(
         self, client: AsyncClient
     ):
@@ -358,3 +443,250 @@ class TestFilterTasks:
         data = resp.json()["data"]
         assert len(data) == 1
         assert data[0]["title"] == "Work task"
+
+    async def test_filter_by_multiple_tags(self, client: AsyncClient):
+        """US4: Repeated tag params combine with AND, or OR via tag_match=any."""
+        headers = make_auth_header()
+        for title, tags in [("Both", ["work", "urgent"]), ("Work", ["work"])]:
+            await client.post(
+                "/api/tasks", json={"title": title, "tags": tags}, headers=headers
+            )
+        resp = await client.get(
+            "/api/tasks?tag=work&tag=urgent", headers=headers
+        )
+        assert [t["title"] for t in resp.json()["data"]] == ["Both"]
+
+        resp = await client.get(
+            "/api/tasks?tag=work&tag=urgent&tag_match=any", headers=headers
+        )
+        assert len(resp.json()["data"]) == 2
+
+
+@pytest.mark.asyncio
+class TestTaskCache:
+    """Read-through cache for GET /api/tasks and GET /api/tasks/{id}."""
+
+    @pytest.fixture(autouse=True)
+    def metrics_operator(self, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_operator_ids", TEST_USER_ID)
+
+    async def _cache_stats(self, client: AsyncClient) -> dict:
+        resp = await client.get("/api/metrics", headers=make_auth_header())
+        return resp.json()["data"]["task_cache"]
+
+    async def test_repeat_list_is_a_hit(self, client: AsyncClient):
+        headers = make_auth_header()
+        await client.post("/api/tasks", json={"title": "Cached"}, headers=headers)
+        hits = (await self._cache_stats(client))["hits"]
+        first = await client.get("/api/tasks", headers=headers)
+        second = await client.get("/api/tasks", headers=headers)
+        assert first.json() == second.json()
+        assert (await self._cache_stats(client))["hits"] == hits + 1
+
+    async def test_writes_invalidate_cached_reads(self, client: AsyncClient):
+        headers = make_auth_header()
+        create = await client.post(
+            "/api/tasks", json={"title": "Before"}, headers=headers
+        )
+        task_id = create.json()["data"]["id"]
+        await client.get("/api/tasks", headers=headers)
+        await client.get(f"/api/tasks/{task_id}", headers=headers)
+
+        await client.patch(
+            f"/api/tasks/{task_id}", json={"title": "After"}, headers=headers
+        )
+        listed = await client.get("/api/tasks", headers=headers)
+        fetched = await client.get(f"/api/tasks/{task_id}", headers=headers)
+        assert listed.json()["data"][0]["title"] == "After"
+        assert fetched.json()["data"]["title"] == "After"
+
+
+@pytest.mark.asyncio
+class TestConditionalGet:
+    """ETag / If-None-Match on GET /api/tasks and GET /api/tasks/{id}."""
+
+    async def test_list_matching_etag_returns_304(self, client: AsyncClient):
+        headers = make_auth_header()
+        await client.post("/api/tasks", json={"title": "Poll me"}, headers=headers)
+        first = await client.get("/api/tasks", headers=headers)
+        etag = first.headers["etag"]
+
+        resp = await client.get(
+            "/api/tasks", headers={**headers, "If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    async def test_etag_changes_after_write(self, client: AsyncClient):
+        headers = make_auth_header()
+        create = await client.post(
+            "/api/tasks", json={"title": "Toggle me"}, headers=headers
+        )
+        task_id = create.json()["data"]["id"]
+        list_etag = (await client.get("/api/tasks", headers=headers)).headers["etag"]
+        task_etag = (
+            await client.get(f"/api/tasks/{task_id}", headers=headers)
+        ).headers["etag"]
+
+        await client.patch(f"/api/tasks/{task_id}/toggle", headers=headers)
+
+        resp = await client.get(
+            "/api/tasks", headers={**headers, "If-None-Match": list_etag}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["data"][0]["status"] == "completed"
+        resp = await client.get(
+            f"/api/tasks/{task_id}", headers={**headers, "If-None-Match": task_etag}
+        )
+        assert resp.status_code == 200
+
+    async def test_etag_differs_per_query(self, client: AsyncClient):
+        headers = make_auth_header()
+        all_tasks = await client.get("/api/tasks", headers=headers)
+        pending = await client.get("/api/tasks?status=pending", headers=headers)
+        assert all_tasks.headers["etag"] != pending.headers["etag"]
+
+
+@pytest.mark.asyncio
+class TestListChanges:
+    """GET /api/tasks/changes — Ref: contracts/list-changes.md"""
+
+    async def test_delta_after_cursor(self, client: AsyncClient):
+        headers = make_auth_header()
+        create = await client.post(
+            "/api/tasks", json={"title": "Synced"}, headers=headers
+        )
+        task_id = create.json()["data"]["id"]
+        snapshot = await client.get("/api/tasks/changes", headers=headers)
+        assert [t["id"] for t in snapshot.json()["data"]["changed"]] == [task_id]
+        cursor = snapshot.json()["meta"]["next_cursor"]
+
+        empty = await client.get(
+            "/api/tasks/changes", params={"since": cursor}, headers=headers
+        )
+        assert empty.json()["data"] == {"changed": [], "deleted": []}
+
+        await client.delete(f"/api/tasks/{task_id}", headers=headers)
+        resp = await client.get(
+            "/api/tasks/changes", params={"since": cursor}, headers=headers
+        )
+        body = resp.json()
+        assert body["data"]["changed"] == []
+        assert [d["id"] for d in body["data"]["deleted"]] == [task_id]
+        assert body["meta"]["has_more"] is False
+
+    async def test_invalid_since_rejected(self, client: AsyncClient):
+        resp = await client.get(
+            "/api/tasks/changes?since=bogus", headers=make_auth_header()
+        )
+        assert resp.status_code == 422
+
+    @pytest.mark.parametrize("values", [[True], [-1], ["3"], [1, 2]])
+    async def test_malformed_since_rejected(self, client: AsyncClient, values):
+        resp = await client.get(
+            f"/api/tasks/changes?since={encode_cursor(values)}",
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 422
+        assert resp.json()["detail"]["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+class TestBatchTasks:
+    """POST /api/tasks/batch — Ref: contracts/batch-tasks.md"""
+
+    async def test_batch_returns_per_item_results(self, client: AsyncClient):
+        headers = make_auth_header()
+        create = await client.post(
+            "/api/tasks", json={"title": "Existing"}, headers=headers
+        )
+        task_id = create.json()["data"]["id"]
+        resp = await client.post(
+            "/api/tasks/batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": {"title": "Imported"}},
+                    {"op": "toggle", "id": task_id},
+                    {"op": "delete", "id": "00000000-0000-0000-0000-000000000000"},
+                ]
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [r["ok"] for r in body["data"]] == [True, True, False]
+        assert body["data"][0]["data"]["title"] == "Imported"
+        assert body["data"][1]["data"]["status"] == "completed"
+        assert body["data"][2]["error"]["code"] == "NOT_FOUND"
+        assert body["meta"] == {"succeeded": 2, "failed": 1}
+
+    async def test_batch_invalid_item_rejects_request(self, client: AsyncClient):
+        resp = await client.post(
+            "/api/tasks/batch",
+            json={"operations": [{"op": "create", "data": {"title": ""}}]},
+            headers=make_auth_header(),
+        )
+        assert resp.status_code == 422
+
+    async def test_batch_empty_rejected(self, client: AsyncClient):
+        resp = await client.post(
+            "/api/tasks/batch", json={"operations": []}, headers=make_auth_header()
+        )
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestSearchTasks:
+    """GET /api/tasks/search — Ref: contracts/search-tasks.md"""
+
+    async def test_ranked_paginated_results(self, client: AsyncClient):
+        headers = make_auth_header()
+        for title in ["Pay rent", "Pay phone bill", "Paint fence", "Walk dog"]:
+            await client.post("/api/tasks", json={"title": title}, headers=headers)
+
+        resp = await client.get(
+            "/api/tasks/search", params={"q": "pa", "limit": 2}, headers=headers
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["data"]) == 2
+        cursor = body["meta"]["next_cursor"]
+        assert cursor is not None
+
+        rest = await client.get(
+            "/api/tasks/search",
+            params={"q": "pa", "limit": 2, "cursor": cursor},
+            headers=headers,
+        )
+        titles = {t["title"] for t in body["data"] + rest.json()["data"]}
+        assert titles == {"Pay rent", "Pay phone bill", "Paint fence"}
+        assert rest.json()["meta"]["next_cursor"] is None
+
+    async def test_not_modified_until_write(self, client: AsyncClient):
+        headers = make_auth_header()
+        await client.post("/api/tasks", json={"title": "Read book"}, headers=headers)
+        first = await client.get("/api/tasks/search?q=book", headers=headers)
+        etag = first.headers["etag"]
+
+        cached = await client.get(
+            "/api/tasks/search?q=book", headers={**headers, "If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+        await client.post("/api/tasks", json={"title": "Bookshelf"}, headers=headers)
+        fresh = await client.get(
+            "/api/tasks/search?q=book", headers={**headers, "If-None-Match": etag}
+        )
+        assert fresh.status_code == 200
+        assert len(fresh.json()["data"]) == 2
+
+    async def test_query_required(self, client: AsyncClient):
+        resp = await client.get("/api/tasks/search", headers=make_auth_header())
+        assert resp.status_code == 422
+
+    async def test_invalid_cursor_rejected(self, client: AsyncClient):
+        resp = await client.get(
+            "/api/tasks/search?q=x&cursor=bogus", headers=make_auth_header()
+        )
+        assert resp.status_code == 422
@@ -0,0 +1,53 @@
+"""Unit tests for fuzzy title lookup (services/title_index.py)."""
+
+import uuid
+
+from app.models.task import TaskStatus
+from app.services.title_index import TitleEntry, TitleIndex, trigrams
+
+
+def _index(*titles: str) -> TitleIndex:
+    return TitleIndex(
+        [TitleEntry(uuid.uuid4(), title, TaskStatus.pending) for title in titles]
+    )
+
+
+class TestTitleIndex:
+    def test_trigrams_match_pg_trgm(self):
+        assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+
+    def test_exact_match_ignores_case_and_punctuation(self):
+        index = _index("Buy milk", "Buy milk and eggs")
+        assert index.resolve("buy MILK.").task.title == "Buy milk"
+
+    def test_typo_resolves_to_clear_winner(self):
+        index = _index("Renew passport", "Call the dentist", "Water plants")
+        assert index.resolve("renew pasport").task.title == "Renew passport"
+
+    def test_loose_match_is_only_a_candidate(self):
+        for titles, reference in [
+            (("Buy milk",), "buy eggs"),
+            (("Buy milk",), "buy bread"),
+            (("Call mom", "Water plants"), "call dad"),
+        ]:
+            match = _index(*titles).resolve(reference)
+            assert match.task is None
+            assert [c.title for c in match.candidates] == [titles[0]]
+
+    def test_query_contained_in_one_title_resolves(self):
+        assert _index("Buy milk", "Water plants").resolve("milk").task.title == "Buy milk"
+
+    def test_close_scores_are_ambiguous(self):
+        index = _index("Email Sarah", "Email Sam", "Water plants")
+        match = index.resolve("email sa")
+        assert match.task is None
+        assert {c.title for c in match.candidates} == {"Email Sarah", "Email Sam"}
+
+    def test_duplicate_titles_are_ambiguous(self):
+        match = _index("Standup", "Standup").resolve("standup")
+        assert match.task is None
+        assert len(match.candidates) == 2
+
+    def test_no_match(self):
+        match = _index("Buy milk").resolve("quarterly taxes")
+        assert (match.task, match.candidates) == (None, [])
@@ -53,5 +53,5 @@ export interface ApiResponse<T> {
 }
 
 export interface TaskListResponse extends ApiResponse<Task[]> {
-  meta: { total: number } | null;
+  meta: { total: number; limit: number; next_cursor: string | null } | null;
 }